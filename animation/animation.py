@@ -22,6 +22,10 @@ class Animation(object):
         #one_at_a_time, all_at_once
         "submobject_mode" : "all_at_once",
         "lag_factor" : 2,
+        #Whether update(alpha) depends on alpha alone, and not on
+        #which alphas came before, so that frames can be rendered
+        #out of order by Scene.get_frames_rendered_in_parallel
+        "can_render_in_parallel" : False,
     }
     def __init__(self, mobject, **kwargs):
         mobject = instantiate(mobject)
@@ -89,6 +93,26 @@ class Animation(object):
             return alpha
         raise Exception("Invalid submobject mode")
 
+    def get_sub_alphas(self, alpha, num_submobjects):
+        """
+        Array of get_sub_alpha(alpha, index, num_submobjects)
+        over all indices at once.
+        """
+        indices = np.arange(num_submobjects, dtype = 'float')
+        if self.submobject_mode in ["lagged_start", "smoothed_lagged_start"]:
+            props = indices/num_submobjects
+            if self.submobject_mode == "smoothed_lagged_start":
+                props = smooth(props)
+            lf = self.lag_factor
+            return np.clip(lf*alpha - (lf-1)*props, 0, 1)
+        elif self.submobject_mode == "one_at_a_time":
+            lowers = indices/num_submobjects
+            uppers = (indices+1)/num_submobjects
+            return np.clip((alpha-lowers)/(uppers-lowers), 0, 1)
+        elif self.submobject_mode == "all_at_once":
+            return alpha*np.ones(num_submobjects)
+        raise Exception("Invalid submobject mode")
+
     def filter_out(self, *filter_functions):
         self.filter_functions += filter_functions
         return self
@@ -19,6 +19,7 @@ class Rotating(Animation):
         "rate_func"  : None,
         "in_place"   : True,
         "about_point" : None,
+        "can_render_in_parallel" : True,
     }
     def update_submobject(self, submobject, starting_submobject, alpha):
         submobject.points = np.array(starting_submobject.points)
@@ -38,6 +39,9 @@ class Rotating(Animation):
         )
 
 class ShowPartial(Animation):
+    CONFIG = {
+        "can_render_in_parallel" : True,
+    }
     def update_submobject(self, submobject, starting_submobject, alpha):
         submobject.pointwise_become_partial(
             starting_submobject, *self.get_bounds(alpha)
@@ -154,12 +158,21 @@ class Homotopy(Animation):
     CONFIG = {
         "run_time" : 3,
         "apply_function_kwargs" : {},
+        "can_render_in_parallel" : True,
     }
     def __init__(self, homotopy, mobject, **kwargs):
         """
-        Homotopy a function from (x, y, z, t) to (x', y', z')
+        Homotopy a function from (x, y, z, t) to (x', y', z').
+        If it is marked with vectorized_point_function, x, y and z
+        may also be arrays, and the result an array of shape (3, N).
         """
         def function_at_time_t(t):
+            if getattr(homotopy, "accepts_point_arrays", False):
+                @vectorized_point_function
+                def function(points):
+                    x, y, z = np.transpose(points)
+                    return np.transpose(homotopy(x, y, z, t))
+                return function
             return lambda p : homotopy(p[0], p[1], p[2], t)
         self.function_at_time_t = function_at_time_t
         digest_config(self, kwargs)
@@ -173,30 +186,29 @@ class Homotopy(Animation):
         )
 
 class SmoothedVectorizedHomotopy(Homotopy):
-    def update_submobject(self, submob, start, alpha):
-        Homotopy.update_submobject(self, submob, start, alpha)
-        submob.make_smooth()
+    def update_mobject(self, alpha):
+        Homotopy.update_mobject(self, alpha)
+        #Smooths the whole family in one solve
+        self.mobject.make_smooth()
 
 class ApplyWave(Homotopy):
     CONFIG = {
         "direction" : DOWN,
         "amplitude" : 0.2,
         "run_time" : 1,
-        "apply_function_kwargs" : {
-            "maintain_smoothness" : False,
-        },
     }
     def __init__(self, mobject, **kwargs):
         digest_config(self, kwargs, locals())
         left_x = mobject.get_left()[0]
         right_x = mobject.get_right()[0]
         vect = self.amplitude*self.direction
+        @vectorized_point_function
         def homotopy(x, y, z, t):
-            start_point = np.array([x, y, z])
             alpha = (x-left_x)/(right_x-left_x)
             power = np.exp(2*(alpha-0.5))
-            nudge = there_and_back(t**power)
-            return np.array([x, y, z]) + nudge*vect
+            #there_and_back, for arrays
+            nudge = smooth(2*np.minimum(t**power, 1 - t**power))
+            return np.array([x, y, z]) + np.multiply.outer(vect, nudge)
         Homotopy.__init__(self, homotopy, mobject, **kwargs)
 
 class PhaseFlow(Animation):
@@ -211,12 +223,16 @@ class PhaseFlow(Animation):
     def update_mobject(self, alpha):
         if hasattr(self, "last_alpha"):
             dt = self.virtual_time*(alpha-self.last_alpha)
-            self.mobject.apply_function(
-                lambda p : p + dt*self.function(p)
-            )
+            function = lambda p : p + dt*self.function(p)
+            if getattr(self.function, "accepts_point_arrays", False):
+                function = vectorized_point_function(function)
+            self.mobject.apply_function(function)
         self.last_alpha = alpha
 
 class MoveAlongPath(Animation):
+    CONFIG = {
+        "can_render_in_parallel" : True,
+    }
     def __init__(self, mobject, path, **kwargs):
         digest_config(self, kwargs, locals())
         Animation.__init__(self, mobject, **kwargs)
@@ -268,6 +284,7 @@ class WiggleOutThenIn(Animation):
         "run_time" : 2,
         "scale_about_point" : None,
         "rotate_about_point" : None,
+        "can_render_in_parallel" : True,
     }
     def __init__(self, mobject, **kwargs):
         digest_config(self, kwargs)
@@ -278,7 +295,9 @@ class WiggleOutThenIn(Animation):
         Animation.__init__(self, mobject, **kwargs)
 
     def update_submobject(self, submobject, starting_sumobject, alpha):
+        submobject.unshare_array_attrs()
         submobject.points[:,:] = starting_sumobject.points
+        submobject.handle_points_change()
         submobject.scale(
             interpolate(1, self.scale_value, there_and_back(alpha)),
             about_point = self.scale_about_point
@@ -339,6 +358,9 @@ class LaggedStart(Animation):
             )
         ]
         Animation.__init__(self, mobject, **kwargs)
+        self.can_render_in_parallel = all([
+            anim.can_render_in_parallel for anim in self.subanimations
+        ])
 
     def update(self, alpha):
         for anim in self.subanimations:
@@ -422,6 +444,9 @@ class Succession(Animation):
 
         mobject = Group(*[anim.mobject for anim in self.animations])
         Animation.__init__(self, mobject, run_time = run_time, **kwargs)
+        self.can_render_in_parallel = all([
+            anim.can_render_in_parallel for anim in animations
+        ])
 
     def rewind_to_start(self):
         for anim in reversed(self.animations):
@@ -456,6 +481,9 @@ class AnimationGroup(Animation):
         self.run_time = max([a.run_time for a in sub_anims])
         everything = Mobject(*[a.mobject for a in sub_anims])
         Animation.__init__(self, everything, **kwargs)
+        self.can_render_in_parallel = all([
+            anim.can_render_in_parallel for anim in sub_anims
+        ])
 
     def update_mobject(self, alpha):
         for anim in self.sub_anims:
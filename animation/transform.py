@@ -17,6 +17,7 @@ class Transform(Animation):
         "path_func" : None,
         "submobject_mode" : "all_at_once",
         "replace_mobject_with_target_in_scene" : False,
+        "can_render_in_parallel" : True,
     }
     def __init__(self, mobject, target_mobject, **kwargs):
         #Copy target_mobject so as to not mess with caller
@@ -25,9 +26,11 @@ class Transform(Animation):
         digest_config(self, kwargs, locals())
         mobject.align_data(target_mobject)
         self.init_path_func()
+        self.packed_families = None
 
         Animation.__init__(self, mobject, **kwargs)
         self.name += "To" + str(target_mobject)  
+        self.pack_families()
 
     def update_config(self, **kwargs):
         Animation.update_config(self, **kwargs)
@@ -55,6 +58,120 @@ class Transform(Animation):
         submob.interpolate(start, end, alpha, self.path_func)
         return self
 
+    def update_mobject(self, alpha):
+        if not self.has_valid_packing():
+            return Animation.update_mobject(self, alpha)
+        packings, lengths, packed_colors = self.packed_families
+        mob_points, start_points, end_points = [
+            packing.buff for packing in packings
+        ]
+        sub_alphas = self.get_sub_alphas(alpha, len(lengths))
+        if self.submobject_mode == "all_at_once":
+            point_alphas = alpha
+        else:
+            point_alphas = np.repeat(sub_alphas, lengths).reshape((-1, 1))
+        mob_points[:] = self.path_func(start_points, end_points, point_alphas)
+        self.mobject.handle_packed_points_change()
+        self.interpolate_packed_colors(packed_colors, sub_alphas)
+        return self
+
+    def pack_families(self):
+        """
+        Packs the points of mobject, starting_mobject and
+        target_mobject (see Mobject.pack_points), and gathers the
+        colors of their vmobject members, so that every frame
+        interpolates all submobjects in one go.  Subclasses changing
+        the colors of starting_mobject or target_mobject after
+        Transform.__init__ call this again.  Until then, or once
+        a packing is done with, frames go submobject by submobject.
+        """
+        self.packed_families = None
+        families = self.all_families_zipped
+        if len(families) == 0:
+            return self
+        if not getattr(self.path_func, "accepts_alpha_arrays", False):
+            return self
+        if self.update_submobject.im_func is not Transform.update_submobject.im_func:
+            return self
+        if self.get_sub_alpha.im_func is not Animation.get_sub_alpha.im_func:
+            return self
+        if any([
+            type(mobs[0]).interpolate.im_func is not Mobject.interpolate.im_func
+            for mobs in families
+            ]):
+            return self
+        packings = []
+        for mob, members in zip(self.get_all_mobjects(), zip(*families)):
+            if mob.get_packed_points() is None:
+                mob.pack_points()
+            packing = mob.points_packing
+            if packing is None or packing.mobs != list(members):
+                return self
+            packings.append(packing)
+        lengths = packings[0].lengths
+        if not lengths == packings[1].lengths == packings[2].lengths:
+            return self
+        self.packed_families = (packings, lengths, self.get_packed_colors())
+        return self
+
+    def has_valid_packing(self):
+        if self.packed_families is None:
+            return False
+        packings = self.packed_families[0]
+        return all([
+            getattr(mob, "points_packing", None) is packing and packing.is_valid
+            for mob, packing in zip(self.get_all_mobjects(), packings)
+        ])
+
+    def get_packed_colors(self):
+        vmobject_indices, other_families = [], []
+        for index, mobs in enumerate(self.all_families_zipped):
+            submob, start, end = mobs
+            is_vmobject_color = all([
+                isinstance(start, VMobject),
+                isinstance(end, VMobject),
+                type(submob).interpolate_color.im_func is \
+                    VMobject.interpolate_color.im_func
+            ])
+            if is_vmobject_color:
+                vmobject_indices.append(index)
+            else:
+                other_families.append((index, mobs))
+        vmobject_families = [
+            self.all_families_zipped[index]
+            for index in vmobject_indices
+        ]
+        color_values = []
+        if len(vmobject_families) > 0:
+            submobs, starts, ends = zip(*vmobject_families)
+            for attr in submobs[0].get_color_attrs():
+                color_values.append((
+                    attr,
+                    np.array([getattr(m, attr) for m in starts]),
+                    np.array([getattr(m, attr) for m in ends]),
+                ))
+        else:
+            submobs = []
+        return submobs, np.array(vmobject_indices, dtype = 'int'), \
+            color_values, other_families
+
+    def interpolate_packed_colors(self, packed_colors, sub_alphas):
+        submobs, vmobject_indices, color_values, other_families = packed_colors
+        for index, (submob, start, end) in other_families:
+            submob.interpolate_color(start, end, sub_alphas[index])
+        alphas = np.array(sub_alphas)[vmobject_indices]
+        is_done = alphas == 1.0
+        for attr, start_values, end_values in color_values:
+            values = interpolate(
+                start_values, end_values,
+                alphas.reshape((-1,) + (1,)*(start_values.ndim-1))
+            )
+            values[is_done] = end_values[is_done]
+            #One fresh array per frame, since members keep their rows
+            if values.ndim == 1:
+                values = values.tolist()
+            map(setattr, submobs, [attr]*len(submobs), values)
+
     def clean_up(self, surrounding_scene = None):
         Animation.clean_up(self, surrounding_scene)
         if self.replace_mobject_with_target_in_scene and surrounding_scene is not None:
@@ -178,6 +295,7 @@ class FadeIn(Transform):
         if isinstance(self.starting_mobject, VMobject):
             self.starting_mobject.set_stroke(width = 0)
             self.starting_mobject.set_fill(opacity = 0)
+        self.pack_families()
 
 class FocusOn(Transform):
     CONFIG = {
@@ -300,6 +418,9 @@ class TransformAnimations(Transform):
                     anim.starting_mobject.align_data(anim.target_mobject)
 
         Transform.__init__(self, start_anim.mobject, end_anim.mobject, **kwargs)
+        self.can_render_in_parallel = all([
+            anim.can_render_in_parallel for anim in start_anim, end_anim
+        ])
         #Rewire starting and ending mobjects
         start_anim.mobject = self.starting_mobject
         end_anim.mobject = self.target_mobject
@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+
+import sys
+import argparse
+import json
+import os
+import time
+import resource
+import traceback
+import multiprocessing as mp
+
+from helpers import *
+
+from scene import Scene
+from mobject.tex_mobject import TexMobject
+from mobject.image_mobject import ImageMobject
+from mobject.point_cloud_mobject import PMobject
+from mobject.vectorized_mobject import VGroup
+from animation.transform import Transform, ApplyMethod, Rotate
+from topics.vector_space_scene import LinearTransformationScene
+from topics.characters import PiCreatureScene
+from topics.three_dimensions import ThreeDScene, Cube
+from topics.complex_numbers import ComplexTransformationScene
+from render_timing import RenderTimer
+
+HELP_MESSAGE = """
+   Usage:
+   python benchmark.py [<scene name> ...]
+
+   Renders each benchmark scene (all of them by default) without
+   writing a movie, and reports frames per second, peak memory and
+   time per rendering stage.  Results are compared against a stored
+   baseline, and the exit status is 1 if any of them regressed, or
+   are missing from the baseline.  Without a baseline the exit status
+   is 2, so run once with -s first, on the machine to be compared.
+
+   -q <quality> low, production or both [default both]
+   -b <file> baseline to compare against and to save to
+   -s save these results as the new baseline
+   -t <fraction> slowdown, or memory growth, counted as a regression
+   -o <file> write these results as json
+"""
+
+QUALITIES = {
+    "low" : (LOW_QUALITY_CAMERA_CONFIG, LOW_QUALITY_FRAME_DURATION),
+    "production" : (
+        PRODUCTION_QUALITY_CAMERA_CONFIG,
+        PRODUCTION_QUALITY_FRAME_DURATION
+    ),
+}
+DEFAULT_BASELINE_PATH = os.path.join(FILE_DIR, "benchmark_baseline.json")
+
+class TexTransformBenchmark(Scene):
+    def construct(self):
+        start, end = [
+            TexMobject(tex).scale_to_fit_width(2*SPACE_WIDTH - 1)
+            for tex in [
+                "\\sum_{n=1}^\\infty \\frac{1}{n^2} = \\frac{\\pi^2}{6}"
+                "= \\prod_{p} \\frac{1}{1 - p^{-2}}",
+                "\\int_{-\\infty}^\\infty e^{-x^2} \\, dx = \\sqrt{\\pi}"
+                "= \\Gamma\\left(\\frac{1}{2}\\right)",
+            ]
+        ]
+        self.play(Transform(start, end))
+
+class LinearTransformationBenchmark(LinearTransformationScene):
+    def construct(self):
+        self.apply_transposed_matrix([[2, 1], [-1, 1]])
+
+class PiCreatureBlinkBenchmark(PiCreatureScene):
+    def construct(self):
+        self.wait(4)
+
+class ThreeDCubesBenchmark(ThreeDScene):
+    def construct(self):
+        cubes = VGroup(*[
+            Cube(side_length = 1).shift(x*RIGHT + y*UP)
+            for x in range(-3, 4, 2)
+            for y in range(-1, 2, 2)
+        ])
+        self.set_camera_position(phi = np.pi/3, theta = -np.pi/4)
+        self.add(cubes)
+        self.begin_ambient_camera_rotation(rate = 0.1)
+        self.play(Rotate(cubes, np.pi/2, axis = OUT))
+        self.wait()
+
+class ComplexTransformationBenchmark(ComplexTransformationScene):
+    CONFIG = {
+        "include_coordinate_labels" : False,
+    }
+    def construct(self):
+        self.add_transformable_plane()
+        self.apply_complex_function(
+            lambda z : z**2/4,
+            run_time = 2,
+        )
+
+class PointCloudBenchmark(Scene):
+    def construct(self):
+        num_points = 100000
+        cloud = PMobject(stroke_width = 2)
+        cloud.add_points(
+            np.random.normal(size = (num_points, 3))*[2, 1.5, 0],
+            rgbas = np.random.random((num_points, 4)),
+        )
+        self.add(cloud)
+        self.play(Rotate(cloud, np.pi/2))
+        self.play(ApplyMethod(cloud.stretch, 0.5, 0))
+
+class ImageRotationBenchmark(Scene):
+    def construct(self):
+        gradient = np.linspace(0, 255, 400).astype('uint8')
+        pixel_array = np.zeros((400, 400, 3), dtype = 'uint8')
+        pixel_array[:,:,0] = gradient
+        pixel_array[:,:,1] = gradient.reshape((400, 1))
+        pixel_array[:,:,2] = 128
+        image = ImageMobject(pixel_array, height = 4)
+        self.add(image)
+        self.play(Rotate(image, np.pi/2))
+
+BENCHMARK_SCENES = [
+    TexTransformBenchmark,
+    LinearTransformationBenchmark,
+    PiCreatureBlinkBenchmark,
+    ThreeDCubesBenchmark,
+    ComplexTransformationBenchmark,
+    PointCloudBenchmark,
+    ImageRotationBenchmark,
+]
+
+def measure_scene(SceneClass, quality):
+    camera_config, frame_duration = QUALITIES[quality]
+    timer = RenderTimer()
+    start_time = time.time()
+    SceneClass(
+        camera_config = camera_config,
+        frame_duration = frame_duration,
+        write_to_movie = False,
+        render_timer = timer,
+    )
+    total_time = time.time() - start_time
+    report = timer.get_report()
+    num_frames = sum([record["num_frames"] for record in report["records"]])
+    return {
+        "num_frames" : num_frames,
+        "total_time" : total_time,
+        "render_time" : report["total_time"],
+        "fps" : num_frames / max(report["total_time"], 1e-6),
+        #Kilobytes on linux
+        "peak_rss_mb" : resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024.0,
+        "stages" : report["stages"],
+    }
+
+def measure_scene_to_connection(connection, SceneClass, quality):
+    try:
+        result = measure_scene(SceneClass, quality)
+    except:
+        result = {"error" : traceback.format_exc()}
+    connection.send(result)
+    connection.close()
+
+def run_benchmark(SceneClass, quality):
+    """
+    Each scene is rendered in its own process, so that peak
+    memory use belongs to that scene alone, and nothing one
+    scene caches speeds up the next.
+    """
+    receiver, sender = mp.Pipe(duplex = False)
+    process = mp.Process(
+        target = measure_scene_to_connection,
+        args = (sender, SceneClass, quality)
+    )
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = {"error" : "Process exited with code %s"%process.exitcode}
+    process.join()
+    return result
+
+def compare_to_baseline(results, baseline, tolerance, allow_missing = False):
+    regressions = []
+    for scene_name, quality_to_result in sorted(results.items()):
+        for quality, result in sorted(quality_to_result.items()):
+            base = baseline.get(scene_name, {}).get(quality)
+            if base is None and not allow_missing:
+                regressions.append("%s (%s): not in the baseline"%(
+                    scene_name, quality
+                ))
+            if base is None or "error" in result or "error" in base:
+                continue
+            if result["fps"] < (1 - tolerance)*base["fps"]:
+                regressions.append("%s (%s): %.1f fps, down from %.1f"%(
+                    scene_name, quality, result["fps"], base["fps"]
+                ))
+            if result["peak_rss_mb"] > (1 + tolerance)*base["peak_rss_mb"]:
+                regressions.append("%s (%s): %.0fMB peak, up from %.0fMB"%(
+                    scene_name, quality,
+                    result["peak_rss_mb"], base["peak_rss_mb"]
+                ))
+    return regressions
+
+def print_result(scene_name, quality, result):
+    if "error" in result:
+        print("%s (%s) failed:\n%s"%(scene_name, quality, result["error"]))
+        return
+    print("%s (%s): %d frames, %.1f fps, %.0fMB peak"%(
+        scene_name, quality, result["num_frames"],
+        result["fps"], result["peak_rss_mb"]
+    ))
+    stages = sorted(result["stages"].items(), key = lambda item : -item[1])
+    for stage, duration in stages:
+        print("   %-24s %.3fs"%(stage, duration))
+
+def get_configuration():
+    parser = argparse.ArgumentParser(
+        description = HELP_MESSAGE,
+        formatter_class = argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("scene_names", nargs = "*")
+    parser.add_argument(
+        "-q", "--quality", default = "both",
+        choices = ["low", "production", "both"]
+    )
+    parser.add_argument("-b", "--baseline", default = DEFAULT_BASELINE_PATH)
+    parser.add_argument("-s", "--save_baseline", action = "store_true")
+    parser.add_argument("-t", "--tolerance", type = float, default = 0.2)
+    parser.add_argument("-o", "--output")
+    return parser.parse_args()
+
+def main():
+    args = get_configuration()
+    name_to_class = dict([
+        (SceneClass.__name__, SceneClass)
+        for SceneClass in BENCHMARK_SCENES
+    ])
+    scene_names = args.scene_names or [
+        SceneClass.__name__ for SceneClass in BENCHMARK_SCENES
+    ]
+    for scene_name in scene_names:
+        if scene_name not in name_to_class:
+            print("Unknown benchmark scene: " + scene_name)
+            sys.exit(2)
+    if not os.path.exists(args.baseline) and not args.save_baseline:
+        print("No baseline at %s, run with -s to save one"%args.baseline)
+        sys.exit(2)
+    if args.quality == "both":
+        qualities = ["low", "production"]
+    else:
+        qualities = [args.quality]
+
+    results = {}
+    for scene_name in scene_names:
+        results[scene_name] = {}
+        for quality in qualities:
+            result = run_benchmark(name_to_class[scene_name], quality)
+            results[scene_name][quality] = result
+            print_result(scene_name, quality, result)
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent = 1, sort_keys = True)
+    regressions = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)
+        regressions = compare_to_baseline(
+            results, baseline, args.tolerance,
+            allow_missing = args.save_baseline
+        )
+        print("\nCompared against " + args.baseline)
+        for regression in regressions:
+            print("Regression: " + regression)
+        if len(regressions) == 0:
+            print("No regressions")
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as fp:
+                baseline = json.load(fp)
+        for scene_name, quality_to_result in results.items():
+            baseline.setdefault(scene_name, {}).update(quality_to_result)
+        with open(args.baseline, "w") as fp:
+            json.dump(baseline, fp, indent = 1, sort_keys = True)
+        print("Saved baseline to " + args.baseline)
+    if len(regressions) > 0:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
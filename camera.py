@@ -8,6 +8,7 @@ import aggdraw
 
 from helpers import *
 from mobject import Mobject, PMobject, VMobject, ImageMobject, Group
+from render_timing import NullRenderTimer
 
 class Camera(object):
     CONFIG = {
@@ -23,12 +24,49 @@ class Camera(object):
         "image_mode" : "RGBA",
         "n_rgb_coords" : 4,
         "background_alpha" : 0, #Out of 255
-        "pixel_array_dtype" : 'uint8'
+        "pixel_array_dtype" : 'uint8',
+        #Either "aggdraw", or "numpy" to rasterize vectorized mobjects
+        #directly from their points arrays, with no aggdraw.  The numpy
+        #rasterizer keeps up with aggdraw on frames of many small
+        #shapes, but is several times slower on a few large ones
+        "vectorized_mobject_rasterizer" : "aggdraw",
+        #Farthest, in pixels, a cubic strays from the line segments
+        #it is flattened into, most segments per cubic, number of
+        #sub-scanlines per pixel row, longest stroke corner as a
+        #multiple of the stroke width, and most sub-pixel cells
+        #worked on at once, for the numpy rasterizer
+        "rasterizer_flatness" : 0.1,
+        "rasterizer_samples_per_curve" : 16,
+        "rasterizer_supersampling" : 4,
+        "rasterizer_miter_limit" : 4,
+        "rasterizer_batch_size" : 2**22,
+        #Points of point clouds are drawn as "square" or "round"
+        #dots, and in 3d scenes may be drawn farthest first.  Dots
+        #of translucent points are blended this many pixels at a time
+        "point_cloud_shape" : "square",
+        "sort_point_cloud_by_depth" : False,
+        "point_cloud_batch_size" : 2**16,
+        #Tilted images are sampled "nearest", as they always were,
+        #or "bilinear", which is smoother under rotation but slower,
+        #working through about this many pixels at a time
+        "image_sampling" : "nearest",
+        "image_sampling_tile_size" : 2**16,
+        #If set, images drawn at half their size or less are sampled
+        #from a smaller copy (see ImageMobject.get_mipmap), which
+        #aliases less, but no longer picks out the original pixels
+        "use_image_mipmaps" : False,
+        #Frames are drawn into these in turn, so the last frame
+        #stays intact while the next is drawn
+        "num_frame_buffers" : 2,
+        #Records time spent rasterizing and compositing,
+        #see render_timing.py
+        "render_timer" : NullRenderTimer(),
     }
 
     def __init__(self, background = None, **kwargs):
         digest_config(self, kwargs, locals())
         self.init_background()
+        self.init_frame_buffers()
         self.resize_space_shape()
         self.reset()
 
@@ -66,6 +104,27 @@ class Camera(object):
             )
             self.background[:,:] = background_rgba
 
+    def init_frame_buffers(self):
+        self.frame_buffers = [
+            np.empty(self.background.shape, dtype = self.pixel_array_dtype)
+            for x in range(self.num_frame_buffers)
+        ]
+        self.frame_buffer_index = 0
+
+    def fill_next_frame_buffer(self, pixel_array):
+        """
+        Copies pixel_array into the next of the frame buffers,
+        and makes that the pixel array drawn into.
+        """
+        index = (self.frame_buffer_index + 1) % len(self.frame_buffers)
+        buff = self.frame_buffers[index]
+        if buff.shape != pixel_array.shape:
+            buff = np.empty(pixel_array.shape, dtype = self.pixel_array_dtype)
+            self.frame_buffers[index] = buff
+        np.copyto(buff, pixel_array, casting = 'unsafe')
+        self.frame_buffer_index = index
+        self.pixel_array = buff
+
     def get_image(self):
         return Image.fromarray(
             self.pixel_array,
@@ -75,14 +134,86 @@ class Camera(object):
     def get_pixel_array(self):
         return self.pixel_array
 
+    def take_pixel_array(self):
+        """
+        Returns the pixel array without copying it, handing it over
+        to the caller.  Later frames are drawn into other buffers,
+        so it is only changed by drawing done before the next reset
+        or set_pixel_array.
+        """
+        for index, buff in enumerate(self.frame_buffers):
+            if np.may_share_memory(buff, self.pixel_array):
+                self.frame_buffers[index] = np.empty_like(buff)
+        return self.pixel_array
+
     def set_pixel_array(self, pixel_array):
-        self.pixel_array = np.array(pixel_array)
+        with self.render_timer.stage("composite"):
+            self.fill_next_frame_buffer(np.asarray(pixel_array))
 
     def set_background(self, pixel_array):
         self.background = np.array(pixel_array)
 
     def reset(self):
-        self.set_pixel_array(np.array(self.background))
+        self.set_pixel_array(self.background)
+
+    def get_state_signature(self):
+        """
+        Summarizes whatever, beyond the mobjects themselves,
+        determines what a frame looks like.
+        """
+        return (
+            id(self.background),
+            tuple(self.space_center),
+            tuple(self.space_shape),
+            tuple(self.pixel_shape),
+        )
+
+    def get_rendered_layer(self, mobjects, **kwargs):
+        """
+        Draws mobjects once over opaque black and once over opaque
+        white.  The black render is their premultiplied color, and
+        the difference between the two is how much of whatever lies
+        beneath shows through.  Returns those, cropped to the pixels
+        touched, with the (y, x) corner where the crop sits, or None
+        if nothing was drawn.
+        """
+        pixel_array = self.pixel_array
+        renders = []
+        for value in 0, 255:
+            self.pixel_array = np.zeros(
+                pixel_array.shape, dtype = pixel_array.dtype
+            )
+            self.pixel_array[:,:,:3] = value
+            self.pixel_array[:,:,3] = 255
+            self.capture_mobjects(mobjects, **kwargs)
+            renders.append(self.pixel_array[:,:,:3].astype('int'))
+        self.pixel_array = pixel_array
+        on_black, on_white = renders
+        coverage = 255 - (on_white - on_black)
+        rows, cols = [
+            np.where(np.any(coverage > 0, axis = (2, axis)))[0]
+            for axis in 1, 0
+        ]
+        if len(rows) == 0:
+            return None
+        y0, y1, x0, x1 = rows[0], rows[-1]+1, cols[0], cols[-1]+1
+        return (
+            on_black[y0:y1, x0:x1].astype('uint8'),
+            coverage[y0:y1, x0:x1].astype('uint8'),
+            (y0, x0),
+        )
+
+    def overlay_rendered_layer(self, layer):
+        with self.render_timer.stage("composite"):
+            premultiplied_rgb, coverage, (y0, x0) = layer
+            height, width = coverage.shape[:2]
+            region = self.pixel_array[y0:y0+height, x0:x0+width]
+            transmission = 1 - coverage/255.0
+            region[:,:,:3] = premultiplied_rgb + \
+                np.round(region[:,:,:3]*transmission)
+            region[:,:,3] = 255 - np.round(
+                (255 - region[:,:,3])*transmission.mean(2)
+            )
 
     ####
 
@@ -125,12 +256,14 @@ class Camera(object):
                 vmobjects = []
                 
             if isinstance(mobject, PMobject):
-                self.display_point_cloud(
-                    mobject.points, mobject.rgbas, 
-                    self.adjusted_thickness(mobject.stroke_width)
-                )
+                with self.render_timer.stage("rasterize PMobject"):
+                    self.display_point_cloud(
+                        mobject.points, mobject.rgbas, 
+                        self.adjusted_thickness(mobject.stroke_width)
+                    )
             elif isinstance(mobject, ImageMobject):
-                self.display_image_mobject(mobject)
+                with self.render_timer.stage("rasterize ImageMobject"):
+                    self.display_image_mobject(mobject)
             elif isinstance(mobject, Mobject):
                 pass #Remainder of loop will handle submobjects
             else:
@@ -143,14 +276,29 @@ class Camera(object):
     def display_multiple_vectorized_mobjects(self, vmobjects):
         if len(vmobjects) == 0:
             return
-        #More efficient to bundle together in one "canvas"
-        image = Image.fromarray(self.pixel_array, mode = self.image_mode)
-        canvas = aggdraw.Draw(image)
-        for vmobject in vmobjects:
-            self.display_vectorized(vmobject, canvas)
-        canvas.flush()
+        with self.render_timer.stage("rasterize VMobject"):
+            if self.vectorized_mobject_rasterizer == "numpy":
+                self.rasterize_vectorized_mobjects(vmobjects)
+                return
+            #More efficient to bundle together in one "canvas"
+            image, canvas = self.get_aggdraw_canvas()
+            for vmobject in vmobjects:
+                self.display_vectorized(vmobject, canvas)
+            canvas.flush()
+            #Otherwise the canvas drew straight into pixel_array
+            if not image.readonly:
+                self.pixel_array[:,:] = image
 
-        self.pixel_array[:,:] = image
+    def get_aggdraw_canvas(self):
+        """
+        Returns an image sharing memory with pixel_array, when
+        it can, and a canvas drawing on it.  PIL marks such images
+        read only, and copies them before any change of its own.
+        """
+        if not self.pixel_array.flags.c_contiguous:
+            self.pixel_array = np.ascontiguousarray(self.pixel_array)
+        image = Image.fromarray(self.pixel_array, mode = self.image_mode)
+        return image, aggdraw.Draw(image)
 
     def display_vectorized(self, vmobject, canvas):
         if vmobject.is_subpath:
@@ -208,35 +356,477 @@ class Camera(object):
             result += " ".join([start] + cubics + [end])
         return result
 
-    def display_point_cloud(self, points, rgbas, thickness):
-        if len(points) == 0:
+    def rasterize_vectorized_mobjects(self, vmobjects):
+        """
+        Alternative to drawing with aggdraw, which works from the
+        points arrays directly rather than from pathstrings.  The
+        fill and the stroke outline of every vmobject become one
+        polygon each, all of which are scan converted together, and
+        composited over the frame in order in one step.  This costs
+        in proportion to the area of the shapes' bounding boxes,
+        so aggdraw is still the faster choice for most scenes.
+        """
+        vmobjects = filter(lambda vm : not vm.is_subpath, vmobjects)
+        polylines = self.get_flattened_subpaths(vmobjects)
+        if polylines is None:
             return
-        points = self.align_points_to_camera(points)
-        pixel_coords = self.points_to_pixel_coords(points)
-        pixel_coords = self.thickened_coordinates(
-            pixel_coords, thickness
+        points, subpath_starts, subpath_ends, owners = polylines
+        is_closed = np.array([
+            vmobject.mark_paths_closed for vmobject in vmobjects
+        ])[owners]
+        stroke_widths = np.array([
+            max(vmobject.stroke_width, 0) for vmobject in vmobjects
+        ], dtype = 'float')
+        fill_opacities = np.array([
+            vmobject.get_fill_opacity() for vmobject in vmobjects
+        ])
+        #Shape 2i is the fill of vmobject i, and 2i+1 its stroke
+        fill_starts, fill_ends, fill_subpaths = self.get_fill_edges(
+            points, subpath_starts, subpath_ends
+        )
+        stroke_starts, stroke_ends, stroke_subpaths = self.get_stroke_edges(
+            points, subpath_starts, subpath_ends, is_closed,
+            stroke_widths[owners]
+        )
+        edge_starts = np.append(fill_starts, stroke_starts, axis = 0)
+        edge_ends = np.append(fill_ends, stroke_ends, axis = 0)
+        edge_shapes = np.append(
+            2*owners[fill_subpaths], 2*owners[stroke_subpaths] + 1
+        )
+        shape_opacities = np.zeros(2*len(vmobjects))
+        shape_opacities[0::2] = fill_opacities
+        shape_opacities[1::2] = stroke_widths > 0
+        shape_rgbs = np.zeros((2*len(vmobjects), 3))
+        shape_rgbs[0::2] = self.get_rgbs(vmobjects, "fill")
+        shape_rgbs[1::2] = self.get_rgbs(vmobjects, "stroke")
+        drawn = shape_opacities[edge_shapes] > 0
+        order = np.argsort(edge_shapes[drawn], kind = 'mergesort')
+        self.blend_polygons(
+            edge_starts[drawn][order], edge_ends[drawn][order],
+            edge_shapes[drawn][order], 255*shape_rgbs, shape_opacities
+        )
+
+    def get_rgbs(self, vmobjects, kind):
+        """
+        Same as the rgbs of get_fill_color or get_stroke_color,
+        as kind is "fill" or "stroke", but read straight from the
+        vmobjects where neither they nor the camera change them.
+        """
+        method_name = "get_%s_color"%kind
+        camera_method = getattr(type(self), method_name).im_func
+        vmobject_method = getattr(VMobject, method_name).im_func
+        camera_changes_color = \
+            camera_method is not getattr(Camera, method_name).im_func
+        rgbs = []
+        for vmobject in vmobjects:
+            mob_method = getattr(type(vmobject), method_name).im_func
+            if camera_changes_color or mob_method is not vmobject_method:
+                color = getattr(self, method_name)(vmobject)
+                rgbs.append(color_to_rgb(color))
+            else:
+                rgbs.append(getattr(vmobject, kind + "_rgb"))
+        return np.clip(rgbs, 0, 1)
+
+    def get_flattened_subpaths(self, vmobjects):
+        """
+        Samples every cubic of every subpath at once, each into as
+        few segments as keep it within rasterizer_flatness pixels.
+        Returns the resulting polyline points, in pixel coordinates,
+        the start and end index of each subpath among them, and the
+        index of the vmobject each subpath belongs to, or None if
+        there are no curves.
+        """
+        point_arrays, curve_counts, owners = [], [], []
+        for index, vmobject in enumerate(vmobjects):
+            for mob in [vmobject] + vmobject.get_subpath_mobjects():
+                #As with get_pathstring, subpaths without a whole
+                #curve draw nothing
+                num_curves = (len(mob.points) - 1)/3
+                if num_curves < 1:
+                    continue
+                point_arrays.append(mob.points[:3*num_curves+1])
+                curve_counts.append(num_curves)
+                owners.append(index)
+        if len(point_arrays) == 0:
+            return None
+        curve_counts = np.array(curve_counts)
+        coords = self.points_to_pixel_coords(
+            self.align_points_to_camera(np.concatenate(point_arrays))
+        ).astype('float')
+        first_points = np.cumsum(3*curve_counts + 1) - 3*curve_counts - 1
+        curve_subpaths = np.repeat(np.arange(len(curve_counts)), curve_counts)
+        curve_starts = first_points[curve_subpaths] + 3*(
+            np.arange(len(curve_subpaths)) - \
+            np.repeat(np.cumsum(curve_counts) - curve_counts, curve_counts)
+        )
+        controls = coords[curve_starts.reshape((-1, 1)) + np.arange(4)]
+        #Wang's bound on the number of segments needed
+        second_differences = controls[:,:2] - 2*controls[:,1:3] + controls[:,2:]
+        deviations = np.sqrt((second_differences**2).sum(2)).max(1)
+        curve_samples = np.clip(
+            np.ceil(np.sqrt(0.75*deviations/self.rasterizer_flatness)),
+            1, self.rasterizer_samples_per_curve
+        ).astype('int')
+        sample_curves = np.repeat(np.arange(len(curve_starts)), curve_samples)
+        ts = (
+            np.arange(len(sample_curves)) + 1 - np.repeat(
+                np.cumsum(curve_samples) - curve_samples, curve_samples
+            )
+        ).astype('float')/curve_samples[sample_curves]
+        samples = np.einsum(
+            "nk,nkd->nd",
+            np.dot(ts.reshape((-1, 1))**np.arange(4), get_bernstein_matrix(3)),
+            controls[sample_curves]
+        )
+        #Each subpath is its first point followed by its samples
+        lengths = 1 + np.bincount(
+            curve_subpaths, weights = curve_samples,
+            minlength = len(curve_counts)
+        ).astype('int')
+        subpath_starts = np.cumsum(lengths) - lengths
+        points = np.zeros((lengths.sum(), 2))
+        is_first = np.zeros(len(points), dtype = 'bool')
+        is_first[subpath_starts] = True
+        points[is_first] = coords[first_points]
+        points[~is_first] = samples
+        #Drop repeated points, including the last point of a closed
+        #subpath where it equals the first, so that every segment has
+        #a direction.  Open subpaths are stroked back to that point.
+        owners = np.array(owners)
+        is_closed = np.array([
+            vmobject.mark_paths_closed for vmobject in vmobjects
+        ])[owners]
+        subpath_indices = np.repeat(np.arange(len(lengths)), lengths)
+        subpath_ends = subpath_starts + lengths
+        keep = np.ones(len(points), dtype = 'bool')
+        keep[1:] = np.any(points[1:] != points[:-1], axis = 1)
+        keep[(subpath_ends - 1)[is_closed & np.all(
+            points[subpath_ends - 1] == points[subpath_starts], axis = 1
+        )]] = False
+        keep[is_first] = True
+        points, subpath_indices = points[keep], subpath_indices[keep]
+        lengths = np.bincount(subpath_indices, minlength = len(lengths))
+        subpath_ends = np.cumsum(lengths)
+        subpath_starts = subpath_ends - lengths
+        valid = lengths > 1
+        if not np.any(valid):
+            return None
+        if not np.all(valid):
+            kept_points = np.repeat(valid, lengths)
+            points = points[kept_points]
+            lengths, owners = lengths[valid], owners[valid]
+            subpath_ends = np.cumsum(lengths)
+            subpath_starts = subpath_ends - lengths
+        return points, subpath_starts, subpath_ends, owners
+
+    def get_next_indices(self, subpath_starts, subpath_ends):
+        #Index of the point after each point, wrapping around
+        #within its subpath
+        lengths = subpath_ends - subpath_starts
+        next_indices = np.arange(1, subpath_ends[-1] + 1)
+        next_indices[subpath_ends - 1] = subpath_starts
+        return next_indices, np.repeat(np.arange(len(lengths)), lengths)
+
+    def get_fill_edges(self, points, subpath_starts, subpath_ends):
+        #Fills implicitly close every subpath
+        next_indices, subpaths = self.get_next_indices(
+            subpath_starts, subpath_ends
+        )
+        return points, points[next_indices], subpaths
+
+    def get_stroke_edges(self, points, subpath_starts, subpath_ends, is_closed, widths):
+        """
+        Offsets each polyline by half the stroke width to either
+        side, with mitered corners, and outlines the band between.
+        Open subpaths give one loop, with square cut ends, and
+        closed ones an outer and an inner loop of opposite
+        orientation, so that the nonzero fill is the band.
+        """
+        next_indices, subpaths = self.get_next_indices(
+            subpath_starts, subpath_ends
+        )
+        prev_indices = np.zeros(len(points), dtype = 'int')
+        prev_indices[next_indices] = np.arange(len(points))
+        is_open = ~is_closed[subpaths]
+        is_first = np.zeros(len(points), dtype = 'bool')
+        is_first[subpath_starts] = True
+        is_last = np.zeros(len(points), dtype = 'bool')
+        is_last[subpath_ends - 1] = True
+        #Open ends take the direction of their one segment
+        out_vects = points[next_indices] - points
+        in_vects = points - points[prev_indices]
+        out_vects[is_open & is_last] = in_vects[is_open & is_last]
+        in_vects[is_open & is_first] = out_vects[is_open & is_first]
+        normals = []
+        for vects in in_vects, out_vects:
+            lengths = np.sqrt((vects**2).sum(1)).reshape((-1, 1))
+            normals.append(vects[:,::-1]*[-1, 1]/np.maximum(lengths, 1e-9))
+        in_normals, out_normals = normals
+        miters = in_normals + out_normals
+        miter_lengths = np.sqrt((miters**2).sum(1)).reshape((-1, 1))
+        #Where the path doubles back, there is no miter
+        doubles_back = miter_lengths[:,0] < 1e-6
+        miters[doubles_back] = out_normals[doubles_back]
+        miter_lengths[doubles_back] = 1
+        miters /= miter_lengths
+        cosines = (miters*in_normals).sum(1).reshape((-1, 1))
+        offsets = 0.5*widths[subpaths].reshape((-1, 1))*miters/np.maximum(
+            cosines, 1.0/self.rasterizer_miter_limit
+        )
+        left, right = points + offsets, points - offsets
+
+        has_segment = is_closed[subpaths] | ~is_last
+        starts = [left[has_segment], right[next_indices][has_segment]]
+        ends = [left[next_indices][has_segment], right[has_segment]]
+        edge_subpaths = [subpaths[has_segment]]*2
+        #Ends of open subpaths join the two sides
+        for cap, (a, b) in (is_open & is_last, (left, right)), (is_open & is_first, (right, left)):
+            starts.append(a[cap])
+            ends.append(b[cap])
+            edge_subpaths.append(subpaths[cap])
+        return (
+            np.concatenate(starts),
+            np.concatenate(ends),
+            np.concatenate(edge_subpaths),
         )
-        rgba_len = self.pixel_array.shape[2]
 
-        rgbas = (255*rgbas).astype('uint8')
-        target_len = len(pixel_coords)
-        factor = target_len/len(rgbas)
-        rgbas = np.array([rgbas]*factor).reshape((target_len, rgba_len))
+    def blend_polygons(self, starts, ends, shapes, rgbs, opacities):
+        """
+        Edges are sorted by the shape they belong to, and shapes
+        are drawn in order of their index.  Shapes are scan converted
+        within their bounding boxes, as many at a time as fit in
+        rasterizer_batch_size sub-pixel cells.
+        """
+        if len(shapes) == 0:
+            return
+        ph, pw = self.pixel_shape
+        ss = self.rasterizer_supersampling
+        shape_ids, first_edges = np.unique(shapes, return_index = True)
+        all_coords = [np.minimum(starts, ends), np.maximum(starts, ends)]
+        mins, maxs = [
+            reduce_func.reduceat(coords, first_edges, axis = 0)
+            for reduce_func, coords in zip([np.minimum, np.maximum], all_coords)
+        ]
+        x0s, y0s = np.maximum(np.floor(mins).astype('int'), 0).T
+        x1s = np.minimum(np.ceil(maxs[:,0]).astype('int') + 1, pw)
+        y1s = np.minimum(np.ceil(maxs[:,1]).astype('int') + 1, ph)
+        widths = np.maximum(x1s - x0s, 0)
+        heights = np.maximum(y1s - y0s, 0)
+        num_cells = heights*(widths + 1)*ss
+        last_edges = np.append(first_edges[1:], len(shapes))
+        shape_ranks = np.searchsorted(shape_ids, shapes)
+        batch_start = 0
+        while batch_start < len(shape_ids):
+            batch_cells = np.cumsum(num_cells[batch_start:])
+            batch_end = batch_start + max(np.searchsorted(
+                batch_cells, self.rasterizer_batch_size, side = "right"
+            ), 1)
+            batch = slice(batch_start, batch_end)
+            edges = slice(first_edges[batch_start], last_edges[batch_end-1])
+            pixels, coverage, batch_shapes = self.get_polygons_coverage(
+                starts[edges], ends[edges],
+                shape_ranks[edges] - batch_start,
+                x0s[batch], y0s[batch], widths[batch], heights[batch],
+            )
+            batch_shapes = shape_ids[batch_start + batch_shapes]
+            self.composite_in_order(
+                pixels, coverage*opacities[batch_shapes],
+                rgbs[batch_shapes],
+            )
+            batch_start = batch_end
+
+    def get_polygons_coverage(self, starts, ends, shapes, x0s, y0s, widths, heights):
+        """
+        Nonzero-winding coverage of the pixels in the bounding box
+        of each shape, with shapes numbered from 0 here.  Each edge
+        crossing of a sub-scanline deposits its winding direction at
+        its column (split between the two pixels it falls between).
+        The rows of every box are laid out one after another, once
+        for each sub-scanline of a pixel row, so that one cumulative
+        sum over the whole layout gives every winding number.
+        Returns the frame index, coverage and shape of each pixel
+        with any coverage.
+        """
+        ss = self.rasterizer_supersampling
+        pw = self.pixel_shape[1]
+        #A spare column on the right catches deposits past the
+        #box, and as every row nets zero, is never itself covered
+        row_lengths = widths + 1
+        num_pixels = heights*row_lengths
+        pixel_offsets = np.cumsum(num_pixels) - num_pixels
+        total_pixels = num_pixels.sum()
+
+        ya, yb = starts[:,1], ends[:,1]
+        top = y0s[shapes]
+        n_rows = heights[shapes]*ss
+        first_rows = np.clip(
+            np.ceil((np.minimum(ya, yb) - top)*ss - 0.5), 0, n_rows
+        ).astype('int')
+        end_rows = np.clip(
+            np.ceil((np.maximum(ya, yb) - top)*ss - 0.5), 0, n_rows
+        ).astype('int')
+        counts = end_rows - first_rows
+        edge_indices = np.repeat(np.arange(len(starts)), counts)
+        rows = first_rows[edge_indices] + np.arange(len(edge_indices)) - \
+            np.repeat(np.cumsum(counts) - counts, counts)
+        ys = top[edge_indices] + (rows + 0.5)/float(ss)
+        xa, xb = starts[edge_indices,0], ends[edge_indices,0]
+        ya, yb = ya[edge_indices], yb[edge_indices]
+        xs = xa + (ys - ya)*(xb - xa)/(yb - ya)
+        directions = np.sign(yb - ya)
+        crossing_shapes = shapes[edge_indices]
+        xs = np.clip(xs - x0s[crossing_shapes], 0, widths[crossing_shapes])
+        columns = np.floor(xs).astype('int')
+        fractions = xs - columns
+        cell_indices = (rows%ss)*total_pixels + pixel_offsets[crossing_shapes] + \
+            (rows/ss)*row_lengths[crossing_shapes] + columns
+        #Only crossings strictly inside a column spill into the next,
+        #which is at most the spare column of the same row
+        spills = fractions > 0
+        winding = np.bincount(
+            np.append(cell_indices, cell_indices[spills] + 1),
+            weights = np.append(
+                directions*(1 - fractions), (directions*fractions)[spills]
+            ),
+            minlength = ss*total_pixels
+        ).cumsum()
+        np.abs(winding, out = winding)
+        np.minimum(winding, 1, out = winding)
+        coverage = winding.reshape((ss, total_pixels)).sum(0)
+        covered = np.flatnonzero(coverage > 1e-4*ss)
+
+        pixel_shapes = np.searchsorted(pixel_offsets, covered, side = "right") - 1
+        box_indices = covered - pixel_offsets[pixel_shapes]
+        pixel_row_lengths = row_lengths[pixel_shapes]
+        frame_indices = box_indices + (box_indices/pixel_row_lengths)*(
+            pw - pixel_row_lengths
+        ) + (pw*y0s + x0s)[pixel_shapes]
+        return frame_indices, coverage[covered]/ss, pixel_shapes
+
+    def composite_in_order(self, pixels, alphas, rgbs):
+        """
+        Blends each rgb over the given pixel of the frame, by its
+        alpha, in the order given.  Every pixel is done at once, as
+        the result over a background b of colors c_i with alphas a_i
+        is b*prod(1-a_i) plus the sum of c_i*a_i*prod_{j>i}(1-a_j).
+        """
+        if len(pixels) == 0:
+            return
+        #Each pixel of the frame as a single item, which is quicker to
+        #index than rows of the frame's channels
+        flat_pa = self.pixel_array.view(np.dtype(
+            (np.void, self.pixel_array.strides[1])
+        )).reshape(-1)
+        #Pixels given once need none of the sorting below
+        counts = np.bincount(pixels, minlength = len(flat_pa))[pixels]
+        single = np.flatnonzero(counts == 1)
+        self.blend_into_pixels(
+            flat_pa, pixels[single], 1 - alphas[single],
+            alphas[single], rgbs[single]*alphas[single].reshape((-1, 1))
+        )
+        shared = np.flatnonzero(counts > 1)
+        if len(shared) == 0:
+            return
+        #Sorted by pixel, and within a pixel by the order given
+        keys = np.sort(pixels[shared]*len(shared) + np.arange(len(shared)))
+        pixels = keys/len(shared)
+        order = shared[keys%len(shared)]
+        alphas, rgbs = alphas[order], rgbs[order]
+        is_start = np.ones(len(pixels), dtype = 'bool')
+        is_start[1:] = pixels[1:] != pixels[:-1]
+        group_starts = np.flatnonzero(is_start)
+        groups = np.cumsum(is_start) - 1
+        #Nothing under an opaque color shows through
+        indices = np.arange(len(pixels))
+        last_opaque = np.maximum.reduceat(
+            np.where(alphas >= 1, indices, -1), group_starts
+        )
+        shows = indices >= last_opaque[groups]
+        #Opaque colors only matter to what they hide
+        log_transmissions = np.log(1 - np.where(alphas < 1, alphas, 0))
+        cumulative = np.cumsum(log_transmissions)
+        group_ends = np.append(group_starts[1:], len(pixels)) - 1
+        later_logs = cumulative[group_ends][groups] - cumulative
+        weights = shows*alphas*np.exp(later_logs)
+        background_weights = np.exp(
+            cumulative[group_ends] - cumulative[group_starts] + \
+            log_transmissions[group_starts]
+        )*(last_opaque < 0)
+        self.blend_into_pixels(
+            flat_pa, pixels[group_starts], background_weights,
+            np.add.reduceat(weights, group_starts),
+            np.add.reduceat(rgbs*weights.reshape((-1, 1)), group_starts),
+        )
 
-        on_screen_indices = self.on_screen_pixels(pixel_coords)        
-        pixel_coords = pixel_coords[on_screen_indices]        
-        rgbas = rgbas[on_screen_indices]
+    def blend_into_pixels(self, flat_pa, pixels, background_weights, alphas, rgbs):
+        #The frame keeps background_weights of what it had, and gains
+        #the given rgbs, and the given alphas of full opacity
+        channels = self.pixel_array.shape[2]
+        blended = flat_pa[pixels].view(self.pixel_array.dtype).reshape(
+            (-1, channels)
+        )*background_weights.reshape((-1, 1))
+        blended[:,:3] += rgbs
+        blended[:,3] += 255*alphas
+        flat_pa[pixels] = (blended + 0.5).astype(
+            self.pixel_array.dtype
+        ).view(flat_pa.dtype).reshape(-1)
 
+    def display_point_cloud(self, points, rgbas, thickness):
+        """
+        Every pixel of every point's dot is blended over the frame by
+        that point's opacity, in the order of the points.  Under the
+        last opaque point over a pixel nothing shows, so only it, and
+        the translucent points after it, are composited.  Translucent
+        points are taken a batch at a time, with about
+        point_cloud_batch_size dot pixels in a batch.
+        """
+        nudges = self.get_thickening_nudges(thickness)
+        if len(points) == 0 or len(nudges) == 0:
+            return
+        points = self.align_points_to_camera(points)
+        pixel_coords = self.points_to_pixel_coords(points)
+        if self.sort_point_cloud_by_depth:
+            #Points nearer the viewer, with greater z, are drawn last
+            order = np.argsort(points[:,2], kind = 'mergesort')
+            pixel_coords = pixel_coords[order]
+            rgbas = rgbas[order]
         ph, pw = self.pixel_shape
+        is_opaque = rgbas[:,3] >= 1
+        opaque_indices = np.flatnonzero(is_opaque)
+        last_opaque = -np.ones(ph*pw, dtype = 'int')
+        for nudge in nudges:
+            coords = pixel_coords[opaque_indices] + nudge
+            on_screen = self.on_screen_pixels(coords)
+            indices = coords[on_screen,1]*pw + coords[on_screen,0]
+            #Where indices repeat, the last, and largest, point wins
+            last_opaque[indices] = np.maximum(
+                last_opaque[indices], opaque_indices[on_screen]
+            )
+        covered = np.flatnonzero(last_opaque >= 0)
+        self.composite_in_order(
+            covered, np.ones(len(covered)),
+            255*rgbas[last_opaque[covered],:3],
+        )
 
-        flattener = np.array([1, pw], dtype = 'int')
-        flattener = flattener.reshape((2, 1))
-        indices = np.dot(pixel_coords, flattener)[:,0]
-        indices = indices.astype('int')
-        
-        new_pa = self.pixel_array.reshape((ph*pw, rgba_len))
-        new_pa[indices] = rgbas
-        self.pixel_array = new_pa.reshape((ph, pw, rgba_len))
+        translucent_indices = np.flatnonzero(~is_opaque)
+        batch_size = max(self.point_cloud_batch_size/len(nudges), 1)
+        for start in range(0, len(translucent_indices), batch_size):
+            batch_indices = translucent_indices[start:start+batch_size]
+            #All pixels of the first point's dot, then the second's...
+            coords = (
+                pixel_coords[batch_indices].reshape((-1, 1, 2)) + nudges
+            ).reshape((-1, 2))
+            point_indices = np.repeat(batch_indices, len(nudges))
+            on_screen = self.on_screen_pixels(coords)
+            pixels = coords[on_screen,1]*pw + coords[on_screen,0]
+            point_indices = point_indices[on_screen]
+            shows = point_indices > last_opaque[pixels]
+            point_indices = point_indices[shows]
+            self.composite_in_order(
+                pixels[shows],
+                rgbas[point_indices,3],
+                255*rgbas[point_indices,:3],
+            )
 
     def display_image_mobject(self, image_mobject):
         corner_coords = self.points_to_pixel_coords(image_mobject.points)
@@ -245,19 +835,22 @@ class Camera(object):
         down_vect = dl_coords - ul_coords
 
         impa = image_mobject.pixel_array
+        if self.use_image_mipmaps:
+            ih, iw = impa.shape[:2]
+            impa = image_mobject.get_mipmap(max(
+                np.linalg.norm(right_vect)/iw,
+                np.linalg.norm(down_vect)/ih,
+            ))
 
         oh, ow = self.pixel_array.shape[:2] #Outer width and height
         ih, iw = impa.shape[:2] #inner with and height
         rgb_len = self.pixel_array.shape[2]
 
-        image = np.zeros((oh, ow, rgb_len), dtype = self.pixel_array_dtype)
-
         if right_vect[1] == 0 and down_vect[0] == 0:
             rv0 = right_vect[0]
             dv1 = down_vect[1]
             x_indices = np.arange(rv0, dtype = 'int')*iw/rv0
             y_indices = np.arange(dv1, dtype = 'int')*ih/dv1
-            stretched_impa = impa[y_indices][:,x_indices]
 
             x0, x1 = ul_coords[0], ur_coords[0] 
             y0, y1 = ul_coords[1], dl_coords[1]
@@ -267,56 +860,146 @@ class Camera(object):
             siy1 = dv1 - max(y1-oh, 0)
             six0 = max(-x0, 0)
             six1 = rv0 - max(x1-ow, 0)
-            x0 = max(x0, 0)
-            y0 = max(y0, 0)
-            image[y0:y1, x0:x1] = stretched_impa[siy0:siy1, six0:six1]
+            #Only stretch the part of the image which is on screen
+            image = impa[y_indices[siy0:siy1]][:,x_indices[six0:six1]]
+            corner = (max(y0, 0), max(x0, 0))
         else:
             # Alternate (slower) tactice if image is tilted
-            # List of all coordinates of pixels, given as (x, y), 
-            # which matches the return type of points_to_pixel_coords,
-            # even though np.array indexing naturally happens as (y, x)
-            all_pixel_coords = np.zeros((oh*ow, 2), dtype = 'int')
-            a = np.arange(oh*ow, dtype = 'int')
-            all_pixel_coords[:,0] = a%ow
-            all_pixel_coords[:,1] = a/ow
-
-            recentered_coords = all_pixel_coords - ul_coords
-            coord_norms = np.linalg.norm(recentered_coords, axis = 1)
-
-            with np.errstate(divide = 'ignore'):
-                ix_coords, iy_coords = [
-                    np.divide(
-                        dim*np.dot(recentered_coords, vect),
-                        np.dot(vect, vect),
-                    )
-                    for vect, dim in (right_vect, iw), (down_vect, ih)
-                ]
+            # Only pixels within the bounding box of the image's
+            # four corners, and on screen, are considered
+            edges = np.array([right_vect, down_vect])
+            if self.image_sampling != "bilinear":
+                #Nearest sampling projects onto the edges, so sheared
+                #images cover the parallelogram whose edges are each
+                #perpendicular to the other edge
+                if np.linalg.det(edges) == 0:
+                    return
+                edges = np.linalg.solve(
+                    edges, np.diag((edges**2).sum(1))
+                ).T
+            all_corners = ul_coords + np.array([
+                [0, 0], edges[0], edges[1], edges.sum(0)
+            ])
+            bx0, by0 = np.maximum(np.floor(all_corners.min(0)), 0).astype('int')
+            bx1, by1 = np.minimum(
+                np.ceil(all_corners.max(0)) + 1, [ow, oh]
+            ).astype('int')
+            if bx0 >= bx1 or by0 >= by1:
+                return
+            image = self.get_affine_sampled_image(
+                impa, ul_coords, right_vect, down_vect,
+                (bx0, by0, bx1, by1)
+            )
+            if image is None:
+                return
+            corner = (by0, bx0)
+        self.overlay_rgba_array(image, corner)
+
+    def get_affine_sampled_image(self, impa, ul_coords, right_vect, down_vect, box):
+        """
+        Samples impa, whose upper left, right and down edges sit at
+        ul_coords, right_vect and down_vect in pixel space, onto the
+        pixels of box = (x0, y0, x1, y1).  Pixels are mapped back
+        into the image a tile of rows at a time.
+        """
+        bx0, by0, bx1, by1 = box
+        bh, bw = by1 - by0, bx1 - bx0
+        ih, iw, rgb_len = impa.shape
+        bilinear = self.image_sampling == "bilinear"
+        if bilinear:
+            #Columns map image coordinates (x, y), in pixels of the
+            #image, to offsets from ul_coords
+            matrix = np.array([right_vect/float(iw), down_vect/float(ih)]).T
+            if np.linalg.det(matrix) == 0:
+                return None
+            inverse = np.linalg.inv(matrix).astype('float32')
+            sizes = lengths = [1, 1]
+            dtype = 'float32'
+        else:
+            #As nearest sampling always has, project onto the edges,
+            #which only differs from the above for sheared images
+            #(and those not quite square from rounded corners)
+            inverse = np.array([right_vect, down_vect])
+            sizes = [iw, ih]
+            lengths = [float(np.dot(vect, vect)) for vect in inverse]
+            if 0 in lengths:
+                return None
+            dtype = 'float'
+        if bilinear:
+            flat_impa = impa.reshape((ih*iw, rgb_len)).astype('float32')
+            #Blend colors weighted by alpha, so transparent pixels
+            #don't bleed their color into the edge
+            flat_impa[:,:3] *= flat_impa[:,3:]/255
+        else:
+            flat_impa = impa.reshape((ih*iw, rgb_len))
+
+        image = np.zeros((bh, bw, rgb_len), dtype = self.pixel_array_dtype)
+        xs = np.arange(bx0, bx1, dtype = dtype) - ul_coords[0]
+        tile_height = max(self.image_sampling_tile_size/bw, 1)
+        for ty0 in range(0, bh, tile_height):
+            ty1 = min(ty0 + tile_height, bh)
+            ys = np.arange(by0+ty0, by0+ty1, dtype = dtype) - ul_coords[1]
+            ix_coords, iy_coords = [
+                (row[0]*xs + row[1]*ys.reshape((-1, 1)))*size/length
+                for row, size, length in zip(inverse, sizes, lengths)
+            ]
             to_change = reduce(op.and_, [
                 ix_coords >= 0, ix_coords < iw,
                 iy_coords >= 0, iy_coords < ih,
             ])
-            n_to_change = np.sum(to_change)
-            inner_flat_coords = iw*iy_coords[to_change] + ix_coords[to_change]
-            flat_impa = impa.reshape((iw*ih, rgb_len))
-            target_rgbas = flat_impa[inner_flat_coords, :]
-
-            image = image.reshape((ow*oh, rgb_len))
-            image[to_change] = target_rgbas
-            image = image.reshape((oh, ow, rgb_len))
-        self.overlay_rgba_array(image)
-
-    def overlay_rgba_array(self, arr):
-        # """ Overlays arr onto self.pixel_array with relevant alphas"""
-        bg, fg = self.pixel_array/255.0, arr/255.0
-        bga, fga = [arr[:,:,3:] for arr in bg, fg]
-        alpha_sum = fga + (1-fga)*bga
-        with np.errstate(divide = 'ignore', invalid='ignore'):
-            bg[:,:,:3] = reduce(op.add, [
-                np.divide(fg[:,:,:3]*fga, alpha_sum),
-                np.divide(bg[:,:,:3]*(1-fga)*bga, alpha_sum),
-            ])
-        bg[:,:,3:] = 1 - (1 - bga)*(1 - fga)
-        self.pixel_array = (255*bg).astype(self.pixel_array_dtype)
+            ix_coords = ix_coords[to_change]
+            iy_coords = iy_coords[to_change]
+            if bilinear:
+                #Pixel centers sit at half integers
+                ix_coords = np.clip(ix_coords - 0.5, 0, iw - 1)
+                iy_coords = np.clip(iy_coords - 0.5, 0, ih - 1)
+                x0s = ix_coords.astype('int')
+                y0s = iy_coords.astype('int')
+                x1s = np.minimum(x0s + 1, iw - 1)
+                y1s = np.minimum(y0s + 1, ih - 1)
+                dx = (ix_coords - x0s).reshape((-1, 1))
+                dy = (iy_coords - y0s).reshape((-1, 1))
+                rgbas = reduce(op.add, [
+                    (1-dx)*(1-dy)*flat_impa[iw*y0s + x0s],
+                    dx*(1-dy)*flat_impa[iw*y0s + x1s],
+                    (1-dx)*dy*flat_impa[iw*y1s + x0s],
+                    dx*dy*flat_impa[iw*y1s + x1s],
+                ])
+                alphas = rgbas[:,3:]
+                with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                    rgbas[:,:3] = np.where(
+                        alphas > 0, 255*rgbas[:,:3]/alphas, 0
+                    )
+                rgbas = np.round(rgbas)
+            else:
+                inner_flat_coords = iw*iy_coords.astype('int') + \
+                    ix_coords.astype('int')
+                rgbas = flat_impa[inner_flat_coords]
+            image[ty0:ty1][to_change] = rgbas
+        return image
+
+    def overlay_rgba_array(self, arr, corner = (0, 0)):
+        """
+        Overlays arr onto self.pixel_array with relevant alphas,
+        with its upper left at the (y, x) pixel given by corner.
+        Only the region arr covers is touched.
+        """
+        with self.render_timer.stage("composite"):
+            y0, x0 = corner
+            height, width = arr.shape[:2]
+            region = self.pixel_array[y0:y0+height, x0:x0+width]
+            fg = arr.astype('float32')/255
+            bg = region.astype('float32')/255
+            fga, bga = fg[:,:,3:], bg[:,:,3:]
+            #Premultiply each by its share of the result
+            fg_weight = fga
+            bg_weight = (1 - fga)*bga
+            alpha_sum = fg_weight + bg_weight
+            rgb = fg[:,:,:3]*fg_weight + bg[:,:,:3]*bg_weight
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                rgb = np.where(alpha_sum > 0, rgb/alpha_sum, 0)
+            region[:,:,:3] = 255*rgb
+            region[:,:,3:] = 255*alpha_sum
 
     def align_points_to_camera(self, points):
         ## This is where projection should live
@@ -366,8 +1049,14 @@ class Camera(object):
         return 1 + (thickness-1)/factor
 
     def get_thickening_nudges(self, thickness):
+        thickness = int(thickness)
         _range = range(-thickness/2+1, thickness/2+1)
-        return np.array(list(it.product(_range, _range)))
+        nudges = np.array(list(it.product(_range, _range)))
+        if self.point_cloud_shape == "round":
+            center = np.mean(_range)
+            distances = np.linalg.norm(nudges - center, axis = 1)
+            nudges = nudges[distances <= thickness/2.0]
+        return nudges
 
     def thickened_coordinates(self, pixel_coords, thickness):
         nudges = self.get_thickening_nudges(thickness)
@@ -392,6 +1081,10 @@ class MovingCamera(Camera):
         digest_locals(self)
         Camera.__init__(self, **kwargs)
 
+    def get_state_signature(self):
+        return Camera.get_state_signature(self) + \
+            self.mobject.get_state_signature()
+
     def capture_mobjects(self, *args, **kwargs):
         self.space_center = self.mobject.get_center()
         self.realign_space_shape()        
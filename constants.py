@@ -78,10 +78,13 @@ TEX_IMAGE_DIR     = TEX_DIR #TODO, What is this doing?
 #These two may be depricated now.
 MOBJECT_DIR       = os.path.join(FILE_DIR, "mobjects")
 IMAGE_MOBJECT_DIR = os.path.join(MOBJECT_DIR, "image")
+SVG_GEOMETRY_DIR  = os.path.join(MOBJECT_DIR, "svg_geometry")
+#Where scenes saving their frames keep them, see frame_store.py
+FRAME_STORE_DIR   = os.path.join(FILE_DIR, "frames")
 
 for folder in [FILE_DIR, RASTER_IMAGE_DIR, SVG_IMAGE_DIR, ANIMATIONS_DIR, TEX_DIR,
-               TEX_IMAGE_DIR, MOBJECT_DIR, IMAGE_MOBJECT_DIR,
-               STAGED_SCENES_DIR]:
+               TEX_IMAGE_DIR, MOBJECT_DIR, IMAGE_MOBJECT_DIR, SVG_GEOMETRY_DIR,
+               STAGED_SCENES_DIR, FRAME_STORE_DIR]:
     if not os.path.exists(folder):
         os.makedirs(folder)
 
@@ -14,6 +14,7 @@ import subprocess as sp
 from helpers import *
 from scene import Scene
 from camera import Camera
+from render_timing import RenderTimer
 
 HELP_MESSAGE = """
    Usage:
@@ -28,6 +29,8 @@ HELP_MESSAGE = """
    -q don't print progress
    -f when writing to a movie file, export the frames in png sequence
    -t use transperency when exporting images
+   -j <n> render the frames of each animation across n processes
+   -r <file> write a json report of where rendering time went
 """
 SCENE_NOT_FOUND_MESSAGE = """
    That scene is not in the script
@@ -69,6 +72,8 @@ def get_configuration():
          parser.add_argument(short_arg, long_arg, action = "store_true")
       parser.add_argument("-o", "--output_name")
       parser.add_argument("-n", "--skip_to_animation_number")
+      parser.add_argument("-j", "--num_render_processes")
+      parser.add_argument("-r", "--timing_report")
       args = parser.parse_args()
    except argparse.ArgumentError as err:
       print(str(err))
@@ -88,6 +93,8 @@ def get_configuration():
       "write_all"       : args.write_all,
       "output_name"     : args.output_name,
       "skip_to_animation_number" : args.skip_to_animation_number,
+      "num_render_processes" : args.num_render_processes,
+      "timing_report"   : args.timing_report,
    }
    if args.low_quality:
       config["camera_config"] = LOW_QUALITY_CAMERA_CONFIG
@@ -103,6 +110,9 @@ def get_configuration():
    if stan is not None:
       config["skip_to_animation_number"] = int(stan)
 
+   nrp = config["num_render_processes"]
+   config["num_render_processes"] = 1 if nrp is None else int(nrp)
+
    config["skip_animations"] = any([
       config["show_last_frame"] and not config["write_to_movie"],
       config["skip_to_animation_number"],
@@ -220,6 +230,7 @@ def main():
          "output_directory",
          "save_pngs",
          "skip_to_animation_number",
+         "num_render_processes",
       ]
    ])
    
@@ -229,7 +240,10 @@ def main():
       scene_kwargs["save_pngs"] = True
       scene_kwargs["pngs_mode"] = config["saved_image_mode"]
       
-   for SceneClass in get_scene_classes(scene_names_to_classes, config):
+   scene_classes = get_scene_classes(scene_names_to_classes, config)
+   for SceneClass in scene_classes:
+      if config["timing_report"]:
+         scene_kwargs["render_timer"] = RenderTimer()
       try:
          handle_scene(SceneClass(**scene_kwargs), **config)
          play_finish_sound()
@@ -238,6 +252,12 @@ def main():
          traceback.print_exc()
          print("\n\n")
          play_error_sound()
+      if config["timing_report"]:
+         report_path = config["timing_report"]
+         if len(scene_classes) > 1:
+            root, ext = os.path.splitext(report_path)
+            report_path = root + "_" + SceneClass.__name__ + ext
+         scene_kwargs["render_timer"].write_report(report_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import numpy as np
+
+from constants import FRAME_STORE_DIR
+
+class FrameStore(object):
+    """
+    A list of frames kept in a file on disk rather than in memory.
+    Frames are read back through a memory map, so indexing returns
+    an array backed by the file, and changing that array in place
+    changes the stored frame.  Appending the same array several
+    times in a row, as wait does, stores it only once, so long as
+    it is not changed in between.
+
+    All frames must share the shape and dtype of the first.  The
+    file is unlinked as soon as it is made, so it goes away with
+    the store, even if the process dies.
+    """
+    def __init__(self, frames = [], directory = None):
+        directory = directory or FRAME_STORE_DIR
+        fd, file_path = tempfile.mkstemp(suffix = ".frames", dir = directory)
+        os.remove(file_path)
+        self.file = os.fdopen(fd, "r+b")
+        self.shape = None
+        self.dtype = None
+        #Entry n is which stored frame is frame n, and entry
+        #m of slot_counts is how many frames are stored frame m
+        self.slots = []
+        self.slot_counts = []
+        self.num_stored = 0
+        self.last_appended = None
+        self.memmap = None
+        self.extend(frames)
+
+    def append(self, frame):
+        if frame is self.last_appended and self.slots and \
+            np.array_equal(frame, self.get_memmap()[self.slots[-1]]):
+            self.slots.append(self.slots[-1])
+            self.slot_counts[self.slots[-1]] += 1
+            return
+        self.last_appended = frame
+        self.slots.append(self.store_frame(frame))
+
+    def store_frame(self, frame):
+        #Returns the slot frame is written to
+        frame = np.asarray(frame)
+        if self.shape is None:
+            self.shape, self.dtype = frame.shape, frame.dtype
+        elif frame.shape != self.shape:
+            raise ValueError("Frame of shape %s added to frames of shape %s"%(
+                str(frame.shape), str(self.shape)
+            ))
+        frame = np.ascontiguousarray(frame, dtype = self.dtype)
+        self.file.seek(self.num_stored*frame.nbytes)
+        self.file.write(memoryview(frame))
+        self.slot_counts.append(1)
+        self.num_stored += 1
+        return self.num_stored - 1
+
+    def extend(self, frames):
+        for frame in frames:
+            self.append(frame)
+
+    def __iadd__(self, frames):
+        self.extend(frames)
+        return self
+
+    def get_memmap(self):
+        if self.memmap is None or len(self.memmap) < self.num_stored:
+            self.file.flush()
+            self.memmap = np.memmap(
+                self.file, dtype = self.dtype, mode = "r+",
+                shape = (self.num_stored,) + self.shape,
+            )
+        return self.memmap
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.get_memmap()[self.slots[index]]
+
+    def __setitem__(self, index, frame):
+        """
+        Frames stored once for several entries are given a
+        slot of their own before they are changed.
+        """
+        slot = self.slots[index]
+        if self.slot_counts[slot] > 1:
+            self.slot_counts[slot] -= 1
+            self.slots[index] = self.store_frame(frame)
+        else:
+            self.get_memmap()[slot] = frame
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def close(self):
+        """
+        The disk space is freed once no arrays
+        taken from the store are left.
+        """
+        if not hasattr(self, "file") or self.file.closed:
+            return
+        self.memmap = None
+        self.file.close()
+
+    def __del__(self):
+        self.close()
@@ -11,6 +11,7 @@ import os
 from scipy import linalg
 
 from constants import *
+from frame_store import FrameStore
 
 CLOSED_THRESHOLD = 0.01
 STRAIGHT_PATH_THRESHOLD = 0.01
@@ -41,6 +42,104 @@ def play_finish_sound():
     play_chord(12, 9, 5, 2)
 
 def get_smooth_handle_points(points):
+    return get_smooth_handle_points_of_paths([points])[0]
+
+def get_smooth_handle_points_of_paths(paths):
+    """
+    For each array of anchor points in paths, returns the pair
+    of handle arrays making the path through them smooth, as
+    get_smooth_handle_points does for one.  Every path is solved
+    for in one banded solve, which takes time linear in the total
+    number of anchors.
+
+    Eliminating the second handles from the equations in
+    https://www.particleincell.com/2012/bezier-splines/ leaves a
+    tridiagonal system for the first handles h1, with rows
+        h1[i-1] + 4*h1[i] + h1[i+1] = 4*p[i] + 2*p[i+1]
+    except at the ends of open paths.  For closed paths the rows
+    wrap around, and that system is solved with Sherman-Morrison.
+    """
+    paths = [np.array(points, dtype = 'float') for points in paths]
+    results = [None]*len(paths)
+    #Each path is a block in one tridiagonal system
+    lower, diag, upper, rhs, corrections = [], [], [], [], []
+    blocks = []
+    size = 0
+    for index, points in enumerate(paths):
+        n = len(points) - 1
+        dim = points.shape[1]
+        if n < 1:
+            results[index] = (np.zeros((0, dim)), np.zeros((0, dim)))
+            continue
+        closed = is_closed(points)
+        if n == 1 or (closed and n < 3):
+            results[index] = get_smooth_handle_points_densely(points)
+            continue
+        l = np.ones(n)
+        d = 4*np.ones(n)
+        u = np.ones(n)
+        b = 4*points[:-1] + 2*points[1:]
+        correction = np.zeros(n)
+        if closed:
+            #Drop the corner entries, which join the first and
+            #last rows, and add them back in with Sherman-Morrison
+            gamma = -d[0]
+            d[0] -= gamma
+            d[-1] -= 1./gamma
+            correction[0] = gamma
+            correction[-1] = 1
+            b[-1] = 4*points[-2] + 2*points[0]
+        else:
+            d[0], u[0] = 2, 1
+            b[0] = points[0] + 2*points[1]
+            l[-1], d[-1] = 2, 7
+            b[-1] = 8*points[-2] + points[-1]
+        l[0] = u[-1] = 0
+        lower.append(l)
+        diag.append(d)
+        upper.append(u)
+        rhs.append(b)
+        corrections.append(correction)
+        blocks.append((index, size, n, closed))
+        size += n
+    if size == 0:
+        return results
+    lower, diag, upper, corrections = map(
+        np.concatenate, [lower, diag, upper, corrections]
+    )
+    dim = rhs[0].shape[1]
+    all_rhs = np.zeros((size, dim+1))
+    all_rhs[:,:dim] = np.concatenate(rhs)
+    all_rhs[:,dim] = corrections
+    #solve_banded wants the upper diagonal shifted right and the
+    #lower one shifted left
+    banded = np.zeros((3, size))
+    banded[0,1:] = upper[:-1]
+    banded[1] = diag
+    banded[2,:-1] = lower[1:]
+    solution = linalg.solve_banded((1, 1), banded, all_rhs)
+    for index, start, n, closed in blocks:
+        points = paths[index]
+        h1 = solution[start:start+n, :dim]
+        if closed:
+            z = solution[start:start+n, dim]
+            gamma = corrections[start]
+            factor = (h1[0] + h1[-1]/gamma) / (1 + z[0] + z[-1]/gamma)
+            h1 = h1 - np.outer(z, factor)
+            h2 = 2*points[1:] - np.roll(h1, -1, axis = 0)
+            h2[-1] = 2*points[0] - h1[0]
+        else:
+            h2 = np.zeros(h1.shape)
+            h2[:-1] = 2*points[1:-1] - h1[1:]
+            h2[-1] = (points[-1] + h1[-1])/2
+        results[index] = (h1, h2)
+    return results
+
+def get_smooth_handle_points_densely(points):
+    """
+    Solves the full system of equations for the handles, for
+    paths too short for get_smooth_handle_points_of_paths.
+    """
     points = np.array(points)
     num_handles = len(points) - 1
     dim = points.shape[1]    
@@ -174,24 +273,89 @@ def partial_bezier_points(points, a, b):
     return an array of the same size, which 
     describes the portion of the original bezier
     curve on the interval [a, b].
+    """
+    return partial_bezier_curves(np.array([points]), a, b)[0]
 
-    This algorithm is pretty nifty, and pretty dense.
+def partial_bezier_curves(curves, a, b):
     """
-    a_to_1 = np.array([
-        bezier(points[i:])(a)
-        for i in range(len(points))
-    ])
-    return np.array([
-        bezier(a_to_1[:i+1])((b-a)/(1.-a))
-        for i in range(len(points))
-    ])
+    partial_bezier_points for many curves at once.  curves has
+    shape (num_curves, degree+1, dim), and a and b are either
+    numbers or arrays holding one value per curve.
+    """
+    num_curves, num_points = curves.shape[:2]
+    a, b = [
+        np.ones(num_curves)*np.array(x, dtype = 'float').reshape(-1)
+        for x in a, b
+    ]
+    degree = num_points - 1
+    #Control point i of the portion is the blossom of the curve at
+    #(a, ..., a, b, ..., b) with b repeated i times, so its weights
+    #on the original control points are the coefficients of the
+    #polynomial ((1-a) + a*x)**(degree-i) * ((1-b) + b*x)**i
+    weights = np.zeros((num_curves, num_points, num_points))
+    for i in range(num_points):
+        coefs = weights[:,i]
+        coefs[:,0] = 1
+        for t in [a]*(degree-i) + [b]*i:
+            t = t.reshape((num_curves, 1))
+            coefs[:,1:] = (1-t)*coefs[:,1:] + t*coefs[:,:-1]
+            coefs[:,:1] *= 1-t
+    return np.matmul(weights, curves)
 
 def bezier(points):
-    n = len(points) - 1
-    return lambda t : sum([
-        ((1-t)**(n-k))*(t**k)*choose(n, k)*point
-        for k, point in enumerate(points)
-    ])
+    """
+    Returns the function of t tracing out the bezier curve with
+    these control points, which may be points or numbers.  t may
+    also be an array, giving one result per value.
+    """
+    points = np.array(points, dtype = 'float')
+    curve = points.reshape((1, len(points), -1))
+    def result(t):
+        values = bezier_curves_at(curve, t)[0]
+        values = values.reshape(np.shape(t) + points.shape[1:])
+        if values.ndim == 0:
+            return values[()]
+        return values
+    return result
+
+BERNSTEIN_MATRICES = {}
+
+def get_bernstein_matrix(degree):
+    """
+    Entry (j, k) is the coefficient of t**j in the Bernstein
+    polynomial choose(degree, k) * t**k * (1-t)**(degree-k)
+    """
+    if degree not in BERNSTEIN_MATRICES:
+        matrix = np.zeros((degree+1, degree+1))
+        for k in range(degree+1):
+            for j in range(k, degree+1):
+                matrix[j, k] = choose(degree, k)*choose(degree-k, j-k)*(-1)**(j-k)
+        BERNSTEIN_MATRICES[degree] = matrix
+    return BERNSTEIN_MATRICES[degree]
+
+def bezier_curves_at(curves, alphas, derivative = 0):
+    """
+    Evaluates each of the bezier curves, given as an array of shape
+    (num_curves, degree+1, dim), or its given derivative in t, at
+    each of alphas.  alphas is either one array of values shared by
+    all curves, or holds one row of values per curve.  Returns an
+    array of shape (num_curves, num_alphas, dim).
+    """
+    degree = curves.shape[1] - 1
+    alphas = np.array(alphas, dtype = 'float')
+    if alphas.ndim == 0:
+        alphas = alphas.reshape((1,))
+    #Derivative of each power t**j, being j!/(j-derivative)! t**(j-derivative)
+    powers = np.arange(degree+1) - derivative
+    factors = np.ones(degree+1)
+    for x in range(derivative):
+        factors *= powers + x + 1
+    factors[powers < 0] = 0
+    power_basis = factors*alphas[...,np.newaxis]**np.maximum(powers, 0)
+    return np.matmul(
+        np.dot(power_basis, get_bernstein_matrix(degree)),
+        curves
+    )
 
 def remove_list_redundancies(l):
     """
@@ -224,6 +388,24 @@ def adjacent_pairs(objects):
 def complex_to_R3(complex_num):
     return np.array((complex_num.real, complex_num.imag, 0))
 
+def vectorized_point_function(function):
+    """
+    Marks a function of a point as also accepting an array of
+    shape (N, 3), in which case it should return the (N, 3) array
+    of results.  Mobject.apply_function then calls it once for
+    all points rather than once per point.
+    """
+    function.accepts_point_arrays = True
+    return function
+
+def apply_function_to_points(function, points):
+    if getattr(function, "accepts_point_arrays", False):
+        result = np.asarray(function(points))
+        if result.shape == points.shape:
+            return result
+        #Doesn't keep its promise, so fall back to one point at a time
+    return np.apply_along_axis(function, 1, points)
+
 def tuplify(obj):
     if isinstance(obj, str):
         return (obj,)
@@ -373,8 +555,12 @@ def random_color():
 
 ################################################
 
+#Paths with accepts_alpha_arrays set can also take alpha as an
+#array of shape (len(start_points), 1), one value per point.
+
 def straight_path(start_points, end_points, alpha):
     return interpolate(start_points, end_points, alpha)
+straight_path.accepts_alpha_arrays = True
 
 def path_along_arc(arc_angle, axis = OUT):
     """
@@ -391,8 +577,16 @@ def path_along_arc(arc_angle, axis = OUT):
         centers = start_points + 0.5*vects
         if arc_angle != np.pi:
             centers += np.cross(unit_axis, vects/2.0)/np.tan(arc_angle/2)
-        rot_matrix = rotation_matrix(alpha*arc_angle, unit_axis)
-        return centers + np.dot(start_points-centers, rot_matrix.T)
+        if np.ndim(alpha) == 0:
+            rot_matrix = rotation_matrix(alpha*arc_angle, unit_axis)
+            return centers + np.dot(start_points-centers, rot_matrix.T)
+        #Separate angle for each point, by Rodrigues' rotation formula
+        angles = alpha*arc_angle
+        radii = start_points - centers
+        return centers + np.cos(angles)*radii + \
+            np.sin(angles)*np.cross(unit_axis, radii) + \
+            (1-np.cos(angles))*np.outer(np.dot(radii, unit_axis), unit_axis)
+    path.accepts_alpha_arrays = True
     return path
 
 def clockwise_path():
@@ -437,8 +631,12 @@ def get_full_raster_image_path(image_file_name):
     raise IOError("File %s not Found"%image_file_name)
 
 def drag_pixels(frames):
-    curr = frames[0]
-    new_frames = []
+    """
+    Returns new frames, kept in a FrameStore if
+    frames is one, leaving frames unchanged.
+    """
+    curr = np.array(frames[0])
+    new_frames = FrameStore() if isinstance(frames, FrameStore) else []
     for frame in frames:
         curr += (curr == 0) * np.array(frame)
         new_frames.append(np.array(curr))
@@ -449,6 +647,22 @@ def invert_image(image):
     arr = (255 * np.ones(arr.shape)).astype(arr.dtype) - arr
     return Image.fromarray(arr)
 
+def halve_rgba_array(rgba_array):
+    """
+    Averages each 2x2 block of pixels, weighting colors by alpha.
+    An odd last row or column is averaged with itself.
+    """
+    h, w = rgba_array.shape[:2]
+    arr = rgba_array.astype('float32')
+    arr[:,:,:3] *= arr[:,:,3:]/255
+    arr = np.pad(arr, [(0, h%2), (0, w%2), (0, 0)], mode = 'edge')
+    arr = (arr[0::2] + arr[1::2])/2
+    arr = (arr[:,0::2] + arr[:,1::2])/2
+    alphas = arr[:,:,3:]
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        arr[:,:,:3] = np.where(alphas > 0, 255*arr[:,:,:3]/alphas, 0)
+    return np.round(arr).astype(rgba_array.dtype)
+
 def stretch_array_to_length(nparray, length):
     curr_len = len(nparray)
     if curr_len > length:
@@ -1,6 +1,7 @@
 import numpy as np
 import itertools as it
 import os
+import zlib
 from PIL import Image
 from random import random
 
@@ -29,6 +30,7 @@ class ImageMobject(Mobject):
         else:
             self.pixel_array = np.array(filename_or_array)
         self.change_to_rgba_array()
+        self.clear_mipmaps()
         Mobject.__init__(self, **kwargs)
 
     def change_to_rgba_array(self):
@@ -50,6 +52,7 @@ class ImageMobject(Mobject):
         self.pixel_array[:,:,:3] = rgb
         if alpha is not None:
             self.pixel_array[:,:,3] = int(255*alpha)
+        self.clear_mipmaps()
         for submob in self.submobjects:
             submob.highlight(color, alpha, family)
         return self
@@ -67,8 +70,15 @@ class ImageMobject(Mobject):
         h, w = self.pixel_array.shape[:2]
         self.stretch_to_fit_width(self.height*w/h)
 
+    def get_style_signature(self):
+        return (
+            self.pixel_array.shape,
+            zlib.adler32(np.ascontiguousarray(self.pixel_array)),
+        )
+
     def set_opacity(self, alpha):
         self.pixel_array[:,:,3] = int(255*alpha)
+        self.clear_mipmaps()
         return self
 
     def fade(self, darkness = 0.5):
@@ -84,4 +94,29 @@ class ImageMobject(Mobject):
     def copy(self):
         return self.deepcopy()
 
+    def clear_mipmaps(self):
+        """
+        Call this after changing pixel_array in place
+        """
+        self.mipmaps = []
+
+    def get_mipmap(self, scale_factor):
+        """
+        Returns pixel_array, halved in size as many times as it
+        can be while staying at least as large as it will be drawn,
+        scale_factor times its full size.  The halvings are made
+        when first asked for, and kept.
+        """
+        if not self.mipmaps or self.mipmaps[0] is not self.pixel_array:
+            self.mipmaps = [self.pixel_array]
+        if scale_factor <= 0:
+            return self.pixel_array
+        level = int(np.floor(np.log2(1.0/scale_factor)))
+        while len(self.mipmaps) <= level:
+            last = self.mipmaps[-1]
+            if min(last.shape[:2]) <= 1:
+                break
+            self.mipmaps.append(halve_rgba_array(last))
+        return self.mipmaps[min(max(level, 0), len(self.mipmaps) - 1)]
+
 
@@ -2,6 +2,8 @@ import numpy as np
 import operator as op
 import os
 import copy
+import zlib
+import weakref
 from PIL import Image
 from colour import Color
 
@@ -10,6 +12,64 @@ from helpers import *
 
 #TODO: Explain array_attrs
 
+class SubmobjectList(list):
+    """
+    List of submobjects which tells its owner whenever it is
+    changed in place, so that cached families can be dropped.
+    """
+    def __init__(self, owner, submobjects = ()):
+        list.__init__(self, submobjects)
+        self.owner = owner
+
+    def __copy__(self):
+        #Copies belong to no mobject
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self), memo)
+
+def notify_owner_after(method, can_remove):
+    def wrapped_method(self, *args, **kwargs):
+        old_submobjects = list(self) if can_remove else []
+        result = method(self, *args, **kwargs)
+        self.owner.handle_submobjects_change(old_submobjects)
+        return result
+    return wrapped_method
+
+for method_names, can_remove in [
+    (["append", "extend", "insert", "sort", "reverse", "__iadd__"], False),
+    ([
+        "remove", "pop", "__setitem__", "__delitem__",
+        "__setslice__", "__delslice__", "__imul__",
+    ], True),
+    ]:
+    for method_name in method_names:
+        setattr(
+            SubmobjectList, method_name,
+            notify_owner_after(getattr(list, method_name), can_remove)
+        )
+
+class PointsPacking(object):
+    """
+    The points of a family stored in one array, see
+    Mobject.pack_points.  Members can't tell when their points
+    change through buff, so whatever changes it bumps version.
+    Once a member's points are reassigned, or the family changes,
+    is_valid is set to False for good.
+    """
+    def __init__(self, buff, mobs, lengths):
+        self.buff = buff
+        self.mobs = mobs
+        self.lengths = lengths
+        self.version = 0
+        self.is_valid = True
+
+    def __getstate__(self):
+        #Copies of buff are no longer what the members point into
+        state = dict(self.__dict__)
+        state["is_valid"] = False
+        return state
+
 class Mobject(object):
     """
     Mathematical Object
@@ -20,6 +80,9 @@ class Mobject(object):
         "name"         : None,
         "dim"          : 3,
         "target"       : None,
+        #When true, copies share array attrs with the original,
+        #read-only, until either one changes them, see copy
+        "copy_on_write" : False,
     }
     def __init__(self, *submobjects, **kwargs):
         digest_config(self, kwargs)
@@ -36,6 +99,106 @@ class Mobject(object):
     def __str__(self):
         return str(self.name)
 
+    def get_submobject_list(self):
+        return self.__dict__["submobject_list"]
+
+    def set_submobject_list(self, submobjects):
+        old_submobjects = self.__dict__.get("submobject_list", [])
+        self.__dict__["submobject_list"] = SubmobjectList(self, submobjects)
+        self.handle_submobjects_change(old_submobjects)
+
+    submobjects = property(get_submobject_list, set_submobject_list)
+
+    def get_points_attr(self):
+        return self.__dict__["points"]
+
+    def set_points_attr(self, points):
+        old_points = self.__dict__.get("points")
+        if points is not old_points:
+            #Only pack_points makes members of packings
+            packing = self.__dict__.pop("member_of_packing", None)
+            if packing is not None:
+                packing.is_valid = False
+            if old_points is None or (len(old_points) == 0) != (len(points) == 0):
+                #Which members have points is part of the family
+                #as far as packings are concerned
+                self.invalidate_family_cache()
+        self.__dict__["points"] = points
+        self.handle_points_change()
+
+    points = property(get_points_attr, set_points_attr)
+
+    def handle_points_change(self):
+        """
+        Called whenever points are assigned, including by augmented
+        assignments like mob.points += vect.  Anything else changing
+        them in place, as with mob.points[0] = point, calls it after.
+        """
+        self.__dict__.pop("bounding_box_cache", None)
+
+    def get_parent_refs(self):
+        return self.__dict__.setdefault("parent_refs", {})
+
+    def get_family_cache(self):
+        return self.__dict__.setdefault("family_cache", {})
+
+    def handle_submobjects_change(self, old_submobjects = []):
+        """
+        Called whenever the submobjects change, with those there
+        were before, if any might have been removed.
+        """
+        current_ids = set(map(id, self.submobjects))
+        for submob in old_submobjects:
+            if id(submob) not in current_ids:
+                submob.get_parent_refs().pop(id(self), None)
+        for submob in self.submobjects:
+            submob.get_parent_refs()[id(self)] = weakref.ref(self)
+        self.invalidate_family_cache()
+
+    def invalidate_family_cache(self):
+        """
+        Drops the cached family of this mobject and of everything
+        containing it.  A parent's family is only ever computed from
+        those of its submobjects, so once a mobject has nothing cached,
+        neither do its parents, and the walk upward can stop there.
+        Packings of those families are done with as well.
+        """
+        packing = self.__dict__.get("points_packing")
+        if packing is not None:
+            packing.is_valid = False
+        if self.get_family_cache().pop("all", None) is None:
+            return
+        for parent_ref in self.get_parent_refs().values():
+            parent = parent_ref()
+            if parent is not None:
+                parent.invalidate_family_cache()
+
+    def __copy__(self):
+        result = self.__class__.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+        result.__dict__["family_cache"] = {}
+        result.__dict__["parent_refs"] = {}
+        result.__dict__.pop("points_packing", None)
+        result.__dict__.pop("member_of_packing", None)
+        result.submobjects = list(self.submobjects)
+        return result
+
+    def __deepcopy__(self, memo):
+        result = self.__class__.__new__(self.__class__)
+        memo[id(self)] = result
+        for key, value in self.__dict__.items():
+            if key in [
+                "submobject_list", "family_cache", "parent_refs",
+                "points_packing", "member_of_packing", "bounding_box_cache",
+                ]:
+                continue
+            result.__dict__[key] = copy.deepcopy(value, memo)
+        result.submobjects = [
+            copy.deepcopy(submob, memo)
+            for submob in self.submobjects
+        ]
+        return result
+
     def init_points(self):
         self.points = np.zeros((0, self.dim))
 
@@ -84,6 +247,26 @@ class Mobject(object):
             setattr(self, attr, func(getattr(self, attr)))
         return self
 
+    def get_state_signature(self):
+        """
+        Cheap summary of everything which affects how the family
+        of this mobject is drawn.  Comparing these across frames
+        tells which mobjects have changed.
+        """
+        return tuple([
+            (id(mob), mob.get_style_signature()) + tuple([
+                (getattr(mob, attr).shape, zlib.adler32(
+                    np.ascontiguousarray(getattr(mob, attr))
+                ))
+                for attr in mob.get_array_attrs()
+            ])
+            for mob in self.submobject_family()
+        ])
+
+    def get_style_signature(self):
+        #For subclasses with drawing state outside their array attrs
+        return ()
+
     def get_image(self, camera = None):
         if camera is None:
             from camera import Camera
@@ -100,20 +283,51 @@ class Mobject(object):
         )
 
     def copy(self):
+        """
+        In copy_on_write mode, the copy shares the array attrs of
+        each family member, which are made read-only, so that
+        writing to one in place fails rather than changing both
+        mobjects.  Methods changing arrays in place first call
+        unshare_array_attrs to get a writable copy of their own.
+        """
         #TODO, either justify reason for shallow copy, or
         #remove this redundancy everywhere
         # return self.deepcopy() 
+        is_packed = self.get_packed_points() is not None
         copy_mobject = copy.copy(self)
-        copy_mobject.points = np.array(self.points)
+        if self.copy_on_write and not is_packed:
+            self.share_array_attrs()
+        else:
+            copy_mobject.points = np.array(self.points)
         copy_mobject.submobjects = [
             submob.copy() for submob in self.submobjects
         ]
-        family = self.submobject_family()
+        family_ids = set(map(id, self.submobject_family()))
         for attr, value in self.__dict__.items():
-            if isinstance(value, Mobject) and value in family and value is not self:
+            if isinstance(value, Mobject) and id(value) in family_ids and value is not self:
                 setattr(copy_mobject, attr, value.copy())
+        if is_packed:
+            copy_mobject.pack_points()
         return copy_mobject
 
+    def share_array_attrs(self):
+        for attr in self.get_array_attrs():
+            getattr(self, attr).flags.writeable = False
+        return self
+
+    def unshare_array_attrs(self):
+        #Read-only arrays may be held by copies, see copy
+        for attr in self.get_array_attrs():
+            array = getattr(self, attr)
+            if not array.flags.writeable:
+                setattr(self, attr, np.array(array))
+        return self
+
+    def set_copy_on_write(self, value = True):
+        for mob in self.submobject_family():
+            mob.copy_on_write = value
+        return self
+
     def deepcopy(self):
         return copy.deepcopy(self)
 
@@ -125,6 +339,41 @@ class Mobject(object):
             self.target = self.copy()
         return self.target
 
+    def pack_points(self):
+        """
+        Stores the points of every family member in one contiguous
+        array, with each member's points a view into it, so that
+        operations on the whole family can act on that array at once.
+        This lasts until a member's points are reassigned, or the
+        family changes, after which things just work as before.
+        """
+        mobs = self.family_members_with_points()
+        self.points_packing = None
+        if len(mobs) == 0:
+            return self
+        lengths = [len(mob.points) for mob in mobs]
+        buff = np.concatenate([mob.points for mob in mobs]).astype('float')
+        packing = PointsPacking(buff, mobs, lengths)
+        for mob, end, length in zip(mobs, np.cumsum(lengths), lengths):
+            mob.points = buff[end-length:end]
+            mob.member_of_packing = packing
+        self.points_packing = packing
+        return self
+
+    def get_packed_points(self):
+        """
+        Returns the array set up by pack_points, provided it
+        still holds the points of every member of the family.
+        """
+        packing = getattr(self, "points_packing", None)
+        if packing is None or not packing.is_valid:
+            return None
+        return packing.buff
+
+    def handle_packed_points_change(self):
+        #Called after changing the array get_packed_points returns
+        self.points_packing.version += 1
+
     #### Transforming operations ######
 
     def apply_to_family(self, func):
@@ -133,9 +382,18 @@ class Mobject(object):
 
     def shift(self, *vectors):
         total_vector = reduce(op.add, vectors)
+        packed_points = self.get_packed_points()
+        if packed_points is not None:
+            packed_points += total_vector
+            self.handle_packed_points_change()
+            return self
+        #Changed in place, so members packed with some other
+        #family stay views into its packed array
         for mob in self.family_members_with_points():
-           mob.points = mob.points.astype('float')
-           mob.points += total_vector
+            mob.unshare_array_attrs()
+            if mob.points.dtype != 'float':
+                mob.points = mob.points.astype('float')
+            mob.points += total_vector
         return self
 
     def scale(self, scale_factor, **kwargs):
@@ -175,11 +433,15 @@ class Mobject(object):
         return self
 
     def apply_function(self, function, **kwargs):
+        """
+        function maps a point to a point, see vectorized_point_function
+        for having it map all points in one call instead.
+        """
         #Default to applying matrix about the origin, not mobjects center
         if len(kwargs) == 0:
             kwargs["about_point"] = ORIGIN
         self.apply_points_function_about_point(
-            lambda points : np.apply_along_axis(function, 1, points),
+            lambda points : apply_function_to_points(function, points),
             **kwargs
         )
         return self
@@ -198,10 +460,20 @@ class Mobject(object):
         return self
 
     def apply_complex_function(self, function, **kwargs):
-        return self.apply_function(
-            lambda (x, y, z) : complex_to_R3(function(complex(x, y))),
-            **kwargs
-        )
+        if getattr(function, "accepts_point_arrays", False):
+            #function takes an array of complex numbers
+            @vectorized_point_function
+            def point_function(points):
+                outputs = function(points[:,0] + 1j*points[:,1])
+                result = np.zeros(points.shape)
+                result[:,0] = np.real(outputs)
+                result[:,1] = np.imag(outputs)
+                return result
+        else:
+            point_function = lambda (x, y, z) : complex_to_R3(
+                function(complex(x, y))
+            )
+        return self.apply_function(point_function, **kwargs)
 
     def wag(self, direction = RIGHT, axis = DOWN, wag_factor = 1.0):
         for mob in self.family_members_with_points():
@@ -209,6 +481,7 @@ class Mobject(object):
             alphas -= min(alphas)
             alphas /= max(alphas)
             alphas = alphas**wag_factor
+            mob.unshare_array_attrs()
             mob.points += np.dot(
                 alphas.reshape((len(alphas), 1)),
                 np.array(direction).reshape((1, mob.dim))
@@ -242,9 +515,17 @@ class Mobject(object):
     def apply_points_function_about_point(self, func, about_point = None, about_edge = ORIGIN):
         if about_point is None:
             about_point = self.get_critical_point(about_edge)
+        packed_points = self.get_packed_points()
+        if packed_points is not None:
+            packed_points -= about_point
+            packed_points[:] = func(packed_points)
+            packed_points += about_point
+            self.handle_packed_points_change()
+            return self
         for mob in self.family_members_with_points():
+            mob.unshare_array_attrs()
             mob.points -= about_point
-            mob.points = func(mob.points)
+            mob.points[:] = func(mob.points)
             mob.points += about_point
         return self
 
@@ -546,6 +827,10 @@ class Mobject(object):
         return result
 
     def get_all_points(self):
+        packed_points = self.get_packed_points()
+        if packed_points is not None:
+            #Changing the packed array would change every member
+            return np.array(packed_points)
         return self.get_merged_array("points")
 
     ### Getters ###
@@ -556,20 +841,49 @@ class Mobject(object):
     def get_num_points(self):
         return len(self.points)
 
+    def get_own_bounding_box(self):
+        """
+        Returns the array [min_corner, max_corner] of the points
+        defining this mobject's boundary, ignoring submobjects, or
+        None if there are no such points.  The box is cached until
+        the points change, see handle_points_change, or, for members
+        of a packing, until the packed array changes.
+        """
+        packing = self.__dict__.get("member_of_packing")
+        key = None if packing is None else (packing, packing.version)
+        cached = self.__dict__.get("bounding_box_cache")
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        boundary = self.get_points_defining_boundary()
+        if len(boundary) == 0:
+            box = None
+        else:
+            box = np.array([boundary.min(0), boundary.max(0)])
+        self.bounding_box_cache = (key, box)
+        return box
+
+    def get_bounding_box(self):
+        """
+        Returns [min_corner, max_corner] over the whole family.  As
+        with reduce_across_dimension, members with neither points
+        nor submobjects count as a point at the origin.
+        """
+        boxes = []
+        for mob in self.submobject_family():
+            box = mob.get_own_bounding_box()
+            if box is not None:
+                boxes.append(box)
+            elif len(mob.submobjects) == 0:
+                boxes.append(np.zeros((2, mob.dim)))
+        boxes = np.array(boxes)
+        return np.array([boxes[:,0].min(0), boxes[:,1].max(0)])
+
     def get_critical_point(self, direction):
-        result = np.zeros(self.dim)
-        for dim in range(self.dim):
-            if direction[dim] <= 0:
-                min_point = self.reduce_across_dimension(np.min, np.min, dim)
-            if direction[dim] >= 0:
-                max_point = self.reduce_across_dimension(np.max, np.max, dim)
-
-            if direction[dim] == 0:
-                result[dim] = (max_point+min_point)/2
-            elif direction[dim] < 0:
-                result[dim] = min_point
-            else:
-                result[dim] = max_point
+        min_point, max_point = self.get_bounding_box()[:,:self.dim]
+        direction = np.array(direction[:self.dim])
+        result = (min_point + max_point)/2.0
+        result[direction < 0] = min_point[direction < 0]
+        result[direction > 0] = max_point[direction > 0]
         return result
 
     # Pseudonyms for more general get_critical_point method
@@ -608,10 +922,8 @@ class Mobject(object):
         return self.get_edge_center(IN)
 
     def length_over_dim(self, dim):
-        return (
-            self.reduce_across_dimension(np.max, np.max, dim) -
-            self.reduce_across_dimension(np.min, np.min, dim)
-        )
+        min_point, max_point = self.get_bounding_box()
+        return max_point[dim] - min_point[dim]
 
     def get_width(self):
         return self.length_over_dim(0)
@@ -642,15 +954,20 @@ class Mobject(object):
         return result + self.submobjects
 
     def submobject_family(self):
-        sub_families = map(Mobject.submobject_family, self.submobjects)
-        all_mobjects = [self] + list(it.chain(*sub_families))
-        return remove_list_redundancies(all_mobjects)
+        cache = self.get_family_cache()
+        if "all" not in cache:
+            sub_families = map(Mobject.submobject_family, self.submobjects)
+            all_mobjects = [self] + list(it.chain(*sub_families))
+            cache["all"] = remove_list_redundancies(all_mobjects)
+        return list(cache["all"])
 
     def family_members_with_points(self):
-        return filter(
-            lambda m : m.get_num_points() > 0,
-            self.submobject_family()
-        )
+        #Points can be emptied or filled at any time, so this is
+        #filtered afresh from the cached family
+        return [
+            mob for mob in self.submobject_family()
+            if mob.get_num_points() > 0
+        ]
 
     def arrange_submobjects(self, direction = RIGHT, center = True, **kwargs):
         for m1, m2 in zip(self.submobjects, self.submobjects[1:]):
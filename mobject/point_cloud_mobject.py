@@ -34,6 +34,7 @@ class PMobject(Mobject):
         rgba = color_to_rgba(color)
         mobs = self.family_members_with_points() if family else [self]
         for mob in mobs:
+            mob.unshare_array_attrs()
             mob.rgbas[:,:] = rgba
         return self
 
@@ -1,5 +1,8 @@
 from xml.dom import minidom
 import warnings
+import collections
+import hashlib
+import cPickle
 
 from vectorized_mobject import VMobject
 from topics.geometry import Rectangle, Circle
@@ -14,6 +17,11 @@ def string_to_numbers(num_string):
         if s != ""
     ]
 
+#Parsed leaf mobjects of recently loaded svg files, keyed by
+#file path, modification time and SVGMobject class
+SVG_GEOMETRY_CACHE = collections.OrderedDict()
+SVG_GEOMETRY_CACHE_SIZE = 512
+
 class SVGMobject(VMobject):
     CONFIG = {
         "should_center" : True,
@@ -25,6 +33,7 @@ class SVGMobject(VMobject):
         "fill_opacity" : 1,
         # "fill_color" : LIGHT_GREY,
         "propagate_style_to_family" : True,
+        "use_geometry_cache" : True,
     }
     def __init__(self, **kwargs):
         digest_config(self, kwargs, locals())
@@ -47,11 +56,83 @@ class SVGMobject(VMobject):
         raise IOError("No file matching %s in image directory"%self.file_name)
 
     def generate_points(self):
+        if self.use_geometry_cache:
+            self.add(*self.get_cached_mobjects())
+        else:
+            self.add(*self.get_mobjects_from_file())
+
+    def get_mobjects_from_file(self):
         doc = minidom.parse(self.file_path)
         self.ref_to_element = {}
+        result = []
         for svg in doc.getElementsByTagName("svg"):
-            self.add(*self.get_mobjects_from(svg))
+            result += self.get_mobjects_from(svg)
         doc.unlink()
+        return result
+
+    def get_cached_mobjects(self):
+        """
+        Returns copies of the mobjects parsed from the file, which are
+        kept in memory for recently used files, and saved to disk as
+        point arrays so that other runs can skip parsing too.
+        """
+        key = self.get_geometry_cache_key()
+        if key in SVG_GEOMETRY_CACHE:
+            templates = SVG_GEOMETRY_CACHE.pop(key)
+        else:
+            templates = self.load_geometry(key)
+            if templates is None:
+                templates = self.get_mobjects_from_file()
+                self.save_geometry(key, templates)
+        SVG_GEOMETRY_CACHE[key] = templates
+        while len(SVG_GEOMETRY_CACHE) > SVG_GEOMETRY_CACHE_SIZE:
+            SVG_GEOMETRY_CACHE.popitem(last = False)
+        return [template.copy() for template in templates]
+
+    def get_geometry_cache_key(self):
+        return (
+            os.path.abspath(self.file_path),
+            os.path.getmtime(self.file_path),
+            self.__class__.__module__ + "." + self.__class__.__name__,
+        )
+
+    def get_geometry_file_path(self, key):
+        return os.path.join(
+            SVG_GEOMETRY_DIR,
+            hashlib.sha256(repr(key)).hexdigest()[:32] + ".pkl"
+        )
+
+    def save_geometry(self, key, mobjects):
+        #Each mobject is stored as its points followed
+        #by the points of each of its subpaths
+        geometry = [
+            [mob.points] + [sm.points for sm in mob.get_subpath_mobjects()]
+            for mob in mobjects
+        ]
+        path = self.get_geometry_file_path(key)
+        temp_path = path + ".%d.tmp"%os.getpid()
+        with open(temp_path, "wb") as outfile:
+            cPickle.dump(geometry, outfile, cPickle.HIGHEST_PROTOCOL)
+        os.rename(temp_path, path)
+
+    def load_geometry(self, key):
+        path = self.get_geometry_file_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as infile:
+                geometry = cPickle.load(infile)
+        except:
+            warnings.warn("Could not read cached geometry %s"%path)
+            return None
+        result = []
+        for points_list in geometry:
+            mob = self.path_string_to_mobject("")
+            mob.set_points(points_list[0])
+            for points in points_list[1:]:
+                mob.add_subpath(points)
+            result.append(mob)
+        return result
 
     def get_mobjects_from(self, element):
         result = []
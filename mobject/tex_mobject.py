@@ -5,6 +5,9 @@ from svg_mobject import SVGMobject, VMobjectFromSVGPathstring
 from topics.geometry import BackgroundRectangle
 
 import collections
+import hashlib
+import multiprocessing as mp
+from multiprocessing.pool import ThreadPool
 import sys
 
 TEX_MOB_SCALE_FACTOR = 0.05
@@ -300,20 +303,89 @@ class BulletedList(TextMobject):
 
 ##########
 
+TEMPLATE_TEX_CONTENTS = {}
+
+def get_template_tex_contents(template_tex_file):
+    key = (template_tex_file, os.path.getmtime(template_tex_file))
+    if key not in TEMPLATE_TEX_CONTENTS:
+        with open(template_tex_file, "r") as infile:
+            TEMPLATE_TEX_CONTENTS[key] = infile.read()
+    return TEMPLATE_TEX_CONTENTS[key]
+
 def tex_hash(expression, template_tex_file):
-    return str(hash(expression + template_tex_file))
+    """
+    Stable across processes, and changes whenever the contents
+    of the template change, not just its path.
+    """
+    hasher = hashlib.sha256(get_template_tex_contents(template_tex_file))
+    hasher.update(expression)
+    return hasher.hexdigest()[:32]
 
 def tex_to_svg_file(expression, template_tex_file):
-    image_dir = os.path.join(
+    svg_file = os.path.join(
         TEX_IMAGE_DIR,
         tex_hash(expression, template_tex_file)
-    )
-    if os.path.exists(image_dir):
-        return get_sorted_image_list(image_dir)
+    ) + ".svg"
+    if os.path.exists(svg_file):
+        return svg_file
     tex_file = generate_tex_file(expression, template_tex_file)
     dvi_file = tex_to_dvi(tex_file)
     return dvi_to_svg(dvi_file)
 
+def tex_to_svg_files(expressions, template_tex_file, num_processes = None):
+    """
+    Like tex_to_svg_file, but for many expressions at once, with
+    those not yet in the cache compiled concurrently.  The work
+    happens in latex and dvisvgm subprocesses, so a pool of threads
+    is enough to keep that many of them running.
+    """
+    if num_processes is None:
+        num_processes = mp.cpu_count()
+    expressions = remove_list_redundancies(expressions)
+    to_compile = filter(
+        lambda e : not os.path.exists(os.path.join(
+            TEX_IMAGE_DIR, tex_hash(e, template_tex_file) + ".svg"
+        )),
+        expressions
+    )
+    if len(to_compile) > 1 and num_processes > 1:
+        pool = ThreadPool(min(num_processes, len(to_compile)))
+        try:
+            pool.map(
+                lambda e : tex_to_svg_file(e, template_tex_file),
+                to_compile
+            )
+        finally:
+            pool.close()
+            pool.join()
+    return [
+        tex_to_svg_file(expression, template_tex_file)
+        for expression in expressions
+    ]
+
+def precompile_tex_mobjects(args_list, TexClass = TexMobject, **kwargs):
+    """
+    Compiles, in one concurrent batch, every svg file that
+    TexClass(*args, **kwargs) would need for each args in args_list,
+    so that constructing those mobjects afterwards only hits the cache.
+    """
+    template_to_expressions = collections.defaultdict(list)
+    def add_expression(args, config):
+        tex_mob = TexClass.__new__(TexClass)
+        tex_mob.args = list(args)
+        digest_config(tex_mob, config)
+        template_to_expressions[tex_mob.template_tex_file].append(
+            tex_mob.get_modified_expression()
+        )
+    for args in map(tuplify, args_list):
+        add_expression(args, kwargs)
+        if len(args) > 1:
+            #See TexMobject.handle_multiple_args
+            for arg in args:
+                add_expression([arg], TexClass.CONFIG)
+    for template_tex_file, expressions in template_to_expressions.items():
+        tex_to_svg_files(expressions, template_tex_file)
+
 def generate_tex_file(expression, template_tex_file):
     result = os.path.join(
         TEX_DIR,
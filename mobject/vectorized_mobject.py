@@ -116,6 +116,13 @@ class VMobject(Mobject):
     def get_stroke_width(self):
         return max(0, self.stroke_width)
 
+    def get_style_signature(self):
+        return (
+            tuple(self.stroke_rgb), self.stroke_width,
+            tuple(self.fill_rgb), self.fill_opacity,
+            self.is_subpath, self.mark_paths_closed,
+        )
+
     def get_color(self):
         if self.fill_opacity == 0:
             return self.get_stroke_color()
@@ -125,7 +132,9 @@ class VMobject(Mobject):
     def start_at(self, point):
         if len(self.points) == 0:
             self.points = np.zeros((1, 3))
+        self.unshare_array_attrs()
         self.points[0] = point
+        self.handle_points_change()
         return self
 
     def add_control_points(self, control_points):
@@ -144,11 +153,12 @@ class VMobject(Mobject):
         assert(len(anchors) == len(handles1)+1)
         assert(len(anchors) == len(handles2)+1)
         total_len = 3*(len(anchors)-1) + 1
-        self.points = np.zeros((total_len, self.dim))
-        self.points[0] = anchors[0]
+        points = np.zeros((total_len, self.dim))
+        points[0] = anchors[0]
         arrays = [handles1, handles2, anchors[1:]]
         for index, array in enumerate(arrays):
-            self.points[index+1::3] = array
+            points[index+1::3] = array
+        self.points = points
         return self.points
 
     def set_points_as_corners(self, points):
@@ -173,10 +183,7 @@ class VMobject(Mobject):
         return self
 
     def set_anchor_points(self, points, mode = "smooth"):
-        if not isinstance(points, np.ndarray):
-            points = np.array(points)
-        if self.close_new_points and not is_closed(points):
-            points = np.append(points, [points[0]], axis = 0)
+        points = self.get_new_anchor_points(points)
         if mode == "smooth":
             self.set_points_smoothly(points)
         elif mode == "corners":
@@ -185,10 +192,21 @@ class VMobject(Mobject):
             raise Exception("Unknown mode")
         return self
 
+    def get_new_anchor_points(self, points):
+        if not isinstance(points, np.ndarray):
+            points = np.array(points)
+        if self.close_new_points and not is_closed(points):
+            points = np.append(points, [points[0]], axis = 0)
+        return points
+
     def change_anchor_mode(self, mode):
-        for submob in self.family_members_with_points():
-            anchors, h1, h2 = submob.get_anchors_and_handles()
-            submob.set_anchor_points(anchors, mode = mode)
+        submobs = self.family_members_with_points()
+        if mode != "smooth":
+            for submob in submobs:
+                anchors, h1, h2 = submob.get_anchors_and_handles()
+                submob.set_anchor_points(anchors, mode = mode)
+            return self
+        make_smooth_together(submobs)
         return self
 
     def make_smooth(self):
@@ -254,13 +272,13 @@ class VMobject(Mobject):
         """
         if self.get_num_points() == 0:
             return
-        anchors, handles1, handles2 = self.get_anchors_and_handles()
-        # print len(anchors), len(handles1), len(handles2)
-        a_to_h1 = handles1 - anchors[:-1]
-        a_to_h2 = handles2 - anchors[1:]
-        handles1 = anchors[:-1] + factor*a_to_h1
-        handles2 = anchors[1:] + factor*a_to_h2
-        self.set_anchors_and_handles(anchors, handles1, handles2)
+        #Changed in place, so that packed points stay packed
+        self.unshare_array_attrs()
+        anchors = self.get_anchors()
+        points = self.points
+        points[1::3] = interpolate(anchors[:-1], points[1::3], factor)
+        points[2::3] = interpolate(anchors[1:], points[2::3], factor)
+        self.handle_points_change()
 
     ## Information about line
 
@@ -271,15 +289,42 @@ class VMobject(Mobject):
     def get_nth_curve(self, n):
         return bezier(self.points[3*n:3*n+4])
 
+    def get_cubics(self):
+        """
+        Array of shape (num_cubics, 4, dim) holding the
+        control points of each cubic
+        """
+        num_cubics = self.get_num_anchor_points()-1
+        return self.points[
+            3*np.arange(num_cubics).reshape((-1, 1)) + np.arange(4)
+        ]
+
     def get_num_anchor_points(self):
         return (len(self.points) - 1)/3 + 1
 
     def point_from_proportion(self, alpha):
+        return self.points_from_proportions([alpha])[0]
+
+    def points_from_proportions(self, alphas, derivative = 0):
+        """
+        point_from_proportion for each of alphas, evaluating all
+        of them at once.  With derivative = 1 this gives tangent
+        vectors instead, scaled as the derivative of each cubic.
+        """
+        alphas = np.clip(np.array(alphas, dtype = 'float'), 0, 1)
         num_cubics = self.get_num_anchor_points()-1
-        interpoint_alpha = num_cubics*(alpha % (1./num_cubics))
-        index = min(3*int(alpha*num_cubics), 3*num_cubics)
-        cubic = bezier(self.points[index:index+4])
-        return cubic(interpoint_alpha)
+        if num_cubics < 1:
+            if derivative > 0:
+                return np.zeros((len(alphas), self.dim))
+            return np.repeat(self.points[:1], len(alphas), axis = 0)
+        scaled_alphas = alphas*num_cubics
+        indices = np.minimum(scaled_alphas.astype('int'), num_cubics-1)
+        values = bezier_curves_at(
+            self.get_cubics()[indices],
+            (scaled_alphas - indices).reshape((-1, 1)),
+            derivative = derivative,
+        )
+        return values[:,0]
 
     def get_anchors_and_handles(self):
         return [
@@ -319,25 +364,30 @@ class VMobject(Mobject):
         if curr == 1:
             self.points = np.repeat(self.points, 3*n+1, axis = 0)
             return self
-        points = np.array([self.points[0]])
         num_curves = curr-1
+        if num_curves < 1 or curr+n-1 < 1:
+            self.set_points(self.points[:1])
+            return self
         #Curves in self are buckets, and we need to know 
         #how many new anchor points to put into each one.  
         #Each element of index_allocation is like a bucket, 
         #and its value tells you the appropriate index of 
         #the smaller curve.
         index_allocation = (np.arange(curr+n-1) * num_curves)/(curr+n-1)
-        for index in range(num_curves):
-            curr_bezier_points = self.points[3*index:3*index+4]
-            num_inter_curves = sum(index_allocation == index)
-            alphas = np.arange(0, num_inter_curves+1)/float(num_inter_curves)
-            for a, b in zip(alphas, alphas[1:]):
-                new_points = partial_bezier_points(
-                    curr_bezier_points, a, b
-                )
-                points = np.append(
-                    points, new_points[1:], axis = 0
-                )
+        bucket_sizes = np.bincount(index_allocation, minlength = num_curves)
+        bucket_starts = np.cumsum(bucket_sizes) - bucket_sizes
+        #Each new curve is the portion of its bucket's curve
+        #between these alphas
+        positions = np.arange(len(index_allocation)) - \
+            bucket_starts[index_allocation]
+        sizes = bucket_sizes[index_allocation].astype('float')
+        new_curves = partial_bezier_curves(
+            self.get_cubics()[index_allocation],
+            positions/sizes, (positions+1)/sizes
+        )
+        points = np.zeros((3*len(new_curves)+1, self.dim))
+        points[0] = self.points[0]
+        points[1:] = new_curves[:,1:].reshape((-1, self.dim))
         self.set_points(points)
         return self
     
@@ -351,14 +401,16 @@ class VMobject(Mobject):
             return VectorizedPoint(submobject.points[0])
         return submobject.copy()
     
-    def interpolate_color(self, mobject1, mobject2, alpha):
-        attrs = [
+    def get_color_attrs(self):
+        return [
             "stroke_rgb", 
             "stroke_width",            
             "fill_rgb", 
             "fill_opacity",
         ]
-        for attr in attrs:
+
+    def interpolate_color(self, mobject1, mobject2, alpha):
+        for attr in self.get_color_attrs():
             setattr(self, attr, interpolate(
                 getattr(mobject1, attr),
                 getattr(mobject2, attr),
@@ -399,6 +451,26 @@ class VMobject(Mobject):
         self.set_points(points)
         return self
 
+def make_smooth_together(vmobjects):
+    """
+    Same as calling make_smooth on each of vmobjects, ignoring
+    their submobjects, but solves for all handles at once.
+    """
+    vmobjects_and_anchors = [
+        (vmobject, vmobject.get_new_anchor_points(vmobject.get_anchors()))
+        for vmobject in vmobjects
+    ]
+    vmobjects_and_anchors = [
+        (vmobject, anchors)
+        for vmobject, anchors in vmobjects_and_anchors
+        if len(anchors) > 1
+    ]
+    handle_pairs = get_smooth_handle_points_of_paths([
+        anchors for vmobject, anchors in vmobjects_and_anchors
+    ])
+    for (vmobject, anchors), (h1, h2) in zip(vmobjects_and_anchors, handle_pairs):
+        vmobject.set_anchors_and_handles(anchors, h1, h2)
+
 class VGroup(VMobject):
     #Alternate name to improve readability during use
     pass 
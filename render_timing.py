@@ -0,0 +1,109 @@
+import time
+import json
+
+class RenderTimer(object):
+    """
+    Adds up the time spent in named stages of rendering, for
+    each play or wait call and for each frame within it.  Stages
+    can be nested, in which case time spent in the inner stage
+    is not also counted towards the outer one.
+    """
+    def __init__(self):
+        self.records = []
+        self.current_record = None
+        self.current_frame = None
+        self.open_stages = []
+
+    def begin_record(self, name, **info):
+        self.end_record()
+        self.current_record = dict(info)
+        self.current_record.update({
+            "name" : name,
+            "start_time" : time.time(),
+            "stages" : {},
+            "frames" : [],
+        })
+        self.records.append(self.current_record)
+
+    def end_record(self):
+        self.end_frame()
+        record = self.current_record
+        if record is None:
+            return
+        record["total_time"] = time.time() - record.pop("start_time")
+        record["num_frames"] = len(record["frames"])
+        self.current_record = None
+
+    def begin_frame(self):
+        self.end_frame()
+        if self.current_record is not None:
+            self.current_frame = {}
+            self.current_record["frames"].append(self.current_frame)
+
+    def end_frame(self):
+        self.current_frame = None
+
+    def stage(self, name):
+        return TimedStage(self, name)
+
+    def add_time(self, name, duration):
+        if self.current_record is None:
+            return
+        for stages in self.current_record["stages"], self.current_frame:
+            if stages is not None:
+                stages[name] = stages.get(name, 0) + duration
+
+    def get_report(self):
+        totals = {}
+        for record in self.records:
+            for name, duration in record["stages"].items():
+                totals[name] = totals.get(name, 0) + duration
+        return {
+            "total_time" : sum([r.get("total_time", 0) for r in self.records]),
+            "stages" : totals,
+            "records" : self.records,
+        }
+
+    def write_report(self, file_path):
+        self.end_record()
+        with open(file_path, "w") as fp:
+            json.dump(self.get_report(), fp, indent = 1, sort_keys = True)
+
+class TimedStage(object):
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start_time = time.time()
+        self.inner_time = 0
+        self.timer.open_stages.append(self)
+
+    def __exit__(self, *exc_info):
+        elapsed = time.time() - self.start_time
+        self.timer.open_stages.pop()
+        if self.timer.open_stages:
+            self.timer.open_stages[-1].inner_time += elapsed
+        self.timer.add_time(self.name, elapsed - self.inner_time)
+
+class NullRenderTimer(RenderTimer):
+    """
+    Stands in for a RenderTimer when nothing is being measured.
+    """
+    def begin_record(self, name, **info):
+        pass
+
+    def begin_frame(self):
+        pass
+
+    def stage(self, name):
+        return NULL_STAGE
+
+class NullStage(object):
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+NULL_STAGE = NullStage()
@@ -0,0 +1,90 @@
+import numpy as np
+import threading
+import Queue
+import time
+
+from helpers import *
+
+class MovieWriter(object):
+    """
+    Feeds frames to a process (typically ffmpeg) reading raw
+    frames on its stdin, from a background thread, so that encoding
+    overlaps with rendering.  Frames are copied into a recycled pool
+    of buffers, which are written to the pipe without further copies.
+    """
+    CONFIG = {
+        #Number of frames which can be waiting to be written
+        "pool_size" : 8,
+    }
+    def __init__(self, writing_process, frame_shape, **kwargs):
+        digest_config(self, kwargs, locals())
+        self.free_buffers = Queue.Queue()
+        for x in range(self.pool_size):
+            self.free_buffers.put(np.zeros(frame_shape, dtype = 'uint8'))
+        self.queued_buffers = Queue.Queue()
+        self.last_buffer = None
+        self.num_frames = 0
+        self.max_queue_depth = 0
+        self.total_queue_depth = 0
+        self.stall_time = 0
+        self.error = None
+        self.thread = threading.Thread(target = self.write_queued_buffers)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def write_queued_buffers(self):
+        while True:
+            buff = self.queued_buffers.get()
+            if buff is None:
+                return
+            try:
+                if self.error is None:
+                    self.writing_process.stdin.write(memoryview(buff))
+            except Exception as error:
+                self.error = error
+            self.free_buffers.put(buff)
+
+    def write_frame(self, frame):
+        """
+        frame is copied before this returns, so it may be
+        something that is about to be drawn over, like the
+        pixel array of a camera.
+        """
+        self.raise_error_if_any()
+        try:
+            buff = self.free_buffers.get_nowait()
+        except Queue.Empty:
+            stall_start = time.time()
+            buff = self.free_buffers.get()
+            self.stall_time += time.time() - stall_start
+        np.copyto(buff, frame)
+        self.queued_buffers.put(buff)
+        self.last_buffer = buff
+        queue_depth = self.queued_buffers.qsize()
+        self.num_frames += 1
+        self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+        self.total_queue_depth += queue_depth
+
+    def raise_error_if_any(self):
+        if self.error is not None:
+            raise self.error
+
+    def get_stats(self):
+        return {
+            "num_frames" : self.num_frames,
+            "max_queue_depth" : self.max_queue_depth,
+            "mean_queue_depth" : float(self.total_queue_depth)/max(self.num_frames, 1),
+            "stall_time" : self.stall_time,
+        }
+
+    def close(self):
+        """
+        Waits for every queued frame to be written, then closes
+        the pipe and waits for the process to finish.
+        """
+        self.queued_buffers.put(None)
+        self.thread.join()
+        self.writing_process.stdin.close()
+        self.writing_process.wait()
+        self.raise_error_if_any()
+        return self.get_stats()
@@ -9,12 +9,19 @@ import shutil
 import copy
 from tqdm import tqdm as ProgressDisplay
 import inspect
+import hashlib
+import types
+import weakref
+import multiprocessing as mp
 import subprocess as sp
 
 from helpers import *
 
 from camera import Camera
 from tk_scene import TkSceneRoot
+from movie_writer import MovieWriter
+from render_timing import NullRenderTimer
+from frame_store import FrameStore
 from mobject import Mobject, VMobject
 from animation import Animation
 from animation.animation import sync_animation_run_times_and_rate_funcs
@@ -38,15 +45,35 @@ class Scene(object):
         "always_continually_update" : False,
         "random_seed" : 0,
         "skip_to_animation_number" : None,
+        #Number of processes frames of a single play call
+        #are rendered across.  1 means render serially.
+        "num_render_processes" : 1,
+        #Keep mobjects which did not change since the last frame
+        #as cached layers, rather than redrawing them every frame
+        "cache_static_layers" : False,
+        #Runs of identical frames lasting at least this many seconds
+        #are encoded from a single still image, rather than piped to
+        #ffmpeg frame by frame.  None means never.
+        "min_static_hold_duration" : 1.0,
+        #Reuse the movie segment of any play or wait call whose
+        #animations and starting state match those of an earlier run
+        "cache_movie_segments" : True,
+        #Pass a render_timing.RenderTimer to record where time
+        #goes in each play and wait call.  Frames rendered by
+        #worker processes (see num_render_processes) are not timed.
+        "render_timer" : NullRenderTimer(),
     }
     def __init__(self, **kwargs):
         digest_config(self, kwargs)
-        self.camera = self.camera_class(**self.camera_config)
+        self.set_camera(self.camera_class(**self.camera_config))
         self.mobjects = []
         self.continual_animations = []
         self.foreground_mobjects = []
         self.num_plays = 0
-        self.saved_frames = []
+        self.skipped_animations = False
+        self.saved_frames = FrameStore() if self.save_frames else []
+        self.layer_cache = {}
+        self.last_state_signatures = {}
         self.shared_locals = {}
         self.frame_num = 0
         if self.name is None:
@@ -106,11 +133,27 @@ class Scene(object):
     ### Only these methods should touch the camera
 
     def set_camera(self, camera):
+        camera.render_timer = self.render_timer
         self.camera = camera
 
     def get_frame(self):
         return np.array(self.camera.get_pixel_array())
 
+    def take_frame(self):
+        """
+        Like get_frame, but rather than copying the camera's
+        pixel array, takes it over from the camera.
+        """
+        return self.camera.take_pixel_array()
+
+    def add_camera_frame(self):
+        #The movie writer copies frames itself, so only
+        #frames which are kept need to be taken here
+        if self.save_frames:
+            self.add_frames(self.take_frame())
+        else:
+            self.add_frames(self.camera.get_pixel_array())
+
     def get_image(self):
         return self.camera.get_image()
 
@@ -132,6 +175,12 @@ class Scene(object):
         background = None, 
         include_submobjects = True,
         **kwargs):
+        use_layers = self.cache_static_layers and \
+            mobjects is None and background is None and \
+            not kwargs.get("excluded_mobjects")
+        if use_layers:
+            self.update_frame_from_layers()
+            return
         if mobjects is None:
             mobjects = list_update(
                 self.mobjects,
@@ -145,6 +194,66 @@ class Scene(object):
         kwargs["include_submobjects"] = include_submobjects
         self.capture_mobjects_in_camera(mobjects, **kwargs)
 
+    def update_frame_from_layers(self, moving_mobjects = []):
+        """
+        Splits the scene's mobjects into runs of those which changed
+        since the last frame and those which did not.  Changed runs
+        are drawn as usual, while unchanged runs are drawn once into
+        a cached layer, then just composited in subsequent frames.
+        The bottom run, when unchanged, is cached together with the
+        background, so it costs only a copy.
+
+        As with update_frame(moving_mobjects, static_image), the
+        moving_mobjects, and their families, are left out of the
+        layers and drawn over all of them.
+        """
+        mobjects = [
+            m for m in list_update(self.mobjects, self.foreground_mobjects)
+            if m not in moving_mobjects
+        ]
+        capture_kwargs = {"excluded_mobjects" : moving_mobjects}
+        camera_signature = self.camera.get_state_signature()
+        signatures = [m.get_state_signature() for m in mobjects]
+        runs = []
+        for mobject, signature in zip(mobjects, signatures):
+            is_static = \
+                self.last_state_signatures.get(id(mobject)) == signature
+            if not runs or runs[-1][0] != is_static:
+                runs.append((is_static, [], []))
+            runs[-1][1].append(mobject)
+            runs[-1][2].append(signature)
+        self.last_state_signatures = dict(zip(map(id, mobjects), signatures))
+
+        layer_cache = {}
+        for index, (is_static, run, run_signatures) in enumerate(runs):
+            key = (
+                index == 0, camera_signature, tuple(run_signatures),
+                tuple(map(id, moving_mobjects)),
+            )
+            if index == 0 and not is_static:
+                self.reset_camera()
+            if not is_static:
+                self.capture_mobjects_in_camera(run, **capture_kwargs)
+                continue
+            if key in self.layer_cache:
+                layer = self.layer_cache[key]
+            elif index == 0:
+                self.reset_camera()
+                self.capture_mobjects_in_camera(run, **capture_kwargs)
+                layer = self.get_frame()
+            else:
+                layer = self.camera.get_rendered_layer(run, **capture_kwargs)
+            layer_cache[key] = layer
+            if index == 0:
+                self.set_camera_pixel_array(layer)
+            elif layer is not None:
+                self.camera.overlay_rendered_layer(layer)
+        if len(runs) == 0:
+            self.reset_camera()
+        #Only keep layers used in this frame
+        self.layer_cache = layer_cache
+        self.capture_mobjects_in_camera(moving_mobjects)
+
     def freeze_background(self):
         self.update_frame()
         self.set_camera(Camera(self.get_frame()))
@@ -154,8 +263,9 @@ class Scene(object):
     def continual_update(self, dt = None):
         if dt is None:
             dt = self.frame_duration
-        for continual_animation in self.continual_animations:
-            continual_animation.update(dt)
+        with self.render_timer.stage("continual update"):
+            for continual_animation in self.continual_animations:
+                continual_animation.update(dt)
 
     def wind_down(self, *continual_animations, **kwargs):
         wind_down_time = kwargs.get("wind_down_time", 1)
@@ -408,26 +518,117 @@ class Scene(object):
                 self.skip_animations = False
         if self.skip_animations:
             kwargs["run_time"] = 0
+            self.skipped_animations = True
 
         animations = self.compile_play_args_to_animation_list(*args)
         self.num_plays += 1
 
         sync_animation_run_times_and_rate_funcs(*animations, **kwargs)
         moving_mobjects = self.get_moving_mobjects(*animations)
-        self.update_frame(excluded_mobjects = moving_mobjects)
-        static_image = self.get_frame()
-        for t in self.get_animation_time_progression(animations):
-            for animation in animations:
-                animation.update(t / animation.run_time)
-            self.continual_update()
-            self.update_frame(moving_mobjects, static_image)
-            self.add_frames(self.get_frame())
+        time_progression = self.get_animation_time_progression(animations)
+        is_cached = self.begin_movie_segment("play", animations)
+        self.render_timer.begin_record(
+            "play",
+            animations = map(str, animations),
+            run_time = max([a.run_time for a in animations]),
+            cached = is_cached,
+        )
+        if is_cached:
+            #The frames are cached, only the mobjects need to change
+            for t in time_progression:
+                self.render_timer.begin_frame()
+                self.update_animations(t, animations)
+            self.update_frame()
+        elif self.should_render_in_parallel(animations):
+            self.update_frame(excluded_mobjects = moving_mobjects)
+            static_image = self.get_frame()
+            frames = self.get_frames_rendered_in_parallel(
+                time_progression.iterable,
+                animations, moving_mobjects, static_image
+            )
+            for t, frame in it.izip(time_progression, frames):
+                self.render_timer.begin_frame()
+                self.add_frames(frame)
+        else:
+            self.update_frame(excluded_mobjects = moving_mobjects)
+            static_image = self.get_frame()
+            for t in time_progression:
+                self.render_timer.begin_frame()
+                self.update_animation_frame(
+                    t, animations, moving_mobjects, static_image
+                )
+                self.add_camera_frame()
+        self.end_movie_segment()
+        self.render_timer.end_record()
         self.add(*moving_mobjects)
         self.mobjects_from_last_animation = moving_mobjects
         self.clean_up_animations(*animations)
         self.continual_update(0)
         return self
 
+    def update_animations(self, t, animations):
+        with self.render_timer.stage("animation update"):
+            for animation in animations:
+                animation.update(t / animation.run_time)
+        self.continual_update()
+
+    def update_animation_frame(self, t, animations, moving_mobjects, static_image):
+        self.update_animations(t, animations)
+        if self.cache_static_layers:
+            self.update_frame_from_layers(moving_mobjects)
+        else:
+            self.update_frame(moving_mobjects, static_image)
+
+    def should_render_in_parallel(self, animations):
+        #Continual animations advance by dt each frame, so their
+        #state depends on every frame before, not just on t.
+        #The same goes for animations not marked as otherwise.
+        return self.num_render_processes > 1 and \
+            len(self.continual_animations) == 0 and \
+            all([anim.can_render_in_parallel for anim in animations])
+
+    def get_frames_rendered_in_parallel(self, times, animations, moving_mobjects, static_image):
+        """
+        Splits the frame times of a play call across forked
+        worker processes, each of which owns its own copy of the
+        moving mobjects and the camera.  Worker k renders frames
+        k, k+n, k+2n, ..., so reading them round robin yields the
+        frames in order, with each worker at most one frame ahead.
+        """
+        times = list(times)
+        num_processes = min(self.num_render_processes, len(times))
+        connections = []
+        processes = []
+        for index in range(num_processes):
+            receiver, sender = mp.Pipe(duplex = False)
+            process = mp.Process(
+                target = self.render_frames_to_connection,
+                args = (
+                    sender, times[index::num_processes],
+                    animations, moving_mobjects, static_image
+                )
+            )
+            process.daemon = True
+            process.start()
+            sender.close()
+            connections.append(receiver)
+            processes.append(process)
+        for index in range(len(times)):
+            frame_bytes = connections[index%num_processes].recv_bytes()
+            frame = np.fromstring(frame_bytes, dtype = static_image.dtype)
+            yield frame.reshape(static_image.shape)
+        for connection, process in zip(connections, processes):
+            connection.close()
+            process.join()
+
+    def render_frames_to_connection(self, connection, times, animations, moving_mobjects, static_image):
+        for t in times:
+            self.update_animation_frame(
+                t, animations, moving_mobjects, static_image
+            )
+            connection.send_bytes(self.get_frame().tostring())
+        connection.close()
+
     def clean_up_animations(self, *animations):
         for animation in animations:
             animation.clean_up(self)
@@ -441,16 +642,28 @@ class Scene(object):
 
     def wait(self, duration = DEFAULT_WAIT_TIME):
         if self.skip_animations:
+            self.skipped_animations = True
             return self
 
+        is_cached = self.begin_movie_segment("wait", duration)
+        self.render_timer.begin_record(
+            "wait", run_time = duration, cached = is_cached,
+        )
         if self.should_continually_update():
             for t in self.get_time_progression(duration):
+                self.render_timer.begin_frame()
                 self.continual_update()
+                if is_cached:
+                    continue
                 self.update_frame()
-                self.add_frames(self.get_frame())
-        else:
+                self.add_camera_frame()
+        elif not is_cached:
             self.update_frame()
-            self.add_frames(*[self.get_frame()]*int(duration / self.frame_duration))
+            self.add_frames(*[self.take_frame()]*int(duration / self.frame_duration))
+        if is_cached:
+            self.update_frame()
+        self.end_movie_segment()
+        self.render_timer.end_record()
 
         return self
 
@@ -466,13 +679,20 @@ class Scene(object):
 
     def add_frames(self, *frames):
         if self.write_to_movie:
+            previous_frame = None
             for frame in frames:
                 if self.save_pngs:
                     self.save_image("frame" + str(self.frame_num), self.pngs_mode, True)
                     self.frame_num = self.frame_num + 1
-                self.writing_process.stdin.write(frame.tostring())
+                if frame is previous_frame and self.min_static_hold_duration is not None:
+                    #Same array passed again, as in wait, so no need to compare
+                    self.num_held_frames += 1
+                else:
+                    with self.render_timer.stage("movie write"):
+                        self.write_frame_to_movie(frame)
+                previous_frame = frame
         if self.save_frames:
-            self.saved_frames += list(frames)
+            self.saved_frames.extend(frames)
 
     #Display methods
 
@@ -520,7 +740,170 @@ class Scene(object):
         temp_file_path = file_path.replace(name, name + "Temp")
         print("Writing to %s"%temp_file_path)
         self.args_to_rename_file = (temp_file_path, file_path)
+        self.movie_part_directory = os.path.join(
+            self.output_directory, name + "Parts"
+        )
+        if os.path.exists(self.movie_part_directory):
+            shutil.rmtree(self.movie_part_directory)
+        os.makedirs(self.movie_part_directory)
+        self.movie_segment_directory = os.path.join(
+            self.output_directory, name + "Segments"
+        )
+        if not os.path.exists(self.movie_segment_directory):
+            os.makedirs(self.movie_segment_directory)
+        self.movie_segment_paths = []
+        self.movie_segment_path = None
+        self.num_movie_parts = 0
+        self.movie_part_paths = []
+        self.movie_writer = None
+        self.movie_writer_stats = []
+        self.last_movie_frame = None
+        self.num_held_frames = 0
+
+    def get_next_movie_part_path(self):
+        path = os.path.join(
+            self.movie_part_directory,
+            "part%05d%s"%(self.num_movie_parts, self.movie_file_extension)
+        )
+        self.num_movie_parts += 1
+        self.movie_part_paths.append(path)
+        return path
+
+    def begin_movie_segment(self, *objects):
+        """
+        Frames from here until end_movie_segment go to their own
+        file, named after a hash of objects, such as the animations
+        being played, together with the current state of the scene.
+        Returns True if that file exists already from an earlier run,
+        in which case no frames should be added.  Segments are never
+        reused when frames are also saved, as those need every frame.
+        """
+        if not self.write_to_movie or self.skip_animations:
+            return False
+        self.end_movie_segment()
+        if not self.cache_movie_segments:
+            return False
+        key = self.get_movie_segment_key(*objects)
+        path = os.path.join(
+            self.movie_segment_directory, key + self.movie_file_extension
+        )
+        if os.path.exists(path) and not (self.save_frames or self.save_pngs):
+            self.movie_segment_paths.append(path)
+            return True
+        self.movie_segment_path = path
+        return False
+
+    def end_movie_segment(self):
+        if not self.write_to_movie:
+            return
+        self.flush_held_frames()
+        self.close_movie_part()
+        self.last_movie_frame = None
+        part_paths = self.movie_part_paths
+        segment_path = self.movie_segment_path
+        self.movie_part_paths = []
+        self.movie_segment_path = None
+        if len(part_paths) == 0:
+            return
+        if segment_path is None:
+            #Frames added outside of any play or wait
+            segment_path = os.path.join(
+                self.movie_part_directory, "segment%05d%s"%(
+                    len(self.movie_segment_paths), self.movie_file_extension
+                )
+            )
+        #Written under another name first, so that an interrupted
+        #run never leaves a partial segment to be reused
+        temp_path = os.path.join(
+            self.movie_part_directory, "segment" + self.movie_file_extension
+        )
+        if len(part_paths) == 1:
+            shutil.move(part_paths[0], temp_path)
+        else:
+            self.concatenate_movie_files(part_paths, temp_path)
+            for part_path in part_paths:
+                os.remove(part_path)
+        shutil.move(temp_path, segment_path)
+        self.movie_segment_paths.append(segment_path)
+
+    def get_movie_segment_key(self, *objects):
+        camera_attrs = dict([
+            (key, value)
+            for key, value in self.camera.__dict__.items()
+            if key not in (
+                "pixel_array", "frame_buffers", "frame_buffer_index",
+                "render_timer",
+            )
+        ])
+        hasher = hashlib.sha1()
+        self.update_hash(hasher, [
+            objects, self.frame_duration, camera_attrs, self.mobjects,
+            self.foreground_mobjects, self.continual_animations,
+        ], {})
+        return hasher.hexdigest()
+
+    def update_hash(self, hasher, obj, memo):
+        """
+        Feeds everything obj is made of into hasher, so that equal
+        hashes across runs mean equal content.  Anything whose
+        content can't be pinned down adds something which changes
+        from run to run, so at worst a segment isn't reused.
+        """
+        if isinstance(obj, (weakref.ref, Scene)):
+            return
+        if isinstance(obj, (types.NoneType, bool, int, long, float, str, unicode)):
+            hasher.update(repr(obj))
+            return
+        if id(obj) in memo:
+            hasher.update("ref%d"%memo[id(obj)][0])
+            return
+        #Holding on to obj keeps its id from being reused
+        memo[id(obj)] = (len(memo), obj)
+        hasher.update(type(obj).__name__)
+        if isinstance(obj, np.ndarray):
+            hasher.update(str(obj.dtype) + str(obj.shape))
+            hasher.update(np.ascontiguousarray(obj).data)
+        elif isinstance(obj, (list, tuple)):
+            for item in obj:
+                self.update_hash(hasher, item, memo)
+        elif isinstance(obj, dict):
+            for key in sorted(obj.keys()):
+                if key in [
+                    "family_cache", "parent_refs", "bounding_box_cache",
+                    "points_packing", "member_of_packing", "packed_families",
+                    ]:
+                    continue
+                self.update_hash(hasher, key, memo)
+                self.update_hash(hasher, obj[key], memo)
+        elif isinstance(obj, types.FunctionType):
+            self.update_hash(hasher, [
+                obj.__module__, obj.__name__, obj.func_code,
+                obj.func_defaults,
+                [cell.cell_contents for cell in obj.func_closure or []],
+            ], memo)
+        elif isinstance(obj, types.CodeType):
+            hasher.update(obj.co_code)
+            self.update_hash(hasher, [obj.co_consts, obj.co_names], memo)
+        elif isinstance(obj, types.MethodType):
+            self.update_hash(hasher, [obj.im_func, obj.im_self], memo)
+        elif isinstance(obj, (type, types.ClassType)):
+            hasher.update(obj.__module__ + "." + obj.__name__)
+        elif hasattr(obj, "__dict__"):
+            self.update_hash(hasher, obj.__dict__, memo)
+        else:
+            hasher.update(repr(obj))
 
+    def get_ffmpeg_output_args(self, file_path):
+        return [
+            '-an', # Tells FFMPEG not to expect any audio
+            '-vcodec', 'mpeg',
+            '-c:v', 'libx264',
+            '-pix_fmt', 'yuv420p',
+            '-loglevel', 'error',
+            file_path,
+        ]
+
+    def open_movie_part(self):
         fps = int(1/self.frame_duration)
         height, width = self.camera.pixel_shape
         
@@ -533,25 +916,108 @@ class Scene(object):
             '-pix_fmt', 'rgba',
             '-r', str(fps), # frames per second
             '-i', '-', # The imput comes from a pipe
-            '-an', # Tells FFMPEG not to expect any audio
-            '-vcodec', 'mpeg',
-            '-c:v', 'libx264',
-            '-pix_fmt', 'yuv420p',
-            '-loglevel', 'error',
-            temp_file_path,
-        ]
+        ] + self.get_ffmpeg_output_args(self.get_next_movie_part_path())
         
         # self.writing_process = sp.Popen(command, stdin=sp.PIPE, shell=True)
         self.writing_process = sp.Popen(command, stdin=sp.PIPE)
+        self.movie_writer = MovieWriter(
+            self.writing_process, (height, width, 4)
+        )
+
+    def close_movie_part(self):
+        if self.movie_writer is not None:
+            self.movie_writer_stats.append(self.movie_writer.close())
+            self.movie_writer = None
+
+    def write_frame_to_movie(self, frame):
+        """
+        Frames identical to the last one are only counted, and
+        when the run ends, either written out after all or, if it
+        lasted long enough, encoded as a still in its own part.
+        """
+        if self.min_static_hold_duration is not None and \
+            self.last_movie_frame is not None and \
+            np.array_equal(frame, self.last_movie_frame):
+            self.num_held_frames += 1
+            return
+        self.flush_held_frames()
+        if self.movie_writer is None:
+            self.open_movie_part()
+        self.movie_writer.write_frame(frame)
+        #The writer leaves its copy untouched until the next write
+        self.last_movie_frame = self.movie_writer.last_buffer
+
+    def flush_held_frames(self):
+        num_frames = self.num_held_frames
+        if num_frames == 0:
+            return
+        self.num_held_frames = 0
+        if num_frames*self.frame_duration < self.min_static_hold_duration:
+            for x in range(num_frames):
+                self.movie_writer.write_frame(self.last_movie_frame)
+            self.last_movie_frame = self.movie_writer.last_buffer
+            return
+        self.last_movie_frame = np.array(self.last_movie_frame)
+        self.close_movie_part()
+        still_path = os.path.join(self.movie_part_directory, "still.png")
+        Image.fromarray(self.last_movie_frame, "RGBA").save(still_path)
+        command = [
+            FFMPEG_BIN,
+            '-y',
+            '-loop', '1',
+            '-framerate', str(int(1/self.frame_duration)),
+            '-i', still_path,
+            '-frames:v', str(num_frames),
+        ] + self.get_ffmpeg_output_args(self.get_next_movie_part_path())
+        sp.check_call(command)
+        os.remove(still_path)
 
     def close_movie_pipe(self):
-        self.writing_process.stdin.close()
-        self.writing_process.wait()
+        self.end_movie_segment()
+        if len(self.movie_writer_stats) > 0:
+            print("Movie writer: max queue depth %d of %d, stalled for %.2fs"%(
+                max([stats["max_queue_depth"] for stats in self.movie_writer_stats]),
+                MovieWriter.CONFIG["pool_size"],
+                sum([stats["stall_time"] for stats in self.movie_writer_stats]),
+            ))
+        #Segments of skipped animations, as with -n, are still
+        #wanted by later runs rendering the whole scene
+        if not self.skipped_animations:
+            self.remove_unused_movie_segments()
+        temp_file_path = self.args_to_rename_file[0]
+        if len(self.movie_segment_paths) == 0:
+            shutil.rmtree(self.movie_part_directory)
+            return
+        elif len(self.movie_segment_paths) == 1:
+            shutil.copy(self.movie_segment_paths[0], temp_file_path)
+        else:
+            self.concatenate_movie_files(self.movie_segment_paths, temp_file_path)
+        shutil.rmtree(self.movie_part_directory)
         if os.name == 'nt':
             shutil.move(*self.args_to_rename_file)
         else:
             os.rename(*self.args_to_rename_file)
 
-
-
-
+    def remove_unused_movie_segments(self):
+        #Only segments making up this whole scene's movie are kept
+        used_paths = set(map(os.path.abspath, self.movie_segment_paths))
+        for file_name in os.listdir(self.movie_segment_directory):
+            path = os.path.join(self.movie_segment_directory, file_name)
+            if os.path.abspath(path) not in used_paths:
+                os.remove(path)
+
+    def concatenate_movie_files(self, paths, file_path):
+        list_path = os.path.join(self.movie_part_directory, "files.txt")
+        with open(list_path, "w") as fp:
+            for path in paths:
+                fp.write("file '%s'\n"%os.path.abspath(path))
+        sp.check_call([
+            FFMPEG_BIN,
+            '-y',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', list_path,
+            '-c', 'copy',
+            '-loglevel', 'error',
+            file_path,
+        ])
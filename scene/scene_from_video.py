@@ -4,6 +4,7 @@ import itertools as it
 from tqdm import tqdm as show_progress
 
 from scene import Scene
+from frame_store import FrameStore
 
 
 class SceneFromVideo(Scene):
@@ -25,6 +26,7 @@ class SceneFromVideo(Scene):
             start_frame, end_frame = map(lambda t : fps*t, time_range)
 
         frame_count = end_frame - start_frame
+        self.frames = FrameStore()
         print("Reading in " + file_name + "...")
         for count in show_progress(range(start_frame, end_frame+1)):
             returned, frame = cap.read()
@@ -36,20 +38,16 @@ class SceneFromVideo(Scene):
         cap.release()
 
         if freeze_last_frame and len(self.frames) > 0:
-            self.original_background = self.background = self.frames[-1]
+            self.original_background = self.background = \
+                np.array(self.frames[-1])
 
     def apply_gaussian_blur(self, ksize = (5, 5), sigmaX = 5):
-        self.frames = [
-            cv2.GaussianBlur(frame, ksize, sigmaX)
-            for frame in self.frames
-        ]
+        for index, frame in enumerate(self.frames):
+            self.frames[index] = cv2.GaussianBlur(frame, ksize, sigmaX)
 
     def apply_edge_detection(self, threshold1 = 50, threshold2 = 100):
-        edged_frames = [
-            cv2.Canny(frame, threshold1, threshold2)
-            for frame in self.frames
-        ]
-        for index in range(len(self.frames)):
+        for frame in self.frames:
+            edged_frame = cv2.Canny(frame, threshold1, threshold2)
             for i in range(3):
-                self.frames[index][:,:,i] = edged_frames[index]
+                frame[:,:,i] = edged_frame
 
@@ -6,7 +6,7 @@ import time
 
 class TkSceneRoot(Tkinter.Tk):
     def __init__(self, scene):
-        if scene.saved_frames == []:
+        if len(scene.saved_frames) == 0:
             raise Exception(str(scene) + " has no frames!")
         Tkinter.Tk.__init__(self)
 
@@ -92,12 +92,21 @@ class ZoomedScene(Scene):
         self.zoomed_camera.adjusted_thickness = lambda x : x
 
     def get_frame(self):
-        frame = Scene.get_frame(self)
+        return self.add_zoomed_camera_image(Scene.get_frame(self))
+
+    def take_frame(self):
+        return self.add_zoomed_camera_image(Scene.take_frame(self))
+
+    def add_zoomed_camera_image(self, frame):
         if self.zoom_activated:
             (up, left), (down, right) = self.zoomed_canvas_pixel_indices
             frame[left:right, up:down, :] = self.zoomed_camera.get_image()
         return frame
 
+    def add_camera_frame(self):
+        #The zoomed image is only added to frames taken from the camera
+        self.add_frames(self.take_frame())
+
     def set_camera_pixel_array(self, pixel_array):
         self.camera.set_pixel_array(pixel_array)
         if self.zoom_activated:
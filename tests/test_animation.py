@@ -0,0 +1,117 @@
+import unittest
+import numpy as np
+
+from helpers import *
+from mobject.vectorized_mobject import VGroup
+from topics.geometry import Circle, Square, Line
+from animation.transform import Transform, FadeIn
+from animation.simple_animations import Homotopy
+
+def get_start():
+    return VGroup(
+        Circle(color = RED, fill_opacity = 0.5),
+        VGroup(Square().shift(LEFT), Line(LEFT, UP + 2*RIGHT)),
+        Square(side_length = 0.5).shift(2*DOWN),
+    )
+
+def get_target():
+    return VGroup(
+        Square(color = BLUE, fill_opacity = 1).shift(UP),
+        VGroup(Circle(color = GREEN).shift(RIGHT), Line(DOWN, 3*RIGHT)),
+        Circle(radius = 2, stroke_width = 10, fill_opacity = 0.2),
+    )
+
+def get_state(mobject):
+    return [
+        [np.array(mob.points)] + [
+            np.array(getattr(mob, attr))
+            for attr in mob.get_color_attrs()
+        ]
+        for mob in mobject.family_members_with_points()
+    ]
+
+class PackedTransformTest(unittest.TestCase):
+    def assert_same_state(self, mobject1, mobject2):
+        state1, state2 = map(get_state, [mobject1, mobject2])
+        self.assertEqual(len(state1), len(state2))
+        for values1, values2 in zip(state1, state2):
+            for value1, value2 in zip(values1, values2):
+                self.assertTrue(np.allclose(value1, value2))
+
+    def get_animations(self, make_animation):
+        packed, unpacked = make_animation(), make_animation()
+        unpacked.packed_families = None
+        self.assertTrue(packed.has_valid_packing())
+        return packed, unpacked
+
+    def assert_matches_unpacked(self, make_animation):
+        packed, unpacked = self.get_animations(make_animation)
+        for alpha in 0, 0.3, 0.7, 1:
+            packed.update(alpha)
+            unpacked.update(alpha)
+            self.assert_same_state(packed.mobject, unpacked.mobject)
+
+    def test_transforms_match_unpacked(self):
+        for submobject_mode in "all_at_once", "lagged_start", "one_at_a_time":
+            for path_arc in 0, np.pi/3:
+                self.assert_matches_unpacked(lambda : Transform(
+                    get_start(), get_target(),
+                    submobject_mode = submobject_mode,
+                    path_arc = path_arc,
+                ))
+
+    def test_fade_in_matches_unpacked(self):
+        self.assert_matches_unpacked(lambda : FadeIn(get_target()))
+
+    def test_packing_is_built_once(self):
+        animation = Transform(get_start(), get_target())
+        packed_families = animation.packed_families
+        packed_points = animation.mobject.get_packed_points()
+        for alpha in np.linspace(0, 1, 5):
+            animation.update(alpha)
+        self.assertIs(animation.packed_families, packed_families)
+        self.assertIs(animation.mobject.get_packed_points(), packed_points)
+
+    def test_changed_families_fall_back(self):
+        changes = [
+            lambda mob : mob.add(Square()),
+            lambda mob : mob.submobjects[1].submobjects.pop(),
+            lambda mob : setattr(
+                mob.submobjects[0], "points",
+                np.array(mob.submobjects[0].points)
+            ),
+            lambda mob : mob.submobjects[2].points.__setitem__(
+                slice(None), 0
+            ),
+        ]
+        for change in changes:
+            packed, unpacked = self.get_animations(
+                lambda : Transform(get_start(), get_target())
+            )
+            for animation in packed, unpacked:
+                animation.update(0.5)
+                change(animation.mobject)
+                animation.update(0.6)
+            self.assert_same_state(packed.mobject, unpacked.mobject)
+
+    def test_emptied_member_ends_packing(self):
+        animation = Transform(get_start(), get_target())
+        animation.mobject.submobjects[0].points = np.zeros((0, 3))
+        self.assertFalse(animation.has_valid_packing())
+        self.assertIsNone(animation.mobject.get_packed_points())
+
+class VectorizedHomotopyTest(unittest.TestCase):
+    def test_vectorized_homotopy_matches_per_point(self):
+        homotopy = lambda x, y, z, t : np.array([
+            x + t*np.sin(y), y*(1 + t), z + t*x*y
+        ])
+        per_point = Homotopy(homotopy, get_start())
+        vectorized = Homotopy(vectorized_point_function(homotopy), get_start())
+        for alpha in 0, 0.4, 1:
+            for animation in per_point, vectorized:
+                animation.update(alpha)
+            for values1, values2 in zip(get_state(per_point.mobject), get_state(vectorized.mobject)):
+                self.assertTrue(np.allclose(values1[0], values2[0]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from helpers import *
+from benchmark import compare_to_baseline, run_benchmark
+from scene import Scene
+from topics.geometry import Square
+from animation.transform import ApplyMethod
+
+class ShortBenchmark(Scene):
+    def construct(self):
+        square = Square()
+        self.play(ApplyMethod(square.shift, RIGHT, run_time = 0.2))
+
+class FailingBenchmark(Scene):
+    def construct(self):
+        raise Exception("Failed on purpose")
+
+def get_result(fps = 30.0, peak_rss_mb = 100.0):
+    return {"fps" : fps, "peak_rss_mb" : peak_rss_mb}
+
+class BenchmarkTest(unittest.TestCase):
+    def test_regressions_beyond_tolerance(self):
+        baseline = {"A" : {"low" : get_result()}}
+        def compare(result, **kwargs):
+            return compare_to_baseline(
+                {"A" : {"low" : result}}, baseline, 0.2, **kwargs
+            )
+        self.assertEqual(compare(get_result(fps = 25)), [])
+        self.assertEqual(compare(get_result(peak_rss_mb = 115)), [])
+        self.assertEqual(len(compare(get_result(fps = 20))), 1)
+        self.assertEqual(len(compare(get_result(peak_rss_mb = 130))), 1)
+        self.assertEqual(len(compare(get_result(fps = 20, peak_rss_mb = 130))), 2)
+        self.assertEqual(compare({"error" : "Traceback"}), [])
+
+    def test_missing_results_are_regressions(self):
+        results = {"A" : {"low" : get_result()}, "B" : {"production" : get_result()}}
+        baseline = {"A" : {"low" : get_result()}}
+        regressions = compare_to_baseline(results, baseline, 0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("not in the baseline", regressions[0])
+        self.assertEqual(
+            compare_to_baseline(results, baseline, 0.2, allow_missing = True),
+            []
+        )
+
+    def test_benchmark_scenes_run_in_their_own_process(self):
+        result = run_benchmark(ShortBenchmark, "low")
+        self.assertNotIn("error", result)
+        self.assertGreater(result["num_frames"], 0)
+        self.assertGreater(result["fps"], 0)
+        self.assertIn("animation update", result["stages"])
+        result = run_benchmark(FailingBenchmark, "low")
+        self.assertIn("Failed on purpose", result["error"])
+
+if __name__ == "__main__":
+    unittest.main()
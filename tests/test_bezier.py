@@ -0,0 +1,201 @@
+import unittest
+import numpy as np
+
+from helpers import *
+from mobject.vectorized_mobject import VMobject, VGroup, make_smooth_together
+from topics.geometry import Circle, Square
+
+#What these helpers were before being vectorized, to check against
+
+def old_bezier(points):
+    n = len(points) - 1
+    return lambda t : sum([
+        ((1-t)**(n-k))*(t**k)*choose(n, k)*point
+        for k, point in enumerate(points)
+    ])
+
+def old_partial_bezier_points(points, a, b):
+    a_to_1 = np.array([
+        old_bezier(points[i:])(a)
+        for i in range(len(points))
+    ])
+    return np.array([
+        old_bezier(a_to_1[:i+1])((b-a)/(1.-a))
+        for i in range(len(points))
+    ])
+
+def old_insert_n_anchor_points(vmobject, n):
+    curr = vmobject.get_num_anchor_points()
+    points = np.array([vmobject.points[0]])
+    num_curves = curr-1
+    index_allocation = (np.arange(curr+n-1) * num_curves)/(curr+n-1)
+    for index in range(num_curves):
+        curr_bezier_points = vmobject.points[3*index:3*index+4]
+        num_inter_curves = sum(index_allocation == index)
+        alphas = np.arange(0, num_inter_curves+1)/float(num_inter_curves)
+        for a, b in zip(alphas, alphas[1:]):
+            new_points = old_partial_bezier_points(
+                curr_bezier_points, a, b
+            )
+            points = np.append(points, new_points[1:], axis = 0)
+    return points
+
+def old_point_from_proportion(vmobject, alpha):
+    num_cubics = vmobject.get_num_anchor_points()-1
+    interpoint_alpha = num_cubics*(alpha % (1./num_cubics))
+    index = min(3*int(alpha*num_cubics), 3*num_cubics)
+    cubic = old_bezier(vmobject.points[index:index+4])
+    return cubic(interpoint_alpha)
+
+def old_get_smooth_handle_points(points):
+    points = np.array(points)
+    num_handles = len(points) - 1
+    dim = points.shape[1]
+    if num_handles < 1:
+        return np.zeros((0, dim)), np.zeros((0, dim))
+    l, u = 2, 1
+    diag = np.zeros((l+u+1, 2*num_handles))
+    diag[0,1::2] = -1
+    diag[0,2::2] = 1
+    diag[1,0::2] = 2
+    diag[1,1::2] = 1
+    diag[2,1:-2:2] = -2
+    diag[3,0:-3:2] = 1
+    diag[2,-2] = -1
+    diag[1,-1] = 2
+    b = np.zeros((2*num_handles, dim))
+    b[1::2] = 2*points[1:]
+    b[0] = points[0]
+    b[-1] = points[-1]
+    solve_func = lambda b : linalg.solve_banded((l, u), diag, b)
+    if is_closed(points):
+        matrix = diag_to_matrix((l, u), diag)
+        matrix[-1, [0, 1, -2, -1]] = [2, -1, 1, -2]
+        matrix[0,:] = np.zeros(matrix.shape[1])
+        matrix[0,[0, -1]] = [1, 1]
+        b[0] = 2*points[0]
+        b[-1] = np.zeros(dim)
+        solve_func = lambda b : linalg.solve(matrix, b)
+    handle_pairs = np.zeros((2*num_handles, dim))
+    for i in range(dim):
+        handle_pairs[:,i] = solve_func(b[:,i])
+    return handle_pairs[0::2], handle_pairs[1::2]
+
+def get_random_curves(num_curves, degree = 3, dim = 3):
+    np.random.seed(degree)
+    return np.random.uniform(-3, 3, (num_curves, degree+1, dim))
+
+class PartialBezierTest(unittest.TestCase):
+    def get_intervals(self):
+        return [(0, 1), (0, 0.3), (0.2, 0.7), (0.6, 1), (0.5, 0.5), (0.999, 1)]
+
+    def test_partial_points_match_old_code(self):
+        for degree in 1, 2, 3, 5:
+            for curve in get_random_curves(3, degree):
+                for a, b in self.get_intervals():
+                    self.assertTrue(np.allclose(
+                        partial_bezier_points(curve, a, b),
+                        old_partial_bezier_points(curve, a, b)
+                    ))
+
+    def test_partial_curves_match_old_code(self):
+        curves = get_random_curves(len(self.get_intervals()))
+        a, b = map(np.array, zip(*self.get_intervals()))
+        for curve, partial_curve, a_value, b_value in zip(curves, partial_bezier_curves(curves, a, b), a, b):
+            self.assertTrue(np.allclose(
+                partial_curve,
+                old_partial_bezier_points(curve, a_value, b_value)
+            ))
+
+    def test_inserted_anchors_match_old_code(self):
+        for n in 1, 3, 10, 25:
+            for vmobject in Circle(), Square(), VMobject().set_points(get_random_curves(1)[0]):
+                expected = old_insert_n_anchor_points(vmobject, n)
+                vmobject.insert_n_anchor_points(n)
+                self.assertTrue(np.allclose(vmobject.points, expected))
+
+class BernsteinBezierTest(unittest.TestCase):
+    def test_bezier_matches_old_code(self):
+        alphas = np.linspace(0, 1, 11)
+        for degree in 0, 1, 2, 3, 6:
+            curve = get_random_curves(1, degree)[0]
+            for points in curve, curve[:,0]:
+                values = bezier(points)(alphas)
+                for alpha, value in zip(alphas, values):
+                    expected = old_bezier(points)(alpha)
+                    self.assertTrue(np.allclose(bezier(points)(alpha), expected))
+                    self.assertTrue(np.allclose(value, expected))
+
+    def test_derivatives_match_differences(self):
+        curves = get_random_curves(4)
+        alphas, dt = np.linspace(0.1, 0.9, 5), 1e-6
+        derivatives = bezier_curves_at(curves, alphas, derivative = 1)
+        differences = (
+            bezier_curves_at(curves, alphas + dt) - \
+            bezier_curves_at(curves, alphas - dt)
+        )/(2*dt)
+        self.assertTrue(np.allclose(derivatives, differences, atol = 1e-4))
+
+    def test_points_from_proportions_match_old_code(self):
+        alphas = np.linspace(0, 1, 37)
+        for vmobject in Circle(), Square(), VMobject().set_points(get_random_curves(1)[0]):
+            points = vmobject.points_from_proportions(alphas)
+            for alpha, point in zip(alphas, points):
+                expected = old_point_from_proportion(vmobject, alpha)
+                self.assertTrue(np.allclose(point, expected))
+                self.assertTrue(np.allclose(vmobject.point_from_proportion(alpha), expected))
+
+class SmoothHandlesTest(unittest.TestCase):
+    def get_paths(self, dim = 3):
+        np.random.seed(dim)
+        paths = []
+        for num_anchors in range(1, 13):
+            points = np.random.uniform(-3, 3, (num_anchors, dim))
+            paths.append(points)
+            if num_anchors > 2:
+                paths.append(np.append(points, points[:1], axis = 0))
+        return paths
+
+    def assert_same_handles(self, handles, expected):
+        for h, expected_h in zip(handles, expected):
+            self.assertEqual(h.shape, expected_h.shape)
+            self.assertTrue(np.allclose(h, expected_h))
+
+    def test_handles_match_old_solver(self):
+        for points in self.get_paths(2) + self.get_paths(3):
+            self.assert_same_handles(
+                get_smooth_handle_points(points),
+                old_get_smooth_handle_points(points),
+            )
+
+    def test_paths_solved_together_match_old_solver(self):
+        paths = self.get_paths()
+        for points, handles in zip(paths, get_smooth_handle_points_of_paths(paths)):
+            self.assert_same_handles(handles, old_get_smooth_handle_points(points))
+
+    def test_smoothing_together_matches_old_solver(self):
+        vmobjects = [
+            Circle().apply_function(lambda p : p + p**2/3),
+            Square(),
+            VMobject().set_points(get_random_curves(1)[0]),
+            VMobject(),
+        ]
+        expected = []
+        for vmobject in vmobjects:
+            anchors = vmobject.get_anchors()
+            if vmobject.close_new_points and len(anchors) > 0 and not is_closed(anchors):
+                anchors = np.append(anchors, anchors[:1], axis = 0)
+            if len(anchors) > 1:
+                smoothed = VMobject()
+                smoothed.set_anchors_and_handles(
+                    anchors, *old_get_smooth_handle_points(anchors)
+                )
+                expected.append(smoothed.points)
+            else:
+                expected.append(vmobject.points)
+        VGroup(*vmobjects).make_smooth()
+        for vmobject, points in zip(vmobjects, expected):
+            self.assertTrue(np.allclose(vmobject.points, points))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,412 @@
+import unittest
+import numpy as np
+
+from helpers import *
+from camera import Camera
+from mobject.image_mobject import ImageMobject
+from mobject.vectorized_mobject import VMobject, VGroup
+from topics.geometry import Circle, Square, Line
+
+def capture(mobjects, **kwargs):
+    camera = Camera(pixel_shape = (90, 160), **kwargs)
+    camera.capture_mobjects(mobjects)
+    return camera.pixel_array.astype('int')
+
+class NumpyRasterizerTest(unittest.TestCase):
+    def assert_matches_aggdraw(self, mobjects):
+        aggdraw_pa = capture(mobjects)
+        numpy_pa = capture(mobjects, vectorized_mobject_rasterizer = "numpy")
+        differences = np.abs(aggdraw_pa - numpy_pa).max(2)
+        #The two antialias edges differently, and cap open
+        #strokes differently, but agree on everything else
+        drawn = max(np.sum(aggdraw_pa.max(2) > 0), 1)
+        self.assertLess(np.sum(differences > 64), 0.02*drawn + 2)
+
+    def test_shapes_match_aggdraw(self):
+        self.assert_matches_aggdraw([
+            Square(fill_opacity = 1).shift(2*LEFT),
+            Circle(color = RED, fill_opacity = 0.5),
+            Line(3*LEFT, 3*RIGHT + UP, stroke_width = 10),
+        ])
+
+    def test_shapes_partly_off_frame(self):
+        frame_corner = SPACE_WIDTH*RIGHT + SPACE_HEIGHT*UP
+        for x in -1, 0, 1:
+            for y in -1, 0, 1:
+                if x == y == 0:
+                    continue
+                shift = frame_corner*[x, y, 0]
+                self.assert_matches_aggdraw([
+                    Square(fill_opacity = 1).shift(shift),
+                    Circle(color = BLUE, fill_opacity = 0.5).shift(shift),
+                ])
+
+    def test_open_path_ending_at_its_start(self):
+        vmobject = VMobject(fill_opacity = 1, mark_paths_closed = False)
+        vmobject.set_points(Square().points)
+        self.assert_matches_aggdraw([vmobject])
+
+    def test_degenerate_subpaths(self):
+        vmobject = VMobject(fill_opacity = 1)
+        vmobject.set_points(Square().points)
+        vmobject.add_subpath(np.zeros((4, 3)))
+        vmobject.add_subpath(np.zeros((1, 3)))
+        zero = VMobject(fill_opacity = 1)
+        zero.set_points(np.zeros((7, 3)))
+        self.assert_matches_aggdraw([vmobject, zero, VGroup(VMobject())])
+        self.assertEqual(
+            capture([zero], vectorized_mobject_rasterizer = "numpy").max(), 0
+        )
+
+def get_background(shape = (40, 60)):
+    np.random.seed(1)
+    background = np.random.randint(0, 256, shape + (4,)).astype('uint8')
+    background[:,:,3] = 255
+    return background
+
+def get_point_cloud(num_points, opacities):
+    np.random.seed(num_points)
+    points = np.random.normal(size = (num_points, 3))*[1, 0.5, 1]
+    rgbas = np.random.random((num_points, 4))
+    rgbas[:,3] = np.random.choice(opacities, num_points)
+    return points, rgbas
+
+class PointCloudTest(unittest.TestCase):
+    def get_camera(self, **kwargs):
+        camera = Camera(pixel_shape = (40, 60), **kwargs)
+        camera.pixel_array = get_background()
+        return camera
+
+    def old_display_point_cloud(self, camera, points, rgbas, thickness):
+        #As point clouds were drawn before blending, with
+        #each pixel simply taking the last point over it
+        pixel_coords = camera.points_to_pixel_coords(points)
+        pixel_coords = camera.thickened_coordinates(pixel_coords, thickness)
+        rgbas = (255*rgbas).astype('uint8')
+        rgbas = np.array([rgbas]*(len(pixel_coords)/len(rgbas)))
+        rgbas = rgbas.reshape((len(pixel_coords), 4))
+        on_screen = camera.on_screen_pixels(pixel_coords)
+        pixel_coords, rgbas = pixel_coords[on_screen], rgbas[on_screen]
+        ph, pw = camera.pixel_shape
+        flat_pa = camera.pixel_array.reshape((ph*pw, 4))
+        flat_pa[pixel_coords[:,1]*pw + pixel_coords[:,0]] = rgbas
+
+    def blend_points_one_by_one(self, camera, points, rgbas, thickness):
+        pixel_array = camera.pixel_array/255.0
+        ph, pw = camera.pixel_shape
+        for coords, rgba in zip(camera.points_to_pixel_coords(points), rgbas):
+            for x, y in coords + camera.get_thickening_nudges(thickness):
+                if 0 <= x < pw and 0 <= y < ph:
+                    alpha = rgba[3]
+                    pixel = pixel_array[y, x]
+                    pixel[:3] = alpha*rgba[:3] + (1-alpha)*pixel[:3]
+                    pixel[3] = alpha + (1-alpha)*pixel[3]
+        return (255*pixel_array).astype('int')
+
+    def test_opaque_points_match_old_code(self):
+        #Where dots overlapped, the old code had whichever dot offset
+        #came last win, rather than the last point, so thicker dots
+        #are kept apart here.  Colors are now rounded, not truncated.
+        clouds = [(get_point_cloud(500, [1]), 1)]
+        grid = np.array([
+            [x, y, 0]
+            for x in np.arange(-SPACE_WIDTH, SPACE_WIDTH, 2)
+            for y in np.arange(-SPACE_HEIGHT, SPACE_HEIGHT, 2)
+        ])
+        for thickness in 3, 4:
+            clouds.append(((grid, get_point_cloud(len(grid), [1])[1]), thickness))
+        for (points, rgbas), thickness in clouds:
+            camera, old_camera = self.get_camera(), self.get_camera()
+            camera.display_point_cloud(points, rgbas, thickness)
+            self.old_display_point_cloud(old_camera, points, rgbas, thickness)
+            differences = camera.pixel_array.astype('int') - old_camera.pixel_array
+            self.assertLessEqual(np.abs(differences).max(), 1)
+
+    def test_translucent_points_blend_in_order(self):
+        points, rgbas = get_point_cloud(300, [0.2, 0.5, 0.9, 1])
+        for kwargs in [{}, {"point_cloud_batch_size" : 50}, {"point_cloud_shape" : "round"}]:
+            for thickness in 1, 4:
+                camera = self.get_camera(**kwargs)
+                expected = self.blend_points_one_by_one(
+                    camera, points, rgbas, thickness
+                )
+                camera.display_point_cloud(points, rgbas, thickness)
+                differences = np.abs(camera.pixel_array.astype('int') - expected)
+                self.assertLessEqual(differences.max(), 1)
+
+    def test_points_sorted_by_depth(self):
+        points, rgbas = get_point_cloud(300, [0.5, 1])
+        camera = self.get_camera(sort_point_cloud_by_depth = True)
+        order = np.argsort(points[:,2], kind = 'mergesort')
+        expected = self.blend_points_one_by_one(
+            camera, points[order], rgbas[order], 3
+        )
+        camera.display_point_cloud(points, rgbas, 3)
+        differences = np.abs(camera.pixel_array.astype('int') - expected)
+        self.assertLessEqual(differences.max(), 1)
+
+def old_display_image_mobject(camera, image_mobject):
+    #As images were drawn before, sampling the whole frame
+    #(with sample coordinates cast to int, which indexing needs)
+    corner_coords = camera.points_to_pixel_coords(image_mobject.points)
+    ul_coords, ur_coords, dl_coords = corner_coords
+    right_vect = ur_coords - ul_coords
+    down_vect = dl_coords - ul_coords
+    impa = image_mobject.pixel_array
+    oh, ow = camera.pixel_array.shape[:2]
+    ih, iw = impa.shape[:2]
+    image = np.zeros((oh, ow, 4), dtype = 'uint8')
+    if right_vect[1] == 0 and down_vect[0] == 0:
+        rv0, dv1 = right_vect[0], down_vect[1]
+        x_indices = np.arange(rv0, dtype = 'int')*iw/rv0
+        y_indices = np.arange(dv1, dtype = 'int')*ih/dv1
+        stretched_impa = impa[y_indices][:,x_indices]
+        x0, x1 = ul_coords[0], ur_coords[0]
+        y0, y1 = ul_coords[1], dl_coords[1]
+        if x0 >= ow or x1 < 0 or y0 >= oh or y1 < 0:
+            return
+        siy0, siy1 = max(-y0, 0), dv1 - max(y1-oh, 0)
+        six0, six1 = max(-x0, 0), rv0 - max(x1-ow, 0)
+        image[max(y0, 0):y1, max(x0, 0):x1] = stretched_impa[siy0:siy1, six0:six1]
+    else:
+        all_pixel_coords = np.zeros((oh*ow, 2), dtype = 'int')
+        a = np.arange(oh*ow, dtype = 'int')
+        all_pixel_coords[:,0] = a%ow
+        all_pixel_coords[:,1] = a/ow
+        recentered_coords = all_pixel_coords - ul_coords
+        ix_coords, iy_coords = [
+            dim*np.dot(recentered_coords, vect)/float(np.dot(vect, vect))
+            for vect, dim in (right_vect, iw), (down_vect, ih)
+        ]
+        to_change = reduce(op.and_, [
+            ix_coords >= 0, ix_coords < iw,
+            iy_coords >= 0, iy_coords < ih,
+        ])
+        inner_flat_coords = iw*iy_coords[to_change].astype('int') + \
+            ix_coords[to_change].astype('int')
+        image = image.reshape((ow*oh, 4))
+        image[to_change] = impa.reshape((iw*ih, 4))[inner_flat_coords]
+        image = image.reshape((oh, ow, 4))
+    bg, fg = camera.pixel_array/255.0, image/255.0
+    bga, fga = bg[:,:,3:], fg[:,:,3:]
+    alpha_sum = fga + (1-fga)*bga
+    bg[:,:,:3] = (fg[:,:,:3]*fga + bg[:,:,:3]*(1-fga)*bga)/alpha_sum
+    bg[:,:,3:] = 1 - (1 - bga)*(1 - fga)
+    camera.pixel_array = (255*bg).astype('uint8')
+
+def get_image_mobject(shape = (30, 40), **kwargs):
+    np.random.seed(shape[0])
+    pixel_array = np.random.randint(0, 256, shape + (4,)).astype('uint8')
+    pixel_array[:shape[0]/3,:,3] = 255
+    return ImageMobject(pixel_array, **kwargs)
+
+class ImageTestCase(unittest.TestCase):
+    def get_camera(self, **kwargs):
+        camera = Camera(pixel_shape = (90, 160), **kwargs)
+        camera.pixel_array = get_background((90, 160))
+        return camera
+
+    def assert_matches_old_code(self, image_mobject, **kwargs):
+        camera, old_camera = self.get_camera(**kwargs), self.get_camera()
+        camera.display_image_mobject(image_mobject)
+        old_display_image_mobject(old_camera, image_mobject)
+        differences = camera.pixel_array.astype('int') - old_camera.pixel_array
+        #Up to rounding
+        self.assertLessEqual(np.abs(differences).max(), 1)
+
+    def display(self, image_mobject, **kwargs):
+        camera = self.get_camera(**kwargs)
+        camera.display_image_mobject(image_mobject)
+        return camera.pixel_array
+
+class ImageMobjectTest(ImageTestCase):
+    def get_shifts(self):
+        frame_corner = SPACE_WIDTH*RIGHT + SPACE_HEIGHT*UP
+        return [
+            frame_corner*[x, y, 0]
+            for x in -1, 0, 1
+            for y in -1, 0, 1
+        ] + [3*frame_corner]
+
+    def test_aligned_images_match_old_code(self):
+        for shift in self.get_shifts():
+            for height in 2, 5:
+                self.assert_matches_old_code(
+                    get_image_mobject(height = height).shift(shift)
+                )
+
+    def test_pixels_outside_image_are_untouched(self):
+        camera = self.get_camera()
+        image_mobject = get_image_mobject().rotate(np.pi/5)
+        camera.display_image_mobject(image_mobject)
+        ul, ur, dl = camera.points_to_pixel_coords(image_mobject.points)
+        corners = np.array([ul, ur, dl, ur + dl - ul])
+        (x0, y0), (x1, y1) = corners.min(0), corners.max(0)
+        outside = np.ones(camera.pixel_shape, dtype = 'bool')
+        outside[max(y0-1, 0):y1+2, max(x0-1, 0):x1+2] = False
+        self.assertTrue(np.array_equal(
+            camera.pixel_array[outside], get_background((90, 160))[outside]
+        ))
+
+class ImageSamplingTest(ImageTestCase):
+    def get_tilted_image_mobjects(self):
+        return [
+            get_image_mobject().rotate(angle).shift(shift)
+            for angle in np.pi/5, -2, np.pi/2
+            for shift in ORIGIN, 4*LEFT + 2*UP
+        ] + [
+            get_image_mobject((20, 50)).rotate(np.pi/3).stretch(2, 1),
+            get_image_mobject().rotate(0.2).stretch(0.5, 0).shift(6*RIGHT),
+        ]
+
+    def test_tilted_images_match_old_code(self):
+        for image_mobject in self.get_tilted_image_mobjects():
+            self.assert_matches_old_code(image_mobject)
+
+    def test_tiles_do_not_change_result(self):
+        for image_sampling in "nearest", "bilinear":
+            for image_mobject in self.get_tilted_image_mobjects():
+                results = [
+                    self.display(
+                        image_mobject,
+                        image_sampling = image_sampling,
+                        image_sampling_tile_size = tile_size,
+                    )
+                    for tile_size in 1, 50, 2**16
+                ]
+                for result in results[1:]:
+                    self.assertTrue(np.array_equal(result, results[0]))
+
+    def test_bilinear_sampling_keeps_uniform_images_uniform(self):
+        color = [200, 30, 90, 255]
+        image_mobject = ImageMobject(
+            np.array([[color]*8]*6, dtype = 'uint8')
+        ).rotate(0.7)
+        pixel_array = self.display(image_mobject, image_sampling = "bilinear")
+        changed = np.any(pixel_array != get_background((90, 160)), axis = 2)
+        self.assertGreater(changed.sum(), 0)
+        differences = pixel_array[changed].astype('int') - color
+        self.assertLessEqual(np.abs(differences).max(), 1)
+
+    def test_bilinear_sampling_is_close_to_nearest(self):
+        #Neighboring pixels differ by at most 4
+        xs, ys = np.meshgrid(np.arange(40), np.arange(30))
+        pixel_array = np.zeros((30, 40, 4), dtype = 'uint8')
+        pixel_array[:,:,0] = 4*xs
+        pixel_array[:,:,1] = 4*ys
+        pixel_array[:,:,2] = 2*(xs + ys)
+        pixel_array[:,:,3] = 255
+        image_mobject = ImageMobject(pixel_array, height = 4).rotate(0.4)
+        nearest, bilinear = [
+            self.display(image_mobject, image_sampling = image_sampling)
+            for image_sampling in "nearest", "bilinear"
+        ]
+        background = get_background((90, 160))
+        both = reduce(op.and_, [
+            np.any(pixel_array != background, axis = 2)
+            for pixel_array in nearest, bilinear
+        ])
+        self.assertGreater(both.sum(), 100)
+        differences = nearest[both].astype('int') - bilinear[both]
+        self.assertLessEqual(np.abs(differences).max(), 8)
+
+def get_checkerboard(size = 64):
+    xs, ys = np.meshgrid(np.arange(size), np.arange(size))
+    pixel_array = np.zeros((size, size, 4), dtype = 'uint8')
+    pixel_array[:,:,:3] = 255*((xs + ys)%2).reshape((size, size, 1))
+    pixel_array[:,:,3] = 255
+    return pixel_array
+
+class MipmapTest(ImageTestCase):
+    def test_mipmap_levels(self):
+        image_mobject = get_image_mobject((48, 64))
+        pixel_array = image_mobject.pixel_array
+        for scale_factor in 2, 1, 0.9:
+            self.assertIs(image_mobject.get_mipmap(scale_factor), pixel_array)
+        for scale_factor, shape in (0.5, (24, 32)), (0.3, (24, 32)), (0.2, (12, 16)):
+            self.assertEqual(
+                image_mobject.get_mipmap(scale_factor).shape, shape + (4,)
+            )
+        smallest = image_mobject.get_mipmap(0.001)
+        self.assertEqual(smallest.shape, (1, 1, 4))
+        #Halvings are kept
+        self.assertIs(image_mobject.get_mipmap(0.2), image_mobject.get_mipmap(0.2))
+
+    def test_mipmaps_follow_pixel_array(self):
+        image_mobject = get_image_mobject((48, 64))
+        image_mobject.get_mipmap(0.25)
+        image_mobject.highlight(RED)
+        self.assertTrue(np.all(
+            image_mobject.get_mipmap(0.25)[:,:,:3] == color_to_int_rgb(RED)
+        ))
+        image_mobject.set_opacity(0.5)
+        self.assertTrue(np.all(image_mobject.get_mipmap(0.25)[:,:,3] == 127))
+        image_mobject.pixel_array = get_checkerboard(16)
+        self.assertEqual(image_mobject.get_mipmap(0.5).shape, (8, 8, 4))
+
+    def test_halving_weights_colors_by_alpha(self):
+        pixel_array = np.array([
+            [[255, 0, 0, 255], [0, 0, 255, 0], [0, 255, 0, 100]],
+            [[255, 0, 0, 255], [0, 0, 255, 0], [0, 255, 0, 100]],
+            [[0, 0, 255, 50], [0, 0, 255, 0], [0, 0, 0, 0]],
+        ], dtype = 'uint8')
+        halved = halve_rgba_array(pixel_array)
+        self.assertEqual(halved.shape, (2, 2, 4))
+        #Transparent pixels don't bleed into the color
+        self.assertEqual(list(halved[0, 0]), [255, 0, 0, 128])
+        #Odd edges are averaged with themselves
+        self.assertEqual(list(halved[0, 1]), [0, 255, 0, 100])
+        self.assertEqual(list(halved[1, 0]), [0, 0, 255, 25])
+        self.assertEqual(list(halved[1, 1]), [0, 0, 0, 0])
+
+    def test_downscaled_checkerboard_averages_to_gray(self):
+        image_mobject = ImageMobject(get_checkerboard(), height = 1)
+        for mob in image_mobject, image_mobject.copy().rotate(0.3):
+            pixel_array = self.display(mob, use_image_mipmaps = True)
+            changed = np.any(pixel_array != get_background((90, 160)), axis = 2)
+            self.assertGreater(changed.sum(), 50)
+            rgbs = pixel_array[changed][:,:3].astype('int')
+            self.assertLessEqual(np.abs(rgbs - 128).max(), 1)
+            #Without mipmaps, nearest sampling picks black or white
+            pixel_array = self.display(mob)
+            self.assertTrue(np.all(np.in1d(pixel_array[changed][:,:3], [0, 255])))
+
+    def test_default_matches_old_code(self):
+        for image_mobject in ImageMobject(get_checkerboard(), height = 1), get_image_mobject(height = 0.5):
+            self.assert_matches_old_code(image_mobject)
+            self.assert_matches_old_code(image_mobject.rotate(0.3))
+
+class FrameBufferTest(unittest.TestCase):
+    def test_taken_frames_are_left_alone(self):
+        camera = Camera(pixel_shape = (40, 60))
+        camera.capture_mobjects([Circle(fill_opacity = 1)])
+        frame = camera.take_pixel_array()
+        expected = np.array(frame)
+        for x in range(3):
+            camera.reset()
+            camera.capture_mobjects([Square(color = RED, fill_opacity = 1)])
+            self.assertTrue(np.array_equal(frame, expected))
+
+    def test_last_frame_stays_intact_while_drawing_next(self):
+        camera = Camera(pixel_shape = (40, 60))
+        camera.capture_mobjects([Circle(fill_opacity = 1)])
+        last_frame = camera.get_pixel_array()
+        expected = np.array(last_frame)
+        camera.reset()
+        self.assertFalse(np.may_share_memory(camera.pixel_array, last_frame))
+        camera.capture_mobjects([Square(color = RED, fill_opacity = 1)])
+        self.assertTrue(np.array_equal(last_frame, expected))
+
+    def test_reset_and_set_pixel_array_copy(self):
+        camera = Camera(pixel_shape = (40, 60))
+        for num_frames in range(3):
+            camera.capture_mobjects([Circle(fill_opacity = 1)])
+            camera.reset()
+            self.assertTrue(np.array_equal(camera.pixel_array, camera.background))
+        pixel_array = get_background()
+        camera.set_pixel_array(pixel_array)
+        pixel_array[:] = 0
+        self.assertTrue(np.array_equal(camera.pixel_array, get_background()))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import numpy as np
+import time
+
+from helpers import *
+from frame_store import FrameStore
+
+def get_frames(num_frames, shape = (4, 6, 4)):
+    return [
+        np.full(shape, index, dtype = 'uint8')
+        for index in range(num_frames)
+    ]
+
+class FrameStoreTest(unittest.TestCase):
+    def test_frames_read_back_as_written(self):
+        frames = get_frames(5)
+        store = FrameStore(frames)
+        self.assertEqual(len(store), 5)
+        for frame, stored in zip(frames, store):
+            self.assertTrue(np.array_equal(frame, stored))
+        self.assertTrue(np.array_equal(store[-1], frames[-1]))
+        self.assertEqual(len(store[1:4]), 3)
+
+    def test_repeated_frame_is_stored_once(self):
+        frame = get_frames(1)[0]
+        store = FrameStore([frame]*10)
+        self.assertEqual(len(store), 10)
+        self.assertEqual(store.num_stored, 1)
+
+    def test_changed_frame_appended_again_is_kept(self):
+        frame = get_frames(1)[0]
+        store = FrameStore()
+        store.append(frame)
+        frame[:] = 7
+        store.append(frame)
+        self.assertEqual(store[0].max(), 0)
+        self.assertEqual(store[1].min(), 7)
+
+    def test_setting_a_repeated_frame_changes_only_that_frame(self):
+        frame = get_frames(1)[0]
+        store = FrameStore([frame]*3)
+        store[1] = np.full(frame.shape, 5, dtype = 'uint8')
+        self.assertEqual([stored.max() for stored in store], [0, 5, 0])
+        store[0] = np.full(frame.shape, 2, dtype = 'uint8')
+        store[2] = np.full(frame.shape, 3, dtype = 'uint8')
+        self.assertEqual([stored.max() for stored in store], [2, 5, 3])
+        self.assertEqual(store.num_stored, 3)
+
+    def test_changing_read_frame_changes_store(self):
+        store = FrameStore(get_frames(2))
+        store[1][:] = 9
+        self.assertEqual(store[1].min(), 9)
+
+    def test_frames_of_another_shape_are_refused(self):
+        store = FrameStore(get_frames(1))
+        self.assertRaises(ValueError, store.append, np.zeros((2, 2, 4)))
+
+    def test_setting_every_frame_takes_linear_time(self):
+        def time_setting_frames(num_frames):
+            frame = get_frames(1, shape = (1, 1, 4))[0]
+            store = FrameStore([frame]*num_frames)
+            start_time = time.time()
+            for index in range(len(store)):
+                store[index] = frame
+            return time.time() - start_time
+        #Were each setting linear in the number of frames, eight
+        #times the frames would take about sixty four times as long
+        self.assertLess(
+            time_setting_frames(8000), 16*time_setting_frames(1000) + 0.1
+        )
+
+    def test_drag_pixels_leaves_frames_unchanged(self):
+        frames = get_frames(3)
+        frames[0][0, 0] = 4
+        originals = [np.array(frame) for frame in frames]
+        for given in frames, FrameStore(frames):
+            dragged = drag_pixels(given)
+            self.assertEqual(type(dragged), type(given))
+            for frame, original in zip(given, originals):
+                self.assertTrue(np.array_equal(frame, original))
+            self.assertEqual(dragged[2][0, 0, 0], 4)
+            self.assertEqual(dragged[2][1, 1, 0], 1)
+
+if __name__ == "__main__":
+    unittest.main()
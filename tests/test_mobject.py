@@ -0,0 +1,297 @@
+import unittest
+import numpy as np
+import copy
+import time
+
+from helpers import *
+from mobject import Mobject, Group
+from mobject.vectorized_mobject import VMobject, VGroup
+from topics.geometry import Circle, Square, Line
+from topics.functions import FunctionGraph
+
+def get_family():
+    return VGroup(
+        Circle(),
+        VGroup(Square().shift(LEFT), Line(LEFT, UP + 2*RIGHT)),
+        Square(side_length = 0.5).shift(2*DOWN),
+    )
+
+def get_family_points(mobject):
+    return [np.array(mob.points) for mob in mobject.family_members_with_points()]
+
+class PackedPointsTest(unittest.TestCase):
+    def assert_same_points(self, mobject1, mobject2):
+        points1, points2 = map(get_family_points, [mobject1, mobject2])
+        self.assertEqual(len(points1), len(points2))
+        for p1, p2 in zip(points1, points2):
+            self.assertTrue(np.allclose(p1, p2))
+
+    def assert_packed(self, mobject):
+        buff = mobject.get_packed_points()
+        self.assertIsNotNone(buff)
+        for mob in mobject.family_members_with_points():
+            self.assertIs(mob.points.base, buff)
+
+    def test_operations_match_unpacked_family(self):
+        unpacked, packed = get_family(), get_family().pack_points()
+        for mob in unpacked, packed:
+            mob.shift(UP + RIGHT)
+            mob.scale(1.5)
+            mob.rotate(TAU/7, axis = OUT + RIGHT)
+            mob.stretch(0.5, 0)
+            mob.apply_function(lambda p : p + np.sin(p))
+            mob.move_to(3*LEFT)
+            mob.submobjects[1].shift(DOWN)
+            mob.submobjects[1].scale(0.5)
+        self.assert_same_points(unpacked, packed)
+        self.assert_packed(packed)
+        self.assertTrue(np.allclose(unpacked.get_center(), packed.get_center()))
+
+    def test_changing_one_member_keeps_it_packed(self):
+        family = get_family().pack_points()
+        family.submobjects[0].shift(RIGHT)
+        family.submobjects[1].rotate(1)
+        family.submobjects[2].apply_function(lambda p : 2*p)
+        self.assert_packed(family)
+
+    def test_all_points_are_a_copy(self):
+        family = get_family().pack_points()
+        points = family.get_all_points()
+        before = get_family_points(family)
+        points += 10
+        self.assert_packed(family)
+        for p1, p2 in zip(before, get_family_points(family)):
+            self.assertTrue(np.array_equal(p1, p2))
+
+    def test_copy_of_packed_family_is_packed_separately(self):
+        family = get_family().pack_points()
+        family_copy = family.copy()
+        self.assert_packed(family_copy)
+        family_copy.shift(RIGHT)
+        self.assertFalse(np.allclose(family.get_center(), family_copy.get_center()))
+
+    def test_reassigned_points_end_packing(self):
+        family = get_family().pack_points()
+        family.submobjects[0].points = np.array(family.submobjects[0].points)
+        self.assertIsNone(family.get_packed_points())
+        family = get_family().pack_points()
+        family.add(Square())
+        self.assertIsNone(family.get_packed_points())
+
+class FamilyCacheTest(unittest.TestCase):
+    def assert_family_is_fresh(self, mobject):
+        expected = [mobject] + list(it.chain(*[
+            Mobject.submobject_family(submob)
+            for submob in mobject.submobjects
+        ]))
+        self.assertEqual(
+            mobject.submobject_family(),
+            remove_list_redundancies(expected)
+        )
+
+    def test_family_follows_every_change(self):
+        squares = [Square() for x in range(6)]
+        inner = VGroup(*squares[:2])
+        outer = VGroup(inner, squares[2])
+        changes = [
+            lambda : outer.add(squares[3]),
+            lambda : inner.submobjects.append(squares[4]),
+            lambda : inner.submobjects.insert(0, squares[5]),
+            lambda : inner.submobjects.reverse(),
+            lambda : inner.submobjects.remove(squares[0]),
+            lambda : inner.submobjects.pop(),
+            lambda : inner.submobjects.__setitem__(0, squares[0]),
+            lambda : outer.submobjects.__delitem__(-1),
+            lambda : inner.submobjects.__setslice__(0, 1, squares[4:]),
+            lambda : inner.submobjects.__delslice__(0, 1),
+            lambda : inner.remove(*squares),
+            lambda : outer.submobjects.extend([squares[1]]),
+        ]
+        for change in changes:
+            outer.submobject_family()
+            change()
+            self.assert_family_is_fresh(outer)
+            self.assert_family_is_fresh(inner)
+
+    def test_removed_submobjects_forget_their_parent(self):
+        squares = [Square() for x in range(5)]
+        group = VGroup(*squares)
+        group.submobjects.remove(squares[0])
+        group.submobjects.pop()
+        group.submobjects[0] = Square()
+        del group.submobjects[0:1]
+        group.submobjects[:] = []
+        for square in squares:
+            self.assertNotIn(id(group), square.get_parent_refs())
+        group.submobjects.append(squares[0])
+        self.assertIn(id(group), squares[0].get_parent_refs())
+
+    def test_removed_submobject_changes_leave_old_parent_cache(self):
+        square, circle = Square(), Circle()
+        inner = VGroup(square)
+        group = VGroup(inner)
+        group.submobject_family()
+        group.submobjects.remove(inner)
+        group.submobject_family()
+        inner.add(circle)
+        #Nothing to drop, the group no longer contains inner
+        self.assertIn("all", group.get_family_cache())
+        self.assertEqual(group.submobject_family(), [group])
+
+    def test_copied_submobject_list_leaves_owner_alone(self):
+        square = Square()
+        group = VGroup(square)
+        group.submobject_family()
+        for submobjects in copy.copy(group.submobjects), copy.deepcopy(group.submobjects):
+            submobjects.append(Circle())
+            #The owner's cached family is not dropped
+            self.assertIn("all", group.get_family_cache())
+            self.assertEqual(group.submobject_family(), [group, square])
+        group_copy = copy.copy(group)
+        group_copy.submobjects.append(Circle())
+        self.assertEqual(group.submobject_family(), [group, square])
+        self.assertEqual(len(group_copy.submobject_family()), 3)
+
+class CopyOnWriteTest(unittest.TestCase):
+    def get_changes(self):
+        return [
+            lambda mob : mob.shift(UP),
+            lambda mob : mob.scale(2),
+            lambda mob : mob.rotate(1, axis = OUT + UP),
+            lambda mob : mob.stretch(0.5, 1),
+            lambda mob : mob.apply_function(lambda p : p + p**2),
+            lambda mob : mob.submobjects[1].move_to(RIGHT),
+            lambda mob : mob.submobjects[0].reverse_points(),
+            lambda mob : mob.submobjects[2].start_at(UP),
+            lambda mob : mob.submobjects[0].scale_handle_to_anchor_distances(2),
+            lambda mob : mob.highlight(RED),
+            lambda mob : mob.set_fill(BLUE, opacity = 0.5),
+        ]
+
+    def test_copy_shares_arrays_read_only(self):
+        family = get_family().set_copy_on_write()
+        family_copy = family.copy()
+        for mob, mob_copy in zip(family.submobject_family(), family_copy.submobject_family()):
+            self.assertIs(mob.points, mob_copy.points)
+            self.assertFalse(mob.points.flags.writeable)
+        def write():
+            family_copy.submobjects[0].points[0] = 1
+        self.assertRaises(ValueError, write)
+
+    def test_changes_match_plain_copies(self):
+        for change in self.get_changes():
+            family = get_family().set_copy_on_write()
+            before = get_family_points(family)
+            plain_copy = get_family().copy()
+            family_copy = family.copy()
+            change(family_copy)
+            change(plain_copy)
+            for p1, p2 in zip(get_family_points(family_copy), get_family_points(plain_copy)):
+                self.assertTrue(np.allclose(p1, p2))
+            #Nor do changes to the original reach the copy
+            copy_points = get_family_points(family_copy)
+            for p1, p2 in zip(before, get_family_points(family)):
+                self.assertTrue(np.array_equal(p1, p2))
+            change(family)
+            for p1, p2 in zip(copy_points, get_family_points(family_copy)):
+                self.assertTrue(np.array_equal(p1, p2))
+
+class VectorizedFunctionTest(unittest.TestCase):
+    def assert_same_points(self, mobject1, mobject2):
+        for p1, p2 in zip(get_family_points(mobject1), get_family_points(mobject2)):
+            self.assertTrue(np.allclose(p1, p2))
+
+    def test_vectorized_functions_match_per_point(self):
+        function = lambda p : p + np.sin(p)*p[...,::-1]
+        per_point, vectorized = get_family(), get_family()
+        per_point.apply_function(function)
+        vectorized.apply_function(vectorized_point_function(function))
+        self.assert_same_points(per_point, vectorized)
+
+    def test_vectorized_complex_functions_match_per_point(self):
+        function = lambda z : z**2/4 + np.exp(z/3)
+        per_point, vectorized = get_family(), get_family()
+        per_point.apply_complex_function(function)
+        vectorized.apply_complex_function(vectorized_point_function(function))
+        self.assert_same_points(per_point, vectorized)
+
+    def test_unkept_promise_falls_back_to_per_point(self):
+        function = lambda p : p[0]*RIGHT
+        per_point, vectorized = get_family(), get_family()
+        per_point.apply_function(function)
+        vectorized.apply_function(vectorized_point_function(function))
+        self.assert_same_points(per_point, vectorized)
+
+    def test_vectorized_graphs_match_per_point(self):
+        function = lambda x : np.sin(x) + x**2/10
+        self.assert_same_points(
+            FunctionGraph(function),
+            FunctionGraph(vectorized_point_function(function))
+        )
+
+    def test_scaled_handles_match_old_code(self):
+        circle = Circle().apply_function(lambda p : p + p**2/3)
+        anchors, handles1, handles2 = circle.get_anchors_and_handles()
+        expected = Circle()
+        expected.set_anchors_and_handles(
+            anchors,
+            anchors[:-1] + 2*(handles1 - anchors[:-1]),
+            anchors[1:] + 2*(handles2 - anchors[1:]),
+        )
+        circle.scale_handle_to_anchor_distances(2)
+        self.assert_same_points(circle, expected)
+
+class BoundingBoxTest(unittest.TestCase):
+    def assert_box_is_fresh(self, mobject):
+        for mob in mobject.submobject_family():
+            boundary = mob.get_points_defining_boundary()
+            box = mob.get_own_bounding_box()
+            if len(boundary) == 0:
+                self.assertIsNone(box)
+            else:
+                self.assertTrue(np.array_equal(
+                    box, [boundary.min(0), boundary.max(0)]
+                ))
+
+    def test_box_follows_every_change(self):
+        family = get_family()
+        circle, group, square = family.submobjects
+        packed = get_family().pack_points()
+        changes = [
+            lambda : family.shift(RIGHT),
+            lambda : family.scale(2),
+            lambda : group.rotate(1),
+            lambda : circle.apply_function(lambda p : p + p**2),
+            lambda : square.start_at(10*UP),
+            lambda : setattr(square, "points", 2*square.points),
+            lambda : circle.reverse_points(),
+            lambda : family.pack_points(),
+            lambda : family.shift(LEFT),
+            lambda : circle.stretch(3, 1),
+            lambda : square.set_anchors_and_handles(
+                np.random.random((4, 3)), *[np.random.random((3, 3))]*2
+            ),
+            lambda : packed.apply_function(lambda p : p + np.sin(p)),
+            lambda : packed.submobjects[1].shift(UP),
+            lambda : packed.move_to(RIGHT),
+        ]
+        for change in changes:
+            for mob in family, packed:
+                mob.get_bounding_box()
+            change()
+            self.assert_box_is_fresh(family)
+            self.assert_box_is_fresh(packed)
+
+    def test_cached_box_does_not_go_over_points(self):
+        mob = Mobject()
+        mob.points = np.random.random((10**6, 3))
+        start_time = time.time()
+        mob.get_own_bounding_box()
+        computing_time = time.time() - start_time
+        start_time = time.time()
+        for x in range(100):
+            mob.get_own_bounding_box()
+        self.assertLess(time.time() - start_time, computing_time)
+
+if __name__ == "__main__":
+    unittest.main()
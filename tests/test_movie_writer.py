@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+import subprocess
+import sys
+import tempfile
+
+from helpers import *
+from scene.movie_writer import MovieWriter
+
+FRAME_SHAPE = (6, 8, 4)
+
+def get_writing_process(outfile, script = "import sys; sys.stdout.write(sys.stdin.read())"):
+    return subprocess.Popen(
+        [sys.executable, "-c", script],
+        stdin = subprocess.PIPE, stdout = outfile,
+    )
+
+class MovieWriterTest(unittest.TestCase):
+    def test_frames_are_written_in_order(self):
+        outfile = tempfile.TemporaryFile()
+        writer = MovieWriter(get_writing_process(outfile), FRAME_SHAPE, pool_size = 2)
+        frame = np.zeros(FRAME_SHAPE, dtype = 'uint8')
+        for index in range(50):
+            #The same array drawn over, as with a camera
+            frame[:] = index
+            writer.write_frame(frame)
+        stats = writer.close()
+        self.assertEqual(stats["num_frames"], 50)
+        self.assertLessEqual(stats["max_queue_depth"], 2)
+        outfile.seek(0)
+        written = np.fromstring(outfile.read(), dtype = 'uint8')
+        written = written.reshape((-1,) + FRAME_SHAPE)
+        self.assertEqual(len(written), 50)
+        for index, written_frame in enumerate(written):
+            self.assertTrue((written_frame == index).all())
+
+    def test_failed_process_raises(self):
+        outfile = tempfile.TemporaryFile()
+        process = get_writing_process(outfile, "pass")
+        process.wait()
+        writer = MovieWriter(process, (200, 200, 4))
+        def write_frames():
+            for index in range(20):
+                writer.write_frame(np.zeros((200, 200, 4), dtype = 'uint8'))
+            writer.close()
+        self.assertRaises(IOError, write_frames)
+
+if __name__ == "__main__":
+    unittest.main()
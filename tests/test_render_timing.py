@@ -0,0 +1,67 @@
+import unittest
+import json
+import os
+import tempfile
+import time
+
+from helpers import *
+from render_timing import RenderTimer
+from scene import Scene
+from topics.geometry import Square
+from animation.transform import ApplyMethod
+
+class PlayAndWaitScene(Scene):
+    CONFIG = {
+        "camera_config" : {"pixel_shape" : (18, 32)},
+        "frame_duration" : 0.2,
+    }
+    def construct(self):
+        square = Square()
+        self.play(ApplyMethod(square.shift, RIGHT, run_time = 0.6))
+        self.wait(0.4)
+
+class RenderTimerTest(unittest.TestCase):
+    def test_nested_stages_count_once(self):
+        timer = RenderTimer()
+        timer.begin_record("play")
+        timer.begin_frame()
+        with timer.stage("outer"):
+            time.sleep(0.01)
+            with timer.stage("inner"):
+                time.sleep(0.1)
+        timer.end_record()
+        record = timer.get_report()["records"][0]
+        stages = record["stages"]
+        self.assertGreaterEqual(stages["inner"], 0.1)
+        self.assertGreaterEqual(stages["outer"], 0.01)
+        self.assertLess(stages["outer"], stages["inner"])
+        self.assertEqual(record["frames"], [stages])
+        self.assertGreaterEqual(record["total_time"], 0.11)
+
+    def test_stages_outside_records_are_ignored(self):
+        timer = RenderTimer()
+        with timer.stage("loose"):
+            pass
+        self.assertEqual(timer.get_report()["stages"], {})
+
+    def test_scene_report(self):
+        timer = RenderTimer()
+        PlayAndWaitScene(render_timer = timer)
+        report_path = tempfile.mktemp(suffix = ".json")
+        timer.write_report(report_path)
+        with open(report_path) as fp:
+            report = json.load(fp)
+        os.remove(report_path)
+        records = report["records"]
+        self.assertEqual([r["name"] for r in records], ["play", "wait"])
+        self.assertEqual(records[0]["num_frames"], 3)
+        for name in "animation update", "rasterize VMobject":
+            self.assertIn(name, records[0]["stages"])
+        for name, duration in report["stages"].items():
+            self.assertAlmostEqual(
+                duration, sum([r["stages"].get(name, 0) for r in records])
+            )
+        self.assertLessEqual(sum(report["stages"].values()), report["total_time"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,254 @@
+import unittest
+import numpy as np
+import os
+import sys
+import shutil
+import tempfile
+
+from helpers import *
+import scene.scene
+from scene import Scene
+from topics.geometry import Circle, Square
+from mobject.vectorized_mobject import VGroup
+from animation.simple_animations import ShowCreation
+from animation import Animation
+from animation.transform import ApplyMethod
+
+class MovingOverStaticScene(Scene):
+    CONFIG = {
+        "camera_config" : {"pixel_shape" : (90, 160)},
+        "save_frames" : True,
+        "cache_movie_segments" : False,
+        "frame_duration" : 0.2,
+    }
+    def construct(self):
+        circles = VGroup(*[
+            Circle(radius = 0.5, fill_opacity = 0.5).shift(x*RIGHT)
+            for x in range(-4, 5, 2)
+        ])
+        square = Square(color = RED, fill_opacity = 1)
+        cover = Square(side_length = 3, color = BLUE, fill_opacity = 0.8)
+        self.add(square, circles, cover)
+        self.add_foreground_mobjects(Circle(radius = 0.2, color = GREEN))
+        self.wait(0.4)
+        #Moves under the mobjects added after it
+        self.play(ApplyMethod(square.shift, 2*RIGHT, run_time = 0.6))
+        #Not yet in the scene
+        self.play(ShowCreation(Circle(radius = 1.5), run_time = 0.6))
+
+class StaticLayerTest(unittest.TestCase):
+    def test_cached_layers_match_uncached_frames(self):
+        uncached = MovingOverStaticScene().saved_frames
+        cached = MovingOverStaticScene(cache_static_layers = True).saved_frames
+        self.assertEqual(len(uncached), len(cached))
+        for frame, cached_frame in zip(uncached, cached):
+            self.assertTrue(np.array_equal(frame, cached_frame))
+
+class ParallelRenderTest(unittest.TestCase):
+    def test_parallel_frames_match_serial(self):
+        serial = MovingOverStaticScene()
+        parallel = MovingOverStaticScene(num_render_processes = 3)
+        self.assertEqual(len(serial.saved_frames), len(parallel.saved_frames))
+        for frame, parallel_frame in zip(serial.saved_frames, parallel.saved_frames):
+            self.assertTrue(np.array_equal(frame, parallel_frame))
+        #Mobjects are left as the last frame shows them
+        self.assertEqual(len(serial.mobjects), len(parallel.mobjects))
+        for mob, parallel_mob in zip(serial.mobjects, parallel.mobjects):
+            self.assertTrue(np.allclose(
+                mob.get_all_points(), parallel_mob.get_all_points()
+            ))
+
+    def test_only_marked_animations_render_in_parallel(self):
+        scene = Scene(num_render_processes = 2)
+        square = Square()
+        self.assertTrue(scene.should_render_in_parallel([
+            ApplyMethod(square.shift, RIGHT), ShowCreation(square)
+        ]))
+        self.assertFalse(scene.should_render_in_parallel([
+            ApplyMethod(square.shift, RIGHT), Animation(square)
+        ]))
+
+class FrameBufferTest(unittest.TestCase):
+    def test_saved_frames_do_not_share_buffers(self):
+        frames = MovingOverStaticScene().saved_frames
+        for num_frame_buffers in 1, 3:
+            other_frames = MovingOverStaticScene(
+                camera_config = {
+                    "pixel_shape" : (90, 160),
+                    "num_frame_buffers" : num_frame_buffers,
+                }
+            ).saved_frames
+            self.assertEqual(len(frames), len(other_frames))
+            for frame, other_frame in zip(frames, other_frames):
+                self.assertTrue(np.array_equal(frame, other_frame))
+        #The square moves, so no two frames of the play match
+        play_frames = list(frames)[2:5]
+        for i, frame in enumerate(play_frames):
+            for other_frame in play_frames[i+1:]:
+                self.assertFalse(np.array_equal(frame, other_frame))
+
+    def test_segment_keys_ignore_frame_buffers(self):
+        scene = Scene(camera_config = {"pixel_shape" : (18, 32)})
+        square = Square()
+        scene.add(square)
+        key = scene.get_movie_segment_key()
+        scene.camera.capture_mobjects([Circle(fill_opacity = 1)])
+        scene.camera.reset()
+        for buff in scene.camera.frame_buffers:
+            buff[:] = 100
+        self.assertEqual(scene.get_movie_segment_key(), key)
+        square.shift(RIGHT)
+        self.assertNotEqual(scene.get_movie_segment_key(), key)
+
+STUB_FFMPEG = """#!%s
+#Stands in for ffmpeg: logs its arguments, and writes raw frames,
+#a note of a still, or the concatenated inputs to its output file
+import sys
+args = sys.argv[1:]
+with open(%r, "a") as log:
+    log.write(" ".join(args) + "\\n")
+with open(args[-1], "wb") as output:
+    if "concat" in args:
+        for line in open(args[args.index("-i") + 1]):
+            output.write(open(line.strip()[6:-1], "rb").read())
+    elif "-loop" in args:
+        output.write("still %%s\\n"%%args[args.index("-frames:v") + 1])
+    else:
+        output.write(sys.stdin.read())
+"""
+
+class StubFFmpegTestCase(unittest.TestCase):
+    """
+    Runs scenes writing movies into a temporary directory, with
+    a stub in place of ffmpeg recording each call.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.directory, "ffmpeg_calls.txt")
+        stub_path = os.path.join(self.directory, "ffmpeg")
+        with open(stub_path, "w") as fp:
+            fp.write(STUB_FFMPEG%(sys.executable, self.log_path))
+        os.chmod(stub_path, 0755)
+        self.original_ffmpeg_bin = scene.scene.FFMPEG_BIN
+        scene.scene.FFMPEG_BIN = stub_path
+
+    def tearDown(self):
+        scene.scene.FFMPEG_BIN = self.original_ffmpeg_bin
+        shutil.rmtree(self.directory)
+
+    def render(self, scene_class, **kwargs):
+        """
+        Returns the contents of the movie written, and the
+        arguments of every ffmpeg call made along the way.
+        """
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        kwargs["write_to_movie"] = True
+        kwargs["output_directory"] = self.directory
+        scene_class(**kwargs)
+        movie_path = os.path.join(self.directory, scene_class.__name__ + ".mp4")
+        calls = []
+        if os.path.exists(self.log_path):
+            calls = [line.split() for line in open(self.log_path)]
+        return open(movie_path, "rb").read(), calls
+
+    def get_encoding_calls(self, calls):
+        return filter(lambda call : "rawvideo" in call, calls)
+
+    def get_segment_files(self, scene_class):
+        return sorted(os.listdir(os.path.join(
+            self.directory, scene_class.__name__ + "Segments"
+        )))
+
+class ThreePlayScene(Scene):
+    CONFIG = {
+        "camera_config" : {"pixel_shape" : (18, 32)},
+        "frame_duration" : 0.2,
+        "min_static_hold_duration" : None,
+    }
+    def construct(self):
+        square = Square()
+        self.play(ApplyMethod(square.shift, RIGHT, run_time = 0.6))
+        self.play(ApplyMethod(square.shift, UP, run_time = 0.6))
+        self.play(ShowCreation(Circle(), run_time = 0.6))
+
+class MovieSegmentTest(StubFFmpegTestCase):
+    def test_rerun_reuses_every_segment(self):
+        movie, calls = self.render(ThreePlayScene)
+        self.assertEqual(len(self.get_encoding_calls(calls)), 3)
+        rerun_movie, calls = self.render(ThreePlayScene)
+        self.assertEqual(self.get_encoding_calls(calls), [])
+        self.assertEqual(movie, rerun_movie)
+
+    def test_changed_play_is_rendered_again(self):
+        self.render(ThreePlayScene)
+        movie, calls = self.render(ThreePlayScene, frame_duration = 0.1)
+        self.assertEqual(len(self.get_encoding_calls(calls)), 3)
+        #Segments of the earlier frame rate are no longer used
+        self.assertEqual(len(self.get_segment_files(ThreePlayScene)), 3)
+
+    def test_skipping_keeps_segments_of_skipped_plays(self):
+        movie = self.render(ThreePlayScene)[0]
+        segment_files = self.get_segment_files(ThreePlayScene)
+        self.render(
+            ThreePlayScene, skip_animations = True,
+            skip_to_animation_number = 3,
+        )
+        self.assertEqual(self.get_segment_files(ThreePlayScene), segment_files)
+        rerun_movie, calls = self.render(ThreePlayScene)
+        self.assertEqual(self.get_encoding_calls(calls), [])
+        self.assertEqual(movie, rerun_movie)
+
+    def test_saving_frames_renders_every_frame(self):
+        self.render(ThreePlayScene)
+        calls = self.render(ThreePlayScene, save_frames = True)[1]
+        self.assertEqual(len(self.get_encoding_calls(calls)), 3)
+
+class HoldingScene(Scene):
+    CONFIG = {
+        "camera_config" : {"pixel_shape" : (18, 32)},
+        "frame_duration" : 0.2,
+        "cache_movie_segments" : False,
+    }
+    def construct(self):
+        square = Square()
+        self.play(ApplyMethod(square.shift, RIGHT, run_time = 0.6))
+        self.wait(2)
+        self.play(ApplyMethod(square.shift, UP, run_time = 0.6))
+        #Too short to be worth a still
+        self.wait(0.4)
+
+class StillHoldTest(StubFFmpegTestCase):
+    def get_frames(self, movie, frame_size = 18*32*4):
+        """
+        Reads the frames back from what the stub wrote, with
+        each still standing for that many copies of the frame
+        before it.
+        """
+        frames = []
+        index = 0
+        while index < len(movie):
+            if movie.startswith("still ", index):
+                end = movie.index("\n", index)
+                frames += [frames[-1]]*int(movie[index+6:end])
+                index = end + 1
+            else:
+                frames.append(movie[index:index+frame_size])
+                index += frame_size
+        return frames
+
+    def test_holds_are_encoded_as_stills(self):
+        movie, calls = self.render(HoldingScene)
+        still_calls = filter(lambda call : "-loop" in call, calls)
+        self.assertEqual(len(still_calls), 1)
+        self.assertEqual(still_calls[0][still_calls[0].index("-frames:v") + 1], "9")
+        unheld_movie, calls = self.render(
+            HoldingScene, min_static_hold_duration = None
+        )
+        self.assertEqual(filter(lambda call : "-loop" in call, calls), [])
+        self.assertLess(len(movie), len(unheld_movie))
+        self.assertEqual(self.get_frames(movie), self.get_frames(unheld_movie))
+        self.assertEqual(len(self.get_frames(movie)), 18)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import numpy as np
+import os
+import shutil
+import tempfile
+
+from helpers import *
+import mobject.svg_mobject
+from mobject.svg_mobject import SVGMobject, SVG_GEOMETRY_CACHE
+
+SVG_CONTENTS = """<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+  <path d="M 10 10 L 90 10 L 50 80 Z M 40 20 L 60 20 L 50 40 Z"/>
+  <g transform="translate(5, 5)">
+    <polygon points="0,0 10,0 10,10"/>
+    <circle cx="50" cy="50" r="20"/>
+  </g>
+  <rect x="10" y="60" width="30" height="20"/>
+</svg>
+"""
+
+def get_state(mobject):
+    return [
+        (len(mob.submobjects), np.array(mob.points))
+        for mob in mobject.submobject_family()
+    ]
+
+class SVGCacheTestCase(unittest.TestCase):
+    """
+    Keeps the svg files, and the geometry saved
+    from them, in a temporary directory.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.original_geometry_dir = mobject.svg_mobject.SVG_GEOMETRY_DIR
+        mobject.svg_mobject.SVG_GEOMETRY_DIR = self.directory
+        self.original_cache = SVG_GEOMETRY_CACHE.copy()
+        SVG_GEOMETRY_CACHE.clear()
+        self.svg_file = os.path.join(self.directory, "shapes.svg")
+        self.write_svg(SVG_CONTENTS)
+        self.num_parses = 0
+        self.original_parse = SVGMobject.get_mobjects_from_file
+        def counting_parse(svg_mobject):
+            self.num_parses += 1
+            return self.original_parse(svg_mobject)
+        SVGMobject.get_mobjects_from_file = counting_parse
+
+    def tearDown(self):
+        SVGMobject.get_mobjects_from_file = self.original_parse
+        SVG_GEOMETRY_CACHE.clear()
+        SVG_GEOMETRY_CACHE.update(self.original_cache)
+        mobject.svg_mobject.SVG_GEOMETRY_DIR = self.original_geometry_dir
+        shutil.rmtree(self.directory)
+
+    def write_svg(self, contents, mtime = None):
+        with open(self.svg_file, "w") as fp:
+            fp.write(contents)
+        if mtime is not None:
+            os.utime(self.svg_file, (mtime, mtime))
+
+    def assert_same_state(self, mobject1, mobject2):
+        state1, state2 = map(get_state, [mobject1, mobject2])
+        self.assertEqual(len(state1), len(state2))
+        for (num1, points1), (num2, points2) in zip(state1, state2):
+            self.assertEqual(num1, num2)
+            self.assertTrue(np.allclose(points1, points2))
+
+class SVGGeometryCacheTest(SVGCacheTestCase):
+    def test_cached_geometry_matches_parsed(self):
+        parsed = SVGMobject(file_name = self.svg_file, use_geometry_cache = False)
+        self.assertEqual(self.num_parses, 1)
+        for x in range(2):
+            cached = SVGMobject(file_name = self.svg_file)
+            self.assert_same_state(parsed, cached)
+        self.assertEqual(self.num_parses, 2)
+
+    def test_saved_geometry_is_used_by_other_runs(self):
+        first = SVGMobject(file_name = self.svg_file)
+        #As though in a new run, with nothing in memory
+        SVG_GEOMETRY_CACHE.clear()
+        second = SVGMobject(file_name = self.svg_file)
+        self.assertEqual(self.num_parses, 1)
+        self.assert_same_state(first, second)
+
+    def test_changed_file_is_parsed_again(self):
+        first = SVGMobject(file_name = self.svg_file)
+        mtime = os.path.getmtime(self.svg_file)
+        self.write_svg(SVG_CONTENTS.replace("r=\"20\"", "r=\"30\""), mtime + 10)
+        second = SVGMobject(file_name = self.svg_file)
+        self.assertEqual(self.num_parses, 2)
+        self.assert_same_state(second, SVGMobject(
+            file_name = self.svg_file, use_geometry_cache = False
+        ))
+
+    def test_changing_a_loaded_mobject_leaves_cache_alone(self):
+        first = SVGMobject(file_name = self.svg_file)
+        expected = first.copy()
+        first.submobjects[0].points[:] = 0
+        first.submobjects[1].shift(RIGHT)
+        self.assert_same_state(SVGMobject(file_name = self.svg_file), expected)
+
+if __name__ == "__main__":
+    unittest.main()
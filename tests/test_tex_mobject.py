@@ -0,0 +1,110 @@
+import unittest
+import numpy as np
+import os
+import shutil
+import tempfile
+
+from helpers import *
+import mobject.svg_mobject
+import mobject.tex_mobject
+from mobject.tex_mobject import TexMobject, TextMobject, tex_hash, \
+    tex_to_svg_files, precompile_tex_mobjects
+
+SVG_CONTENTS = """<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10">
+  <path d="M 1 1 L 9 1 L 5 8 Z"/>
+  <path d="M 1 9 L 9 9 L 9 10 Z"/>
+</svg>
+"""
+
+class TexCacheTestCase(unittest.TestCase):
+    """
+    Points the tex cache at a temporary directory, and makes
+    running latex an error, since tests only hit the cache.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.originals = [
+            (module, name, getattr(module, name))
+            for module, name in [
+                (mobject.tex_mobject, "TEX_IMAGE_DIR"),
+                (mobject.tex_mobject, "TEX_DIR"),
+                (mobject.tex_mobject, "tex_to_dvi"),
+                (mobject.svg_mobject, "SVG_GEOMETRY_DIR"),
+            ]
+        ]
+        mobject.tex_mobject.TEX_IMAGE_DIR = self.directory
+        mobject.tex_mobject.TEX_DIR = self.directory
+        mobject.svg_mobject.SVG_GEOMETRY_DIR = self.directory
+        def tex_to_dvi(tex_file):
+            raise Exception("Ran latex on %s"%tex_file)
+        mobject.tex_mobject.tex_to_dvi = tex_to_dvi
+
+    def tearDown(self):
+        for module, name, value in self.originals:
+            setattr(module, name, value)
+        shutil.rmtree(self.directory)
+
+    def write_file(self, name, contents, mtime = None):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as fp:
+            fp.write(contents)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def add_to_cache(self, expression, template_tex_file = TEMPLATE_TEX_FILE):
+        return self.write_file(
+            tex_hash(expression, template_tex_file) + ".svg",
+            SVG_CONTENTS
+        )
+
+class TexHashTest(TexCacheTestCase):
+    def test_hash_follows_template_contents(self):
+        template = self.write_file("template.tex", "A YourTextHere", 1000)
+        same_template = self.write_file("same.tex", "A YourTextHere", 1000)
+        self.assertEqual(tex_hash("x", template), tex_hash("x", template))
+        self.assertEqual(tex_hash("x", template), tex_hash("x", same_template))
+        self.assertNotEqual(tex_hash("x", template), tex_hash("y", template))
+        old_hash = tex_hash("x", template)
+        self.write_file("template.tex", "B YourTextHere", 2000)
+        self.assertNotEqual(tex_hash("x", template), old_hash)
+
+    def test_templates_of_tex_and_text_differ(self):
+        self.assertNotEqual(
+            tex_hash("x", TEMPLATE_TEX_FILE),
+            tex_hash("x", TEMPLATE_TEXT_FILE),
+        )
+
+class TexCacheTest(TexCacheTestCase):
+    def test_cached_svg_is_used_without_latex(self):
+        path = self.add_to_cache("x^2")
+        tex_mob = TexMobject("x^2")
+        self.assertEqual(tex_mob.file_path, path)
+        self.assertEqual(len(tex_mob.submobjects), 2)
+        self.assertRaises(Exception, TexMobject, "y^2")
+
+    def test_svg_files_follow_expressions(self):
+        paths = [self.add_to_cache(e) for e in "a", "b"]
+        self.assertEqual(
+            tex_to_svg_files(["b", "a", "b"], TEMPLATE_TEX_FILE),
+            [paths[1], paths[0]]
+        )
+
+    def test_precompiling_gathers_every_expression(self):
+        batches = []
+        original_tex_to_svg_files = mobject.tex_mobject.tex_to_svg_files
+        mobject.tex_mobject.tex_to_svg_files = \
+            lambda expressions, template : batches.append((template, expressions))
+        try:
+            precompile_tex_mobjects([("a", "b"), "c", "\\sqrt"])
+            precompile_tex_mobjects(["d"], TexClass = TextMobject)
+        finally:
+            mobject.tex_mobject.tex_to_svg_files = original_tex_to_svg_files
+        self.assertEqual(batches, [
+            (TEMPLATE_TEX_FILE, ["a b", "a", "b", "c", "\\sqrt{\\quad}"]),
+            (TEMPLATE_TEXT_FILE, ["\\centering d"]),
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 from helpers import *
 
 from mobject.vectorized_mobject import VMobject
-from mobject.tex_mobject import TexMobject
+from mobject.tex_mobject import TexMobject, precompile_tex_mobjects
 
 from scene import Scene
 
@@ -103,6 +103,10 @@ class PascalsTriangle(VMobject):
             for n in range(self.nrows) 
             for k in range(n+1)
         ]
+        precompile_tex_mobjects([
+            str(choose(n, k))
+            for n, k in self.coords
+        ])
         for n, k in self.coords:
             num = choose(n, k)              
             center = self.coords_to_center(n, k)
@@ -24,10 +24,9 @@ def fractalification_iteration(vmobject, dimension = 1.05, num_inserted_anchors_
     num_points = vmobject.get_num_points()
     if num_points > 0:
         # original_anchors = vmobject.get_anchors()
-        original_anchors = [
-            vmobject.point_from_proportion(x)
-            for x in np.linspace(0, 1-1./num_points, num_points)
-        ]
+        original_anchors = vmobject.points_from_proportions(
+            np.linspace(0, 1-1./num_points, num_points)
+        )
         new_anchors = []
         for p1, p2, in zip(original_anchors, original_anchors[1:]):
             num_inserts = random.choice(num_inserted_anchors_range)
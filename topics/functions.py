@@ -16,13 +16,20 @@ class ParametricFunction(VMobject):
 
     def generate_points(self):
         n_points = 3*self.num_anchor_points - 2
-        self.points = np.zeros((n_points, self.dim))
-        self.points[:,0] = np.linspace(
+        points = np.zeros((n_points, self.dim))
+        points[:,0] = np.linspace(
             self.t_min, self.t_max, n_points
         )
+        self.points = points
         #VMobject.apply_function takes care of preserving
         #desirable tangent line properties at anchor points
-        self.apply_function(lambda p : self.function(p[0]))
+        if getattr(self.function, "accepts_point_arrays", False):
+            #function takes an array of t values
+            self.apply_function(vectorized_point_function(
+                lambda p : self.function(np.transpose(p)[0])
+            ))
+        else:
+            self.apply_function(lambda p : self.function(p[0]))
 
 class FunctionGraph(ParametricFunction):
     CONFIG = {
@@ -33,6 +40,12 @@ class FunctionGraph(ParametricFunction):
     def __init__(self, function, **kwargs):
         digest_config(self, kwargs)
         parametric_function = lambda t : t*RIGHT + function(t)*UP
+        if getattr(function, "accepts_point_arrays", False):
+            #function takes an array of x values
+            parametric_function = vectorized_point_function(
+                lambda t : np.multiply.outer(t, RIGHT) + \
+                    np.multiply.outer(function(t), UP)
+            )
         ParametricFunction.__init__(
             self, 
             parametric_function,
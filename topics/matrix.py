@@ -3,7 +3,7 @@ import numpy as np
 from scene import Scene
 from mobject import Mobject
 from mobject.vectorized_mobject import VMobject, VGroup
-from mobject.tex_mobject import TexMobject, TextMobject
+from mobject.tex_mobject import TexMobject, TextMobject, precompile_tex_mobjects
 from animation.transform import ApplyPointwiseFunction, Transform, \
     ApplyMethod, FadeOut, ApplyFunction
 from animation.simple_animations import ShowCreation, Write
@@ -80,6 +80,7 @@ class Matrix(VMobject):
                 mob.add_background_rectangle()
 
     def string_matrix_to_mob_matrix(self, matrix):
+        precompile_tex_mobjects(matrix.flatten())
         return np.array([
             map(TexMobject, row)
             for row in matrix
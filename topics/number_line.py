@@ -1,7 +1,7 @@
 from helpers import *
 
 from mobject import Mobject1D
-from mobject.vectorized_mobject import VMobject, VGroup
+from mobject.vectorized_mobject import VMobject, VGroup, make_smooth_together
 from mobject.tex_mobject import TexMobject
 from topics.geometry import Line, Arrow
 from topics.functions import ParametricFunction
@@ -369,11 +369,13 @@ class NumberPlane(VMobject):
         return arrow
 
     def prepare_for_nonlinear_transform(self, num_inserted_anchor_points = 50):
+        to_smooth = []
         for mob in self.family_members_with_points():
             num_anchors = mob.get_num_anchor_points()
             if num_inserted_anchor_points > num_anchors:
                 mob.insert_n_anchor_points(num_inserted_anchor_points-num_anchors)
-                mob.make_smooth()
+                to_smooth.append(mob)
+        make_smooth_together(to_smooth)
         return self
 
 
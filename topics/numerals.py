@@ -1,6 +1,6 @@
 
 from mobject.vectorized_mobject import VMobject, VGroup, VectorizedPoint
-from mobject.tex_mobject import TexMobject
+from mobject.tex_mobject import TexMobject, precompile_tex_mobjects
 from animation import Animation
 from animation.continual_animation import ContinualAnimation
 from scene import Scene
@@ -18,6 +18,7 @@ class DecimalNumber(VMobject):
         negative_zero_string = "-%.*f"%(self.num_decimal_points, 0.)
         if num_string == negative_zero_string:
             num_string = num_string[1:]
+        precompile_tex_mobjects(list(num_string))
         VMobject.__init__(self, *[
             TexMobject(char)
             for char in num_string
@@ -44,6 +45,7 @@ class Integer(VGroup):
     def __init__(self, integer, **kwargs):
         self.number = integer
         num_str = str(integer)
+        precompile_tex_mobjects(list(num_str))
         VGroup.__init__(self, *map(TexMobject, num_str), **kwargs)
         self.arrange_submobjects(
             RIGHT, buff = self.digit_buff, aligned_edge = DOWN
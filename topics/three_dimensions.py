@@ -95,6 +95,10 @@ class ThreeDCamera(CameraWithPerspective):
             self, sorted(vmobjects, cmp = z_cmp)
         )
 
+    def get_state_signature(self):
+        return Camera.get_state_signature(self) + \
+            tuple(self.get_spherical_coords())
+
     def get_spherical_coords(self, phi = None, theta = None, distance = None):
         curr_phi, curr_theta, curr_d = self.rotation_mobject.points[0]
         if phi is None: phi = curr_phi
@@ -176,9 +180,10 @@ class ThreeDScene(Scene):
             self.add(self.ambient_camera_rotation)
 
     def get_moving_mobjects(self, *animations):
+        moving = Scene.get_moving_mobjects(self, *animations)
         if self.camera.rotation_mobject in moving:
             return self.mobjects
-        return Scene.get_moving_mobjects(self, *animations)
+        return moving
 
 ##############
 
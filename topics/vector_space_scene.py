@@ -371,7 +371,9 @@ class LinearTransformationScene(VectorScene):
             transposed_matrix = new_matrix
         elif transposed_matrix.shape != (3, 3):
             raise "Matrix has bad dimensions"
-        return lambda point: np.dot(point, transposed_matrix)
+        return vectorized_point_function(
+            lambda point: np.dot(point, transposed_matrix)
+        )
 
     def get_piece_movement(self, pieces):
         start = VMobject(*pieces)       